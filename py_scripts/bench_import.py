@@ -0,0 +1,73 @@
+"""
+Import-cost benchmark for scoring-only workers.
+
+Measures, in fresh interpreters, the wall time and peak RSS of
+`import kfre; kfre.risk_pred(...)` against the cost of also loading the
+plotting and metrics stack, and checks that the scoring path does not load
+matplotlib or scikit-learn.
+
+Run with:  python py_scripts/bench_import.py
+"""
+
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+N_RUNS = 7
+
+PROBE = """
+import json, resource, sys, time
+import numpy, pandas
+t1 = time.perf_counter()
+import kfre
+kfre.risk_pred(60, 1, 25, 200, False)
+{extra}
+t2 = time.perf_counter()
+print(json.dumps({{
+    "kfre_ms": (t2 - t1) * 1000,
+    "maxrss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": sorted(m for m in ("matplotlib", "sklearn") if m in sys.modules),
+}}))
+"""
+
+# The second case loads what every `import kfre` used to pull in eagerly
+# (pyplot and the scikit-learn metrics).
+CASES = {
+    "scoring only": "",
+    "plotting/metrics loaded": "import matplotlib.pyplot, sklearn.metrics",
+}
+
+# Modules each case must (True) or must not (False) have loaded.
+EXPECT_HEAVY = {
+    "scoring only": False,
+    "plotting/metrics loaded": True,
+}
+
+
+def run(extra):
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(extra=extra)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    for label, extra in CASES.items():
+        runs = [run(extra) for _ in range(N_RUNS)]
+        ms = np.median([r["kfre_ms"] for r in runs])
+        rss = np.median([r["maxrss_mb"] for r in runs])
+        loaded = runs[0]["heavy"]
+        if EXPECT_HEAVY[label]:
+            assert loaded == ["matplotlib", "sklearn"], (label, loaded)
+        else:
+            assert not loaded, f"scoring-only import loaded {loaded}"
+        heavy = ", ".join(loaded) or "none"
+        print(
+            f"{label:<24} import+score {ms:8.1f} ms   "
+            f"peak RSS {rss:7.1f} MB   heavy modules: {heavy}"
+        )
@@ -0,0 +1,73 @@
+"""
+Latency benchmark for single-patient and batched KFRE scoring.
+
+Reports p50/p99 per-call latency of `kfre_person` (single model/horizon and
+all models/horizons in one call) and per-patient cost of `kfre_person_batch`.
+
+Run with:  python py_scripts/bench_kfre_person.py
+"""
+
+import time
+
+import numpy as np
+
+from kfre import kfre_person, kfre_person_batch
+
+N_CALLS = 20000
+
+PATIENT = dict(
+    age=57.28,
+    is_male=False,
+    eGFR=15.0,
+    uACR=1762.0,
+    is_north_american=False,
+)
+EXTRAS = dict(
+    dm=1, htn=0, albumin=3.0, phosphorous=3.162, bicarbonate=21.3, calcium=9.72
+)
+
+
+def latencies(fn, n_calls=N_CALLS):
+    timer = time.perf_counter_ns
+    samples = np.empty(n_calls)
+    for i in range(n_calls):
+        start = timer()
+        fn()
+        samples[i] = timer() - start
+    return samples / 1000.0  # microseconds
+
+
+def report(label, samples):
+    p50, p99 = np.percentile(samples, [50, 99])
+    print(f"{label:<42} p50 {p50:8.2f} us   p99 {p99:8.2f} us")
+
+
+if __name__ == "__main__":
+    report(
+        "kfre_person (4-var, 2-year)",
+        latencies(lambda: kfre_person(years=2, **PATIENT)),
+    )
+    report(
+        "kfre_person (all models, both horizons)",
+        latencies(
+            lambda: kfre_person(years=[2, 5], num_vars="all", **PATIENT, **EXTRAS)
+        ),
+    )
+
+    rng = np.random.default_rng(0)
+    for batch_size in (100, 10000):
+        records = [
+            dict(
+                PATIENT,
+                **EXTRAS,
+                age=float(rng.uniform(40, 85)),
+                eGFR=float(rng.uniform(10, 55)),
+            )
+            for _ in range(batch_size)
+        ]
+        samples = latencies(
+            lambda: kfre_person_batch(records, years=[2, 5], num_vars="all"),
+            n_calls=200,
+        )
+        report(f"kfre_person_batch ({batch_size} patients, per call)", samples)
+        print(f"{'':<42} {np.median(samples) / batch_size:8.3f} us per patient")
@@ -1,9 +1,52 @@
 import sys
 import builtins
+import importlib
 from .logo import *
 
-from .perform_eval import *
 from .main import *
+from .main import _kfre_person
+
+# Evaluation and plotting are loaded on first attribute access so that
+# `import kfre; kfre.risk_pred(...)` only imports NumPy and pandas.
+_LAZY_ATTRS = {
+    "perform_eval": "perform_eval",
+    "class_esrd_outcome": "perform_eval",
+    "ipcw_weights": "perform_eval",
+    "class_ckd_stages": "perform_eval",
+    "plot_kfre_metrics": "perform_eval",
+    "plot_kfre_metrics_jobs": "perform_eval",
+    "KFREPlotter": "_plotter",
+    "eval_kfre_metrics": "perform_eval",
+    "eval_kfre_metrics_binned": "perform_eval",
+    "ScoreAccumulator": "_accumulator",
+    "eval_kfre_operating_points": "perform_eval",
+    "eval_kfre_subgroup_metrics": "perform_eval",
+    "concordance_index": "perform_eval",
+    "time_dependent_auc": "perform_eval",
+    "eval_kfre_survival_metrics": "perform_eval",
+    "cumulative_incidence": "perform_eval",
+    "kfre_cumulative_incidence_table": "perform_eval",
+    "eval_kfre_calibration": "perform_eval",
+    "kfre_calibration_table": "perform_eval",
+    "CalibrationBins": "_calibration",
+    "bootstrap_metric_ci": "perform_eval",
+    "bootstrap_metric_ci_stream": "perform_eval",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{module_name}", __name__)
+    value = module if name == module_name else getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
 
 detailed_doc = """
 Kidney Failure Risk Equation (KFRE) Python Library
@@ -63,6 +106,7 @@ def kfre_person(
     bicarbonate=None,
     calcium=None,
     precision=None,
+    num_vars=None,
 ):
     """
     Direct function to predict kidney failure risk for an individual using
@@ -74,17 +118,21 @@ def kfre_person(
     :param uACR: Urinary Albumin to Creatinine Ratio.
     :param is_north_american: True if the patient is from North America,
      otherwise False.
-    :param years: Time horizon for the risk prediction (default is 2 years).
+    :param years: Time horizon for the risk prediction (default is 2 years),
+     or a list of horizons.
     :param dm: Diabetes mellitus indicator (1=yes; 0=no), optional.
     :param htn: Hypertension indicator (1=yes; 0=no), optional.
     :param albumin: Serum albumin level, optional.
     :param phosphorous: Serum phosphorous level, optional.
     :param bicarbonate: Serum bicarbonate level, optional.
     :param calcium: Serum calcium level, optional.
-    :return: The computed risk of kidney failure.
+    :param precision: Decimal places to round the risk to, optional.
+    :param num_vars: Model(s) to use (4, 6, 8, a list, or "all"), optional.
+     By default the most informative model the inputs support is used.
+    :return: The computed risk of kidney failure, or a dict keyed by
+     ``kfre_{n}var_{years}year`` when several models or horizons are requested.
     """
-    predictor = RiskPredictor()
-    return predictor.kfre_person(
+    return _kfre_person(
         age=age,
         is_male=is_male,
         eGFR=eGFR,
@@ -98,20 +146,43 @@ def kfre_person(
         bicarbonate=bicarbonate,
         calcium=calcium,
         precision=precision,
+        num_vars=num_vars,
     )
 
 
 # Export functions for direct use
 __all__ = [
     "kfre_person",
+    "kfre_person_batch",
     "upcr_uacr",
     "predict_kfre",
     "perform_conversions",
+    "ConversionPlan",
     "add_kfre_risk_col",
+    "score_file",
     "RiskPredictor",
+    "KFREModel",
+    "ModelRegistry",
+    "DEFAULT_REGISTRY",
     "class_esrd_outcome",
+    "ipcw_weights",
     "class_ckd_stages",
     "plot_kfre_metrics",
+    "plot_kfre_metrics_jobs",
+    "KFREPlotter",
     "eval_kfre_metrics",
+    "eval_kfre_metrics_binned",
+    "ScoreAccumulator",
+    "eval_kfre_operating_points",
+    "eval_kfre_subgroup_metrics",
+    "concordance_index",
+    "time_dependent_auc",
+    "eval_kfre_survival_metrics",
+    "cumulative_incidence",
+    "kfre_cumulative_incidence_table",
+    "eval_kfre_calibration",
+    "kfre_calibration_table",
+    "CalibrationBins",
     "bootstrap_metric_ci",
+    "bootstrap_metric_ci_stream",
 ]
@@ -0,0 +1,131 @@
+"""
+Internal mergeable score accumulator for kfre.
+
+`ScoreAccumulator` summarizes (outcome, predicted risk) pairs in fixed-size
+state: per-class counts over equal-width risk bins, exact confusion counts
+at one threshold, and exact squared-error sums. Every field is a sum, so
+accumulators fed with different chunks, partitions or sites merge by
+addition (associative and commutative), map-reduce style.
+"""
+
+import numpy as np
+
+from ._metrics import (
+    METRICS,
+    as_float,
+    ap_from_counts,
+    auc_from_counts,
+    confusion_metric,
+    score_bins,
+)
+
+
+class ScoreAccumulator:
+    """
+    Mergeable summary of binary outcomes and predicted risks.
+
+    Parameters:
+    - n_bins (int): Equal-width bins over [0, 1] for the ranking metrics.
+      Default 10,000.
+    - threshold (float): Cutoff for the threshold metrics (``score >
+      threshold`` is flagged). Default 0.5.
+
+    Accuracy:
+    - Brier score, precision, sensitivity and specificity are exact.
+    - AUC ROC and average precision treat risks that share a bin as tied.
+      The exact values are guaranteed to lie within `auc_bounds()` and
+      `ap_bounds()`, both computed from the histogram: the AUC error is at
+      most half the share of (event, non-event) pairs falling in the same
+      bin, and the AP bounds take every bin's events in the worst and best
+      possible order. Risks that are genuinely tied (e.g. many exact zeros)
+      also count towards the bounds, which makes them conservative. For
+      continuous risks on 200,000 rows, 10,000 bins give intervals about
+      1e-4 (AUC) and 4e-4 (AP) wide.
+    """
+
+    def __init__(self, n_bins=10000, threshold=0.5):
+        self.n_bins = int(n_bins)
+        self.threshold = float(threshold)
+        # hist[0] counts non-events and hist[1] events per risk bin.
+        self.hist = np.zeros((2, self.n_bins), dtype=np.int64)
+        # TN, FP, FN, TP at `threshold`.
+        self.cells = np.zeros(4, dtype=np.int64)
+        self.sq_error = 0.0
+
+    @property
+    def n(self):
+        """Number of rows accumulated."""
+        return int(self.hist.sum())
+
+    def update(self, y_true, y_score):
+        """Add a chunk of rows; pairs with a NaN in either array are dropped."""
+        y_true = as_float(y_true)
+        y_score = as_float(y_score)
+        keep = ~(np.isnan(y_true) | np.isnan(y_score))
+        y_true, y_score = y_true[keep], y_score[keep]
+        labels = y_true.astype(np.int64)
+
+        codes = labels * self.n_bins + score_bins(y_score, self.n_bins)
+        self.hist += np.bincount(codes, minlength=2 * self.n_bins).reshape(2, -1)
+        self.cells += np.bincount(labels * 2 + (y_score > self.threshold), minlength=4)
+        self.sq_error += float(np.sum((y_score - y_true) ** 2))
+        return self
+
+    def merge(self, other):
+        """Return a new accumulator holding the sums of both."""
+        if (self.n_bins, self.threshold) != (other.n_bins, other.threshold):
+            raise ValueError(
+                "Only ScoreAccumulators with the same n_bins and threshold "
+                "can be merged."
+            )
+        merged = ScoreAccumulator(self.n_bins, self.threshold)
+        merged.hist = self.hist + other.hist
+        merged.cells = self.cells + other.cells
+        merged.sq_error = self.sq_error + other.sq_error
+        return merged
+
+    __add__ = merge
+
+    def auc_bounds(self):
+        """(lower, upper) bounds on the exact AUC ROC."""
+        neg, pos = self.hist.astype(float)
+        if not pos.sum() or not neg.sum():
+            return np.nan, np.nan
+        auc = auc_from_counts(neg[None], pos[None])[0]
+        half_ties = 0.5 * np.dot(neg, pos) / (neg.sum() * pos.sum())
+        return float(auc - half_ties), float(auc + half_ties)
+
+    def ap_bounds(self):
+        """(lower, upper) bounds on the exact average precision."""
+        neg, pos = self.hist[:, ::-1].astype(float)  # highest risk first
+        tp_before = np.cumsum(pos) - pos
+        flagged_before = tp_before + np.cumsum(neg) - neg
+        n_pos = pos.sum()
+        if not n_pos or not neg.sum():
+            return np.nan, np.nan
+        # Within a bin, a positive's precision is lowest when it comes first
+        # after all the bin's negatives and highest when it is the last of
+        # the bin's positives ranked ahead of every negative.
+        low = (tp_before + 1) / (flagged_before + neg + 1)
+        high = (tp_before + pos) / np.maximum(flagged_before + pos, 1)
+        return float(pos @ low / n_pos), float(pos @ high / n_pos)
+
+    def metrics(self):
+        """
+        Finalize into every metric in `METRICS`.
+
+        Returns:
+        - dict: {metric: float}; ranking metrics are NaN with a single class.
+        """
+        neg, pos = self.hist[None, 0].astype(float), self.hist[None, 1].astype(float)
+        cells = self.cells[None].astype(float)
+        n = self.n
+        values = {
+            "precision": confusion_metric("precision", cells)[0],
+            "average_precision": ap_from_counts(neg, pos)[0],
+            "sensitivity": confusion_metric("sensitivity", cells)[0],
+            "specificity": confusion_metric("specificity", cells)[0],
+            "auc_roc": auc_from_counts(neg, pos)[0],
+            "brier": self.sq_error / n if n else np.nan,
+        }
+        return {m: float(values[m]) for m in METRICS}
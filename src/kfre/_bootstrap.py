@@ -0,0 +1,279 @@
+"""
+Internal bootstrap resampling engine for kfre.
+
+Resample indices are drawn in blocks of rows bounded by `BLOCK_ELEMENTS`
+indices, and each block is scored in one shot by the counting kernels in
+`_metrics.py`; nothing is computed per resample except drawing its indices.
+
+Resamples come from one of two seed sources:
+
+- a `np.random.Generator` (the default, ``n_jobs=None``): each resample's
+  indices come from its own ``rng.integers(0, n, size=n)`` call, in order,
+  so a seeded run draws exactly the resamples the original
+  one-resample-at-a-time loop drew;
+- a `np.random.SeedSequence` (any integer ``n_jobs``): resamples are cut
+  into fixed chunks of `SEED_CHUNK`, each drawn from its own child stream of
+  ``SeedSequence(seed).spawn(...)``. Chunks are independent, so they can be
+  scored on any number of worker processes and the result depends only on
+  the seed, never on the worker count.
+"""
+
+import numpy as np
+
+from ._metrics import (
+    METRICS,
+    as_float,
+    all_metric_values,
+    check_metric,
+    metric_from_counts,
+    metric_values,
+    prepare,
+    prepare_all,
+    score_bins,
+)
+from ._parallel import get_pool, resolve_n_jobs
+
+# Upper bound on the number of resample indices held at once (16 MB of int64).
+BLOCK_ELEMENTS = 1 << 21
+
+# Resamples per spawned seed stream. Part of the seeded output: changing it
+# changes which resamples a given seed draws.
+SEED_CHUNK = 256
+
+
+def block_rows(n):
+    """Number of resamples of size `n` that fit in one block."""
+    return max(BLOCK_ELEMENTS // max(n, 1), 1)
+
+
+def resample_block(rng, n, n_rows):
+    """Draw `n_rows` resamples of size `n` as an (n_rows, n) index array."""
+    idx = np.empty((n_rows, n), dtype=np.int64)
+    for row in idx:
+        row[:] = rng.integers(0, n, size=n)
+    return idx
+
+
+def iter_blocks(rng, n, n_boot):
+    """Yield (lo, hi, idx) for consecutive blocks of the `n_boot` resamples."""
+    step = block_rows(n)
+    for lo in range(0, n_boot, step):
+        hi = min(lo + step, n_boot)
+        yield lo, hi, resample_block(rng, n, hi - lo)
+
+
+def seed_source(seed, n_jobs):
+    """
+    Return the seed source for `seed`: a Generator when `n_jobs` is None,
+    otherwise a SeedSequence whose spawned children drive fixed chunks.
+    """
+    if n_jobs is None:
+        return np.random.default_rng(seed)
+    resolve_n_jobs(n_jobs)
+    return np.random.SeedSequence(seed)
+
+
+def _score_chunks(score, args, n, chunks):
+    # Worker entry point: score whole spawned chunks, block by block.
+    scored = []
+    for lo, hi, child in chunks:
+        rng = np.random.default_rng(child)
+        for b_lo, b_hi, idx in iter_blocks(rng, n, hi - lo):
+            scored.append((lo + b_lo, lo + b_hi, score(*args, idx)))
+    return scored
+
+
+def scored_blocks(score, args, n, n_boot, source, n_jobs=None):
+    """
+    Yield (lo, hi, score(*args, idx)) covering all `n_boot` resamples.
+
+    `score` must be a module-level function (it is pickled by reference when
+    workers are used). With a SeedSequence `source`, chunks are spread over
+    `n_jobs` worker processes and yielded in completion order; blocks carry
+    their (lo, hi) position, so callers store them by position.
+    """
+    if not isinstance(source, np.random.SeedSequence):
+        for lo, hi, idx in iter_blocks(source, n, n_boot):
+            yield lo, hi, score(*args, idx)
+        return
+
+    starts = range(0, n_boot, SEED_CHUNK)
+    chunks = [
+        (lo, min(lo + SEED_CHUNK, n_boot), child)
+        for lo, child in zip(starts, source.spawn(len(starts)))
+    ]
+    n_workers = min(resolve_n_jobs(n_jobs), len(chunks))
+    if n_workers <= 1:
+        for chunk in chunks:
+            yield from _score_chunks(score, args, n, [chunk])
+        return
+
+    from concurrent.futures import as_completed
+
+    # A few tasks per worker keeps the load balanced and progress moving.
+    n_tasks = min(len(chunks), 4 * n_workers)
+    per_task = -(-len(chunks) // n_tasks)
+    pool = get_pool(n_workers)
+    futures = [
+        pool.submit(_score_chunks, score, args, n, chunks[i : i + per_task])
+        for i in range(0, len(chunks), per_task)
+    ]
+    for future in as_completed(futures):
+        yield from future.result()
+
+
+def percentile_ci(values, ci):
+    """
+    Percentile interval of the non-NaN `values` at confidence level `ci` (%).
+
+    Returns (lower, upper, n_valid); the bounds are NaN if nothing is valid.
+    """
+    values = values[~np.isnan(values)]
+    if not values.size:
+        return np.nan, np.nan, 0
+    alpha = (100 - ci) / 2
+    lower, upper = np.percentile(values, [alpha, 100 - alpha])
+    return float(lower), float(upper), int(values.size)
+
+
+def bootstrap_values(
+    metric, codes, n_codes, n, n_boot, source, n_jobs=None, progress=None
+):
+    """
+    Return the metric value of each of `n_boot` resamples (NaN if undefined).
+
+    `source` comes from `seed_source`. `progress`, if given, is a tqdm-like
+    object advanced once per block.
+    """
+    values = np.full(n_boot, np.nan)
+    if n == 0:
+        return values
+    blocks = scored_blocks(
+        metric_values, (metric, codes, n_codes), n, n_boot, source, n_jobs
+    )
+    for lo, hi, block in blocks:
+        values[lo:hi] = block
+        if progress is not None:
+            progress.update(hi - lo)
+    return values
+
+
+def all_model_values(prepared, idx):
+    """`all_metric_values` for each of several prepared score columns."""
+    return {name: all_metric_values(prep, idx) for name, prep in prepared.items()}
+
+
+def bootstrap_all_metrics(y_true, scores, n_boot, source, threshold=0.5, n_jobs=None):
+    """
+    Bootstrap every metric for several score columns on shared resamples.
+
+    Parameters:
+    - y_true (np.ndarray): Integer 0/1 labels with no missing values.
+    - scores (dict): {name: float score array aligned with `y_true`}.
+    - n_boot (int): Number of resamples, drawn once and used for every score.
+    - source (np.random.Generator or np.random.SeedSequence): Seed source of
+      the resample indices; see `seed_source`.
+    - threshold (float): Cutoff for the threshold-based metrics.
+    - n_jobs (int, optional): Worker processes for a SeedSequence source.
+
+    Returns:
+    - tuple: (points, values), each {name: {metric: ...}}. `points` holds the
+      full-sample metric and `values` the (n_boot,) per-resample metric.
+      Because the resamples are shared, ``values[a][m] - values[b][m]`` is
+      the paired bootstrap distribution of the difference between a and b.
+    """
+    n = y_true.size
+    values = {name: {m: np.full(n_boot, np.nan) for m in METRICS} for name in scores}
+    if n == 0:
+        return {name: dict.fromkeys(METRICS, np.nan) for name in scores}, values
+
+    prepared = {
+        name: prepare_all(y_true, score, threshold) for name, score in scores.items()
+    }
+    points = {
+        name: {m: v[0] for m, v in by_metric.items()}
+        for name, by_metric in all_model_values(prepared, np.arange(n)[None, :]).items()
+    }
+    blocks = scored_blocks(all_model_values, (prepared,), n, n_boot, source, n_jobs)
+    for lo, hi, block in blocks:
+        for name, by_metric in block.items():
+            for metric, vals in by_metric.items():
+                values[name][metric][lo:hi] = vals
+    return points, values
+
+
+class PoissonBootstrap:
+    """
+    Streaming Poisson(1) bootstrap of one metric.
+
+    Instead of resampling row indices, every row gets an independent
+    Poisson(1) weight per replicate, drawn chunk by chunk as rows arrive.
+    Each replicate keeps only the weighted sufficient statistics of the
+    metric, so memory is O(n_boot x n_bins) whatever the number of rows:
+
+    - ranking metrics: a weighted score histogram per class over `n_bins`
+      equal-width bins of [0, 1] (see `score_bins`);
+    - threshold metrics: weighted confusion-matrix counts;
+    - Brier score: the weighted squared-error sum and the weight total.
+
+    Row 0 of the statistics has unit weights and yields the point estimate.
+    Weights are drawn row-major (each row's `n_boot` weights in sequence), so
+    for a given seed the replicates do not depend on how the rows are chunked.
+    """
+
+    def __init__(self, metric, n_boot, seed=None, threshold=0.5, n_bins=1000):
+        check_metric(metric)
+        self.metric = metric
+        self.n_boot = n_boot
+        self.threshold = threshold
+        self.n_bins = n_bins
+        self.n_rows = 0
+        self._rng = np.random.default_rng(seed)
+        if metric == "brier":
+            self._width = 2
+        elif metric in ("auc_roc", "average_precision"):
+            self._width = 2 * n_bins
+        else:
+            self._width = 4
+        self.stats = np.zeros((n_boot + 1, self._width))
+
+    def _codes(self, y_true, y_score):
+        if self.metric in ("auc_roc", "average_precision"):
+            return score_bins(y_score, self.n_bins) * 2 + y_true
+        return prepare(self.metric, y_true, y_score, self.threshold)[0]
+
+    def update(self, y_true, y_score):
+        """Add a chunk of rows; pairs with a NaN in either array are dropped."""
+        y_true = as_float(y_true)
+        y_score = as_float(y_score)
+        keep = ~(np.isnan(y_true) | np.isnan(y_score))
+        codes = self._codes(y_true[keep].astype(int), y_score[keep])
+        self.n_rows += codes.size
+
+        replicates = self.n_boot + 1
+        step = max(BLOCK_ELEMENTS // replicates, 1)
+        offsets = np.arange(replicates, dtype=np.int64) * self._width
+        for lo in range(0, codes.size, step):
+            block = codes[lo : lo + step]
+            weights = np.ones((block.size, replicates))
+            weights[:, 1:] = self._rng.poisson(1.0, size=(block.size, self.n_boot))
+            if self.metric == "brier":
+                self.stats[:, 0] += block @ weights
+                self.stats[:, 1] += weights.sum(axis=0)
+                continue
+            keys = block[:, None] + offsets[None, :]
+            self.stats += np.bincount(
+                keys.ravel(),
+                weights=weights.ravel(),
+                minlength=replicates * self._width,
+            ).reshape(replicates, self._width)
+        return self
+
+    def values(self):
+        """Return (point, replicate values); undefined values are NaN."""
+        if self.metric == "brier":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                vals = self.stats[:, 0] / self.stats[:, 1]
+        else:
+            vals = metric_from_counts(self.metric, self.stats)
+        return vals[0], vals[1:]
@@ -0,0 +1,225 @@
+"""
+Internal calibration statistics for kfre.
+
+Binned statistics live in `CalibrationBins`: per-bin row counts, observed
+events and expected events (summed predicted risk), accumulated with
+`np.bincount`. They are plain sums over fixed bin edges, so bins built from
+different chunks or sites with the same edges merge by addition.
+
+Calibration intercept and slope come from a small Newton-Raphson logistic
+fit on the logit of the predicted risk, vectorized over rows, with
+step-halving and a convergence check so that perfectly separated outcomes
+give NaN (with a warning) rather than a runaway slope.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from ._metrics import as_float
+
+# Predicted risks are clipped to [EPS, 1 - EPS] before taking the logit.
+EPS = 1e-12
+
+
+class CalibrationBins:
+    """
+    Mergeable per-bin observed/expected event counts.
+
+    Parameters:
+    - edges (array-like): Increasing bin edges of length ``n_bins + 1``. A
+      risk ``p`` falls in bin ``i`` when ``edges[i] <= p < edges[i + 1]``;
+      values below the first or at/above the last inner edge land in the
+      first or last bin.
+
+    Attributes:
+    - edges (np.ndarray): The bin edges.
+    - n, observed, expected (np.ndarray): Per-bin row count, sum of outcomes
+      and sum of predicted risks. With `sample_weight` they are weighted
+      sums.
+    """
+
+    def __init__(self, edges):
+        edges = np.asarray(edges, dtype=float)
+        if edges.ndim != 1 or edges.size < 2 or np.any(np.diff(edges) < 0):
+            raise ValueError("edges must be an increasing 1-D array of length >= 2.")
+        self.edges = edges
+        n_bins = edges.size - 1
+        self.n = np.zeros(n_bins)
+        self.observed = np.zeros(n_bins)
+        self.expected = np.zeros(n_bins)
+
+    @classmethod
+    def from_quantiles(cls, y_prob, n_bins=10):
+        """Bins with (about) equal counts of `y_prob`, e.g. deciles."""
+        y_prob = as_float(y_prob)
+        y_prob = y_prob[~np.isnan(y_prob)]
+        if not y_prob.size:
+            raise ValueError("Cannot build quantile bins from no predictions.")
+        return cls(np.quantile(y_prob, np.linspace(0, 1, n_bins + 1)))
+
+    @property
+    def n_bins(self):
+        return self.edges.size - 1
+
+    def bin_index(self, y_prob):
+        """Bin number of each risk in `y_prob`."""
+        return np.searchsorted(self.edges[1:-1], y_prob, side="right")
+
+    def update(self, y_true, y_prob, sample_weight=None):
+        """
+        Add a chunk of rows; pairs with a NaN in either array are dropped.
+
+        With `sample_weight` (e.g. IPCW weights), rows with zero or missing
+        weight are dropped as well and the rest count with their weight.
+        """
+        y_true = as_float(y_true)
+        y_prob = as_float(y_prob)
+        keep = ~(np.isnan(y_true) | np.isnan(y_prob))
+        if sample_weight is None:
+            weight = np.ones(y_true.size)
+        else:
+            weight = as_float(sample_weight)
+            keep &= ~np.isnan(weight) & (weight != 0)
+        y_true, y_prob, weight = y_true[keep], y_prob[keep], weight[keep]
+        bins = self.bin_index(y_prob)
+        self.n += np.bincount(bins, weights=weight, minlength=self.n_bins)
+        self.observed += np.bincount(
+            bins, weights=weight * y_true, minlength=self.n_bins
+        )
+        self.expected += np.bincount(
+            bins, weights=weight * y_prob, minlength=self.n_bins
+        )
+        return self
+
+    def merge(self, other):
+        """Return a new CalibrationBins holding the sums of both."""
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Only CalibrationBins with identical edges can be merged.")
+        merged = CalibrationBins(self.edges)
+        merged.n = self.n + other.n
+        merged.observed = self.observed + other.observed
+        merged.expected = self.expected + other.expected
+        return merged
+
+    __add__ = merge
+
+    def oe_ratio(self):
+        """Total observed over total expected events."""
+        expected = self.expected.sum()
+        return self.observed.sum() / expected if expected > 0 else np.nan
+
+    def ece(self):
+        """Expected calibration error: count-weighted mean |rate - mean risk|."""
+        total = self.n.sum()
+        if not total:
+            return np.nan
+        return float(np.abs(self.observed - self.expected).sum() / total)
+
+    def table(self):
+        """Per-bin calibration table as a DataFrame."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return pd.DataFrame(
+                {
+                    "Bin": np.arange(1, self.n_bins + 1),
+                    "Lower": self.edges[:-1],
+                    "Upper": self.edges[1:],
+                    "N": self.n,
+                    "Observed": self.observed,
+                    "Expected": self.expected,
+                    "Observed Rate": self.observed / self.n,
+                    "Mean Predicted": self.expected / self.n,
+                    "O/E Ratio": self.observed / self.expected,
+                }
+            )
+
+
+def logistic_fit(X, y, offset=None, weights=None, max_iter=50, tol=1e-10):
+    """
+    Fit ``logit P(y = 1) = offset + X @ beta`` by Newton-Raphson.
+
+    Each Newton step is halved until the weighted log-likelihood does not
+    decrease. The fit has converged once a step is below `tol` relative to
+    the size of beta.
+
+    Parameters:
+    - X (np.ndarray): (n, k) design matrix, k small.
+    - y (np.ndarray): 0/1 outcomes.
+    - offset (np.ndarray, optional): Fixed (n,) offset on the logit scale.
+    - weights (np.ndarray, optional): Non-negative (n,) row weights.
+
+    Returns:
+    - np.ndarray: beta, or NaNs if the outcome has a single class or the fit
+      does not converge within `max_iter` steps (e.g. outcomes perfectly
+      separated by X, where the maximum-likelihood estimate does not exist).
+      Non-convergence also raises a RuntimeWarning.
+    """
+    k = X.shape[1]
+    weights = np.ones(len(y)) if weights is None else weights
+    present = y[weights > 0]
+    if not present.size or present.min() == present.max():
+        return np.full(k, np.nan)
+    offset = np.zeros(len(y)) if offset is None else offset
+
+    def loglik(eta):
+        return float(weights @ (y * eta - np.logaddexp(0.0, eta)))
+
+    beta = np.zeros(k)
+    eta = offset + X @ beta
+    ll = loglik(eta)
+    converged = False
+    for _ in range(max_iter):
+        mu = np.exp(-np.logaddexp(0.0, -eta))
+        grad = X.T @ (weights * (y - mu))
+        hess = (X * (weights * mu * (1.0 - mu))[:, None]).T @ X
+        try:
+            step = np.linalg.solve(hess, grad)
+        except np.linalg.LinAlgError:
+            break
+        # Step-halving: never accept a step that lowers the likelihood.
+        for _ in range(30):
+            new_eta = offset + X @ (beta + step)
+            new_ll = loglik(new_eta)
+            if new_ll >= ll:
+                break
+            step = step / 2
+        beta = beta + step
+        eta, ll = new_eta, new_ll
+        if np.max(np.abs(step)) < tol * (1.0 + np.max(np.abs(beta))):
+            converged = True
+            break
+
+    if not converged:
+        warnings.warn(
+            "Logistic calibration fit did not converge (the outcome may be "
+            "perfectly separated by the predicted risk); returning NaN.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return np.full(k, np.nan)
+    return beta
+
+
+def calibration_fit(y_true, y_prob, sample_weight=None):
+    """
+    Calibration intercept and slope of predicted risks.
+
+    The intercept is calibration-in-the-large: the intercept of a logistic
+    model of the outcome with the logit of `y_prob` as an offset (slope fixed
+    at 1). The slope is the coefficient of the logit in a logistic model with
+    a free intercept. A well-calibrated model has intercept 0 and slope 1.
+    `sample_weight` weights each row's likelihood contribution.
+
+    Returns:
+    - tuple: (intercept, slope).
+    """
+    y_true = as_float(y_true)
+    y_prob = np.clip(as_float(y_prob), EPS, 1 - EPS)
+    lp = np.log(y_prob / (1 - y_prob))
+    ones = np.ones((len(lp), 1))
+    (intercept,) = logistic_fit(ones, y_true, offset=lp, weights=sample_weight)
+    _, slope = logistic_fit(
+        np.column_stack([ones[:, 0], lp]), y_true, weights=sample_weight
+    )
+    return float(intercept), float(slope)
@@ -0,0 +1,191 @@
+"""
+Compiled laboratory unit conversions.
+
+A `ConversionPlan` resolves which columns to convert, their new names and
+factors once from a schema (a DataFrame's columns or a file header) instead
+of on every call. The same plan is then applied to any number of frames or
+chunks with that schema: it reads only its source columns, never copies the
+others, and reports what it did once, on its first application, through the
+``kfre`` logger (or printed, as `perform_conversions` does).
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("kfre")
+
+# Conversion factors verified against standard reference values
+# (molar masses / standard SI<->conventional factors):
+#   Calcium:   1 mmol/L = 4.0 mg/dL    (MW 40.08; x4)
+#   Phosphate: 1 mmol/L = 3.1 mg/dL    (MW ~31; x3.1)
+#   Albumin:   1 g/L    = 0.1 g/dL     (x0.1)
+#   uPCR:      mg/mmol  -> mg/g  via 1 mmol creatinine = 0.11312 g
+#              (creatinine MW 113.12; x 1/0.11312 ~= 8.8401)
+CONVERSION_FACTORS = {
+    "uPCR": 1 / 0.11312,
+    "Calcium": 4,
+    "Phosphate": 3.1,
+    "Albumin": 1 / 10,
+}
+
+# Suffixes of the new column names: (SI -> conventional, conventional -> SI).
+CONVERSION_SUFFIXES = {
+    "uPCR": ("mg_g", "mmol_L"),
+    "Calcium": ("mg_dl", "mmol_L"),
+    "Phosphate": ("mg_dl", "mmol_L"),
+    "Albumin": ("g_dl", "g_L"),
+}
+
+
+class ConversionPlan:
+    """
+    Unit conversions compiled once for a fixed set of columns.
+
+    Parameters:
+    - columns (iterable of str): Column names of the frames the plan will be
+      applied to, e.g. ``df.columns`` or a file header.
+    - reverse (bool): If True, convert from conventional -> SI units; if
+      False, convert from SI -> conventional units.
+    - convert_all (bool): If True, take the first column whose name contains
+      each lab name (case-insensitive) as its source.
+    - upcr_col (str, optional): Column name for urine protein-creatinine ratio.
+    - calcium_col (str, optional): Column name for calcium.
+    - phosphate_col (str, optional): Column name for phosphate.
+    - albumin_col (str, optional): Column name for albumin.
+    - dtype (str or np.dtype, optional): dtype of the converted columns, e.g.
+      "float32" to halve their memory. Values are computed in float64 and
+      cast. Default None keeps float64.
+    - verbose (bool): If True, print the conversion messages instead of
+      logging them. Default False.
+
+    Attributes:
+    - steps (tuple): (source, new column, factor) per conversion, in
+      uPCR, calcium, phosphate, albumin order.
+
+    Notes:
+    - The conversions performed and any requested columns missing from
+      `columns` are reported once, when the plan is first applied (INFO and
+      WARNING on the ``kfre`` logger); later applications are silent.
+    - Applying the plan to a frame without a source column raises KeyError.
+    """
+
+    def __init__(
+        self,
+        columns,
+        reverse=False,
+        convert_all=False,
+        upcr_col=None,
+        calcium_col=None,
+        phosphate_col=None,
+        albumin_col=None,
+        dtype=None,
+        verbose=False,
+    ):
+        columns = list(columns)
+        requested = {
+            "uPCR": upcr_col,
+            "Calcium": calcium_col,
+            "Phosphate": phosphate_col,
+            "Albumin": albumin_col,
+        }
+        if convert_all:
+            requested = {
+                key: next((c for c in columns if key.lower() in c.lower()), None)
+                for key in CONVERSION_FACTORS
+            }
+
+        present = set(columns)
+        steps = []
+        # (level, message, missing) reported on the first application.
+        report = []
+        for key, source in requested.items():
+            if source and source in present:
+                factor = CONVERSION_FACTORS[key]
+                new_col = f"{key}_{CONVERSION_SUFFIXES[key][int(reverse)]}"
+                steps.append((source, new_col, factor))
+                report.append(
+                    (
+                        logging.INFO,
+                        f"Converted '{source}' to new column '{new_col}' "
+                        f"with factor {factor}",
+                        False,
+                    )
+                )
+            else:
+                report.append(
+                    (
+                        logging.WARNING if source else logging.INFO,
+                        f"Column '{source}' not found in DataFrame. "
+                        "No conversion performed for this column.",
+                        True,
+                    )
+                )
+
+        self.steps = tuple(steps)
+        self.reverse = reverse
+        self.dtype = None if dtype is None else np.dtype(dtype)
+        self.verbose = verbose
+        self._report = report
+
+    def __repr__(self):
+        pairs = ", ".join(f"{s!r} -> {n!r}" for s, n, _ in self.steps)
+        return f"ConversionPlan({pairs})"
+
+    @property
+    def source_columns(self):
+        """Columns the plan reads."""
+        return [source for source, _, _ in self.steps]
+
+    @property
+    def new_columns(self):
+        """Columns the plan creates."""
+        return [new_col for _, new_col, _ in self.steps]
+
+    def transform(self, df):
+        """
+        Compute the converted columns only.
+
+        Returns:
+        - pd.DataFrame: The new columns, indexed like `df`.
+        """
+        self._flush_report()
+        out = {}
+        for source, new_col, factor in self.steps:
+            values = df[source].to_numpy(dtype=float, na_value=np.nan)
+            values = values / factor if self.reverse else values * factor
+            if self.dtype is not None:
+                values = values.astype(self.dtype, copy=False)
+            out[new_col] = values
+        return pd.DataFrame(out, index=df.index, columns=self.new_columns)
+
+    def apply(self, df, inplace=False):
+        """
+        Add the converted columns to `df`.
+
+        Parameters:
+        - df (DataFrame): Frame (or chunk) with the plan's source columns.
+        - inplace (bool): If True, write the new columns into `df` itself.
+          Otherwise a shallow copy of `df` is returned: its existing columns
+          are shared with `df`, not copied, so on pandas without
+          copy-on-write (before 3.0) writing into them also changes `df`.
+
+        Returns:
+        - DataFrame: `df` (or its shallow copy) with the new columns.
+        """
+        new = self.transform(df)
+        out = df if inplace else df.copy(deep=False)
+        for col in new.columns:
+            out[col] = new[col].to_numpy()
+        return out
+
+    def _flush_report(self):
+        for level, message, missing in self._report:
+            if not self.verbose:
+                logger.log(level, message)
+            elif missing:
+                print(f"Warning: {message}")
+            else:
+                print(message)
+        self._report = []
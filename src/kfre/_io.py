@@ -0,0 +1,103 @@
+"""
+Internal chunked file I/O helpers for kfre.
+
+Keeps `score_file` in `main.py` free of format-specific reading and writing
+code. CSV goes through pandas; Parquet needs the optional `pyarrow`
+dependency, which is only imported when a Parquet file is actually used.
+"""
+
+import os
+
+import pandas as pd
+
+_PARQUET_EXTENSIONS = (".parquet", ".pq")
+
+
+def file_format(path):
+    """Return "parquet" or "csv" based on the file extension."""
+    name = os.fspath(path).lower()
+    return "parquet" if name.endswith(_PARQUET_EXTENSIONS) else "csv"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError(
+            "Reading or writing Parquet files requires pyarrow. "
+            "Install it with `pip install pyarrow`, or use CSV files."
+        ) from None
+    return pq
+
+
+def read_header(path):
+    """Return the column names of a CSV or Parquet file without reading rows."""
+    if file_format(path) == "parquet":
+        pq = _require_pyarrow()
+        return list(pq.ParquetFile(path).schema_arrow.names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def iter_chunks(path, columns, chunksize):
+    """
+    Yield DataFrame chunks of at most `chunksize` rows holding only `columns`.
+    """
+    if file_format(path) == "parquet":
+        pq = _require_pyarrow()
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize):
+        yield chunk
+
+
+class ChunkWriter:
+    """
+    Incrementally write DataFrame chunks to a CSV or Parquet file.
+
+    The first chunk fixes the output schema: CSV writes the header once and
+    appends afterwards; Parquet opens a single `ParquetWriter` and casts every
+    later chunk to the first chunk's schema so per-chunk dtype inference
+    (e.g. an all-NaN integer column) cannot break the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.format = file_format(path)
+        self._writer = None
+        self._started = False
+
+    def write(self, chunk):
+        if self.format == "parquet":
+            pq = _require_pyarrow()
+            import pyarrow as pa
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                table = table.cast(self._writer.schema)
+            self._writer.write_table(table)
+        else:
+            chunk.to_csv(
+                self.path,
+                mode="a" if self._started else "w",
+                header=not self._started,
+                index=False,
+            )
+        self._started = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,394 @@
+"""
+Internal counting kernels for kfre performance metrics.
+
+Every metric here is computed from integer counts rather than from the raw
+rows, so the same code scores the full sample and a whole block of bootstrap
+resamples at once. A resample is a row of indices into the original data;
+each row's counts come from one `np.bincount` over codes precomputed once per
+call:
+
+- ranking metrics (AUC ROC, average precision) count positives and negatives
+  per distinct score, with distinct scores in ascending order. AUC is the
+  Mann-Whitney rank statistic, with ties counted as one half, and average
+  precision is the step-wise sum sklearn uses. Both treat tied scores exactly
+  as sklearn does;
+- threshold metrics (precision, sensitivity, specificity) count the four
+  confusion-matrix cells of ``y_score > threshold``;
+- the Brier score averages a precomputed per-row squared error.
+
+`grouped_metrics` scores many subgroups at once: one lexsort by (group,
+score) and segmented cumulative sums give every group's ranking metrics,
+and bincounts over group-offset codes give the rest.
+"""
+
+import numpy as np
+
+
+def as_float(values):
+    """
+    Float NumPy array of `values`, with NaN for missing entries.
+
+    Nullable pandas columns (e.g. the ``Int8`` outcomes of
+    `class_esrd_outcome`, which hold ``<NA>`` for censored rows) go through
+    ``to_numpy(na_value=)``: ``np.asarray(..., dtype=float)`` rejects ``<NA>``
+    before pandas 3.
+    """
+    if hasattr(values, "to_numpy"):
+        return values.to_numpy(dtype=float, na_value=np.nan)
+    return np.asarray(values, dtype=float)
+
+
+METRICS = (
+    "precision",
+    "average_precision",
+    "sensitivity",
+    "specificity",
+    "auc_roc",
+    "brier",
+)
+
+
+def check_metric(metric):
+    """Raise ValueError if `metric` is not one of `METRICS`."""
+    if metric not in METRICS:
+        raise ValueError(
+            f"Unknown metric {metric!r}. Choose from: precision, "
+            "average_precision, sensitivity, specificity, auc_roc, brier."
+        )
+
+
+def prepare(metric, y_true, y_score, threshold=0.5):
+    """
+    Precompute the per-row codes `metric_values` needs.
+
+    Parameters:
+    - metric (str): One of `METRICS`.
+    - y_true (np.ndarray): Integer 0/1 labels with no missing values.
+    - y_score (np.ndarray): Float scores aligned with `y_true`.
+    - threshold (float): Cutoff for the threshold-based metrics.
+
+    Returns:
+    - tuple: (codes, n_codes). For "brier" `codes` holds the per-row squared
+      error and `n_codes` is None.
+    """
+    check_metric(metric)
+    if metric == "brier":
+        return (y_score - y_true) ** 2, None
+    if metric in ("auc_roc", "average_precision"):
+        _, groups = np.unique(y_score, return_inverse=True)
+        n_groups = int(groups.max()) + 1 if groups.size else 0
+        return groups * 2 + y_true, 2 * n_groups
+    return y_true * 2 + (y_score > threshold), 4
+
+
+def counts(codes, n_codes, idx):
+    """
+    Count the codes drawn by each row of `idx`.
+
+    Returns an int64 array of shape (len(idx), n_codes).
+    """
+    n_rows = idx.shape[0]
+    keys = codes[idx]
+    keys += (np.arange(n_rows, dtype=np.int64) * n_codes)[:, None]
+    return np.bincount(keys.ravel(), minlength=n_rows * n_codes).reshape(
+        n_rows, n_codes
+    )
+
+
+def auc_from_counts(neg, pos):
+    """AUC ROC per row from (rows, groups) counts in ascending score order."""
+    n_pos = pos.sum(axis=1)
+    n_neg = neg.sum(axis=1)
+    below = np.cumsum(neg, axis=1) - neg
+    wins = (pos * (below + 0.5 * neg)).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        auc = wins / (n_pos * n_neg)
+    return np.where((n_pos > 0) & (n_neg > 0), auc, np.nan)
+
+
+def ap_from_counts(neg, pos):
+    """Average precision per row from (rows, groups) counts, ascending scores."""
+    pos = pos[:, ::-1]
+    tp = np.cumsum(pos, axis=1)
+    flagged = tp + np.cumsum(neg[:, ::-1], axis=1)
+    precision = np.divide(tp, flagged, out=np.zeros(tp.shape), where=flagged > 0)
+    n_pos = pos.sum(axis=1)
+    n_neg = neg.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ap = (pos * precision).sum(axis=1) / n_pos
+    return np.where((n_pos > 0) & (n_neg > 0), ap, np.nan)
+
+
+def confusion_metric(metric, cells):
+    """
+    Threshold metric per row from (rows, 4) confusion counts.
+
+    Columns are TN, FP, FN, TP (code ``2 * y_true + y_pred``). An empty
+    denominator gives 0, matching sklearn's ``zero_division=0``.
+    """
+    tn, fp, fn, tp = cells.T
+    if metric == "precision":
+        num, den = tp, tp + fp
+    elif metric == "sensitivity":
+        num, den = tp, tp + fn
+    else:
+        num, den = tn, tn + fp
+    return np.divide(num, den, out=np.zeros(len(cells)), where=den > 0)
+
+
+def prepare_all(y_true, y_score, threshold=0.5):
+    """Precompute the codes for every metric; see `all_metric_values`."""
+    return {
+        "ranking": prepare("auc_roc", y_true, y_score),
+        "threshold": prepare("precision", y_true, y_score, threshold),
+        "brier": prepare("brier", y_true, y_score),
+    }
+
+
+def all_metric_values(prepared, idx):
+    """
+    Evaluate every metric in `METRICS` on each row of the index block `idx`.
+
+    `prepared` comes from `prepare_all`. The ranking and confusion counts are
+    each taken once and shared by the metrics derived from them.
+
+    Returns:
+    - dict: {metric: np.ndarray of shape (len(idx),)}.
+    """
+    ranked = counts(*prepared["ranking"], idx)
+    neg, pos = ranked[:, 0::2], ranked[:, 1::2]
+    cells = counts(*prepared["threshold"], idx)
+    return {
+        "precision": confusion_metric("precision", cells),
+        "average_precision": ap_from_counts(neg, pos),
+        "sensitivity": confusion_metric("sensitivity", cells),
+        "specificity": confusion_metric("specificity", cells),
+        "auc_roc": auc_from_counts(neg, pos),
+        "brier": prepared["brier"][0][idx].mean(axis=1),
+    }
+
+
+def metric_values(metric, codes, n_codes, idx):
+    """
+    Evaluate `metric` on every resample (row) of the index block `idx`.
+
+    Rows where the metric is undefined (a ranking metric on a resample with
+    a single outcome class) are NaN.
+    """
+    if metric == "brier":
+        return codes[idx].mean(axis=1)
+    return metric_from_counts(metric, counts(codes, n_codes, idx))
+
+
+def metric_from_counts(metric, drawn):
+    """
+    Evaluate a ranking or threshold metric per row of code counts.
+
+    `drawn` has one column per code, as produced by `counts`; counts may be
+    weighted (float), e.g. by Poisson bootstrap weights.
+    """
+    if metric == "auc_roc":
+        return auc_from_counts(drawn[:, 0::2], drawn[:, 1::2])
+    if metric == "average_precision":
+        return ap_from_counts(drawn[:, 0::2], drawn[:, 1::2])
+    return confusion_metric(metric, drawn)
+
+
+def score_bins(y_score, n_bins):
+    """
+    Map scores to `n_bins` equal-width bins over [0, 1].
+
+    Scores outside [0, 1] fall into the first or last bin. Ranking metrics
+    computed from binned scores treat each bin as one tied score, so they
+    differ from the exact values only through pairs that share a bin.
+    """
+    bins = np.floor(as_float(y_score) * n_bins)
+    return np.clip(bins, 0, n_bins - 1).astype(np.int64)
+
+
+def ranked_counts(y_true, y_score, sample_weight=None):
+    """
+    Sort once and return cumulative counts at every distinct score.
+
+    Returns (thresholds, tp, fp): distinct scores in descending order and the
+    number (or total `sample_weight`) of positives / negatives scoring at or
+    above each of them.
+    """
+    order = np.argsort(y_score, kind="mergesort")[::-1]
+    scores = y_score[order]
+    last = np.r_[np.flatnonzero(np.diff(scores)), scores.size - 1]
+    if sample_weight is None:
+        tp = np.cumsum(y_true[order])[last]
+        fp = last + 1 - tp
+    else:
+        w = sample_weight[order]
+        tp = np.cumsum(w * y_true[order])[last]
+        fp = np.cumsum(w * (1 - y_true[order]))[last]
+    return scores[last], tp, fp
+
+
+def summary_metrics(y_true, y_score, threshold=0.5, sample_weight=None):
+    """
+    Compute every metric in `METRICS` from a single sort.
+
+    AUC ROC and average precision come from the cumulative TP/FP counts
+    (trapezoidal ROC area and step-wise precision-recall sum, as in sklearn),
+    the threshold metrics from the counts above ``threshold`` found by
+    `np.searchsorted`, and the Brier score directly.
+
+    Parameters:
+    - y_true (np.ndarray): 0/1 labels.
+    - y_score (np.ndarray): Float scores aligned with `y_true`.
+    - threshold (float): Cutoff for the threshold-based metrics.
+    - sample_weight (np.ndarray, optional): Non-negative row weights (e.g.
+      IPCW weights). Rows with zero weight are dropped before the checks
+      below, so they may hold NaN labels.
+
+    Returns:
+    - dict: {metric: float}.
+
+    Raises:
+    - ValueError: If either input contains NaN, or `y_true` holds a single
+      class (AUC ROC is then undefined).
+    """
+    y_true = as_float(y_true)
+    y_score = as_float(y_score)
+    if sample_weight is not None:
+        sample_weight = as_float(sample_weight)
+        keep = sample_weight != 0
+        y_true, y_score = y_true[keep], y_score[keep]
+        sample_weight = sample_weight[keep]
+        if np.isnan(sample_weight).any() or (sample_weight < 0).any():
+            raise ValueError("sample_weight must be non-negative without NaN.")
+    if np.isnan(y_true).any() or np.isnan(y_score).any():
+        raise ValueError("Input contains NaN.")
+    if np.unique(y_true).size < 2:
+        raise ValueError(
+            "Only one class present in y_true. ROC AUC score is not defined "
+            "in that case."
+        )
+
+    thresholds, tp, fp = ranked_counts(y_true, y_score, sample_weight)
+    n_pos, n_neg = tp[-1], fp[-1]
+
+    tpr = np.r_[0.0, tp] / n_pos
+    fpr = np.r_[0.0, fp] / n_neg
+    auc = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1])) / 2)
+    ap = float(np.sum(np.diff(tpr) * (tp / (tp + fp))))
+
+    # Distinct scores strictly above the threshold (thresholds descend).
+    k = np.searchsorted(-thresholds, -threshold, side="left")
+    tp_k = tp[k - 1] if k else 0.0
+    fp_k = fp[k - 1] if k else 0.0
+    cells = np.array([[n_neg - fp_k, fp_k, n_pos - tp_k, tp_k]])
+
+    return {
+        "precision": float(confusion_metric("precision", cells)[0]),
+        "average_precision": ap,
+        "sensitivity": float(confusion_metric("sensitivity", cells)[0]),
+        "specificity": float(confusion_metric("specificity", cells)[0]),
+        "auc_roc": auc,
+        "brier": float(np.average((y_score - y_true) ** 2, weights=sample_weight)),
+    }
+
+
+def operating_points(y_true, y_score, thresholds):
+    """
+    Confusion counts at many thresholds from a single sort.
+
+    A row is flagged when ``y_score > threshold``. The cumulative counts of
+    `ranked_counts` are looked up with one `np.searchsorted`, so the cost is
+    O(n log n) for the sort plus O(t log n) for t thresholds.
+
+    Returns:
+    - dict: "tp", "fp", "fn", "tn" arrays aligned with `thresholds`.
+    """
+    thresholds = np.asarray(thresholds, dtype=float)
+    if not np.size(y_score):
+        zeros = np.zeros(thresholds.shape, dtype=np.int64)
+        return {"tp": zeros, "fp": zeros, "fn": zeros, "tn": zeros}
+    distinct, tp, fp = ranked_counts(y_true, y_score)
+    n_pos, n_neg = tp[-1], fp[-1]
+    # Number of distinct scores strictly above each threshold.
+    k = np.searchsorted(-distinct, -thresholds, side="left")
+    tp_k = np.r_[0, tp][k]
+    fp_k = np.r_[0, fp][k]
+    return {"tp": tp_k, "fp": fp_k, "fn": n_pos - tp_k, "tn": n_neg - fp_k}
+
+
+def segment_cumsum(values, starts):
+    """Cumulative sum of `values` restarting wherever `starts` is True."""
+    total = np.cumsum(values)
+    before = (total - values)[starts]
+    return total - before[np.cumsum(starts) - 1]
+
+
+def grouped_metrics(group, n_groups, y_true, y_score, threshold=0.5):
+    """
+    Every metric in `METRICS` for each of `n_groups` subgroups at once.
+
+    Rows are lexsorted once by (group, descending score). Within each group,
+    segmented cumulative sums give the TP/FP counts at every distinct score,
+    from which the trapezoidal AUC and step-wise average precision of all
+    groups are summed with `np.bincount`; ties are handled as in
+    `summary_metrics`. Threshold metrics and the Brier score come from
+    bincounts over group-offset codes. Cost is O(n log n) however many
+    groups there are.
+
+    Parameters:
+    - group (np.ndarray): Integer group codes in [0, n_groups).
+    - n_groups (int): Number of groups.
+    - y_true (np.ndarray): 0/1 labels without NaN.
+    - y_score (np.ndarray): Float scores without NaN.
+    - threshold (float): Cutoff for the threshold-based metrics.
+
+    Returns:
+    - dict: {metric: (n_groups,) array} plus "n" and "events". Ranking
+      metrics are NaN for groups with a single class; other metrics are NaN
+      for empty groups.
+    """
+    group = np.asarray(group, dtype=np.int64)
+    y_true = as_float(y_true)
+    y_score = as_float(y_score)
+    n = np.bincount(group, minlength=n_groups).astype(float)
+    n_pos = np.bincount(group, weights=y_true, minlength=n_groups)
+    n_neg = n - n_pos
+
+    order = np.lexsort((-y_score, group))
+    g, y, s = group[order], y_true[order], y_score[order]
+    group_start = np.r_[True, g[1:] != g[:-1]]
+    tp = segment_cumsum(y, group_start)
+    fp = segment_cumsum(1.0 - y, group_start)
+
+    # Cumulative counts at the last row of each (group, score) run.
+    run_end = np.r_[(g[1:] != g[:-1]) | (s[1:] != s[:-1]), True]
+    rg, tp, fp = g[run_end], tp[run_end], fp[run_end]
+    first = np.r_[True, rg[1:] != rg[:-1]]
+    tp_prev = np.where(first, 0.0, np.r_[0.0, tp[:-1]])
+    fp_prev = np.where(first, 0.0, np.r_[0.0, fp[:-1]])
+
+    area = np.bincount(
+        rg, weights=(fp - fp_prev) * (tp + tp_prev) / 2, minlength=n_groups
+    )
+    precision_sum = np.bincount(
+        rg, weights=(tp - tp_prev) * tp / (tp + fp), minlength=n_groups
+    )
+    both = (n_pos > 0) & (n_neg > 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        auc = np.where(both, area / (n_pos * n_neg), np.nan)
+        ap = np.where(both, precision_sum / n_pos, np.nan)
+        brier = np.bincount(
+            group, weights=(y_score - y_true) ** 2, minlength=n_groups
+        ) / np.where(n > 0, n, np.nan)
+
+    codes = group * 4 + (y_true * 2 + (y_score > threshold)).astype(np.int64)
+    cells = np.bincount(codes, minlength=4 * n_groups).reshape(n_groups, 4)
+    empty = n == 0
+    values = {
+        m: np.where(empty, np.nan, confusion_metric(m, cells))
+        for m in ("precision", "sensitivity", "specificity")
+    }
+    values.update(average_precision=ap, auc_roc=auc, brier=brier)
+    values = {m: values[m] for m in METRICS}
+    values.update(n=n.astype(np.int64), events=n_pos)
+    return values
@@ -0,0 +1,133 @@
+"""
+Internal process-pool helpers for kfre.
+
+Rows are split across a persistent `ProcessPoolExecutor`. Inputs and outputs
+live in `multiprocessing.shared_memory` blocks, so workers read their slice
+of the input matrix and write their slice of the risk matrix in place; only
+the block names, shapes and the small scoring plan are pickled.
+
+Work is always divided on `BLOCK_ROWS` boundaries and every block runs the
+same `score_block` kernel as the serial path, so parallel results are
+bit-identical to serial ones.
+"""
+
+import atexit
+import os
+
+import numpy as np
+
+from ._registry import score_block
+
+# Rows scored per kernel call. Serial and parallel paths both use it, which
+# keeps every matrix product the same shape whatever `n_jobs` is.
+BLOCK_ROWS = 65536
+
+_POOL = None
+_POOL_WORKERS = None
+
+
+def resolve_n_jobs(n_jobs):
+    """Map `n_jobs` (None, positive int, or negative like joblib) to a count."""
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+    if n_jobs == 0:
+        raise ValueError("n_jobs must be a non-zero integer or None.")
+    return n_jobs
+
+
+def get_pool(n_workers):
+    """Return the persistent process pool, (re)creating it for `n_workers`."""
+    global _POOL, _POOL_WORKERS
+    from concurrent.futures import ProcessPoolExecutor
+
+    if _POOL is None or _POOL_WORKERS != n_workers:
+        shutdown_pool()
+        _POOL = ProcessPoolExecutor(max_workers=n_workers)
+        _POOL_WORKERS = n_workers
+    return _POOL
+
+
+def shutdown_pool():
+    """Shut down the persistent process pool, if any."""
+    global _POOL, _POOL_WORKERS
+    if _POOL is not None:
+        _POOL.shutdown()
+        _POOL = None
+        _POOL_WORKERS = None
+
+
+atexit.register(shutdown_pool)
+
+
+def _attach(name):
+    from multiprocessing import shared_memory
+
+    try:
+        # Python 3.13+: the parent owns the block; don't let the worker's
+        # resource tracker unlink it on exit.
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def shared_array(shape):
+    """
+    Allocate a float64 array backed by a new shared memory block.
+
+    Returns (array, shm). The caller must ``del`` the array and then call
+    ``shm.close(); shm.unlink()`` when done.
+    """
+    from multiprocessing import shared_memory
+
+    nbytes = max(int(np.prod(shape)) * 8, 1)
+    shm = shared_memory.SharedMemory(create=True, size=nbytes)
+    return np.ndarray(shape, dtype=float, buffer=shm.buf), shm
+
+
+def score_blocks(raw, plan, out, start=0, stop=None):
+    """Score rows [start, stop) in `BLOCK_ROWS` blocks (the serial path)."""
+    stop = len(raw) if stop is None else stop
+    for lo in range(start, stop, BLOCK_ROWS):
+        hi = min(lo + BLOCK_ROWS, stop)
+        score_block(raw[lo:hi], plan, out[lo:hi])
+
+
+def _score_shared(raw_name, raw_shape, out_name, out_shape, plan, start, stop):
+    raw_shm, out_shm = _attach(raw_name), _attach(out_name)
+    try:
+        raw = np.ndarray(raw_shape, dtype=float, buffer=raw_shm.buf)
+        out = np.ndarray(out_shape, dtype=float, buffer=out_shm.buf)
+        score_blocks(raw, plan, out, start, stop)
+        del raw, out
+    finally:
+        raw_shm.close()
+        out_shm.close()
+
+
+def score_parallel(raw, raw_shm, out, out_shm, plan, n_workers):
+    """
+    Score shared-memory `raw` into shared-memory `out` across the pool.
+
+    Rows are split into at most `n_workers` contiguous ranges aligned to
+    `BLOCK_ROWS`; each worker writes its range of `out` in place.
+    """
+    n_blocks = -(-len(raw) // BLOCK_ROWS)
+    per_worker = -(-n_blocks // n_workers)
+    pool = get_pool(n_workers)
+    futures = [
+        pool.submit(
+            _score_shared,
+            raw_shm.name,
+            raw.shape,
+            out_shm.name,
+            out.shape,
+            plan,
+            lo * BLOCK_ROWS,
+            min((lo + per_worker) * BLOCK_ROWS, len(raw)),
+        )
+        for lo in range(0, n_blocks, per_worker)
+    ]
+    for future in futures:
+        future.result()
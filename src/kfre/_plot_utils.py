@@ -4,17 +4,28 @@ Internal plotting helpers for kfre.
 Mirrors the pattern in `model_metrics.metrics_utils`: a centralized save
 helper plus small per-curve drawing utilities that keep the public plotting
 functions thin and free of duplicated savefig/axes-styling code.
+
+ROC and precision-recall curves come from a `CurveCache`: each (model,
+outcome) pair is sorted once per plotting call, by `ranked_counts`, and both
+curves are derived from the same cumulative counts. Curves are then thinned
+to at most `max_points` vertices by `decimate`, so million-row cohorts render
+quickly and produce small SVGs.
+
+`figure_layout` and `draw_panels` describe and draw the figures of one call
+independently of how they are created, so `plot_kfre_metrics` (pyplot
+figures) and `KFREPlotter` (pyplot-free, reusable figures) share them.
+pyplot itself is only imported where the current figure or the pyplot
+figure registry is needed.
 """
 
 import os
 
-import matplotlib.pyplot as plt
-from sklearn.metrics import (
-    roc_curve,
-    auc,
-    precision_recall_curve,
-    average_precision_score,
-)
+import numpy as np
+
+from ._metrics import as_float, ranked_counts
+
+# Default vertex budget per drawn curve.
+MAX_CURVE_POINTS = 2000
 
 
 def save_plot_images(
@@ -35,6 +46,11 @@ def save_plot_images(
     is provided. When `image_filename` is provided it takes precedence over
     the auto-generated `filename`.
 
+    On a headless Agg canvas the figure is rendered once: the PNG is written
+    from that render's pixel buffer (cropped to the tight bounding box) and
+    the SVG reuses the bounding box instead of running its own layout pass.
+    Other canvases fall back to one `savefig` per format.
+
     Parameters
     ----------
     filename : str
@@ -54,40 +70,189 @@ def save_plot_images(
         `bbox_inches` argument passed to `savefig`.
     dpi : int, optional
         DPI for raster outputs (PNG only).
+
+    Returns
+    -------
+    list of str
+        Paths of the files written (empty when nothing was saved).
     """
     should_save = save_plots or (image_filename is not None)
     if not should_save:
-        return
+        return []
     if image_path_png is None and image_path_svg is None:
-        return
+        return []
 
     effective_name = image_filename if image_filename else filename
     if effective_name is None:
-        return
+        return []
 
-    fig = fig or plt.gcf()
+    if fig is None:
+        import matplotlib.pyplot as plt
+
+        fig = plt.gcf()
+    written = []
 
     if image_path_png:
         os.makedirs(image_path_png, exist_ok=True)
-        fig.savefig(
-            os.path.join(image_path_png, f"{effective_name}.png"),
-            bbox_inches=bbox_inches,
-            dpi=dpi,
-        )
+        png_path = os.path.join(image_path_png, f"{effective_name}.png")
+        bbox = _render_png(fig, png_path, bbox_inches, dpi)
+        if bbox is not None and bbox_inches == "tight":
+            # The SVG keeps the same (already padded) tight box.
+            bbox_inches = bbox
+        written.append(png_path)
 
     if image_path_svg:
         os.makedirs(image_path_svg, exist_ok=True)
-        fig.savefig(
-            os.path.join(image_path_svg, f"{effective_name}.svg"),
-            bbox_inches=bbox_inches,
-        )
+        svg_path = os.path.join(image_path_svg, f"{effective_name}.svg")
+        fig.savefig(svg_path, bbox_inches=bbox_inches)
+        written.append(svg_path)
+
+    return written
+
+
+def _render_png(fig, path, bbox_inches, dpi):
+    """
+    Write `fig` as PNG, reusing a single Agg render when possible.
+
+    Returns the padded bounding box (in inches) the PNG was cropped to, or
+    None when it fell back to `savefig`.
+    """
+    from matplotlib import rcParams
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.image import imsave
+
+    pad = rcParams["savefig.pad_inches"]
+    headless = type(fig.canvas) is FigureCanvasAgg
+    if not headless or bbox_inches not in ("tight", None) or pad == "layout":
+        fig.savefig(path, bbox_inches=bbox_inches, dpi=dpi)
+        return None
+
+    if dpi is None:
+        dpi = rcParams["savefig.dpi"]
+    if dpi == "figure":
+        dpi = fig.dpi
+    figure_dpi = fig.dpi
+    fig.dpi = dpi
+    try:
+        fig.canvas.draw()
+        buffer = np.asarray(fig.canvas.buffer_rgba())
+        height, width = buffer.shape[:2]
+        content = bbox = fig.bbox_inches
+        if bbox_inches == "tight":
+            content = fig.get_tightbbox(fig.canvas.get_renderer())
+            bbox = content.padded(pad)
+    finally:
+        fig.dpi = figure_dpi
+
+    x0, y0, x1, y1 = bbox.extents * dpi
+    c0, d0, c1, d1 = content.extents * dpi
+    if c0 < 0 or d0 < 0 or c1 > width + 0.5 or d1 > height + 0.5:
+        # Artists reach outside the canvas; savefig enlarges it to draw them.
+        fig.savefig(path, bbox_inches=bbox_inches, dpi=dpi)
+        return None
 
+    # Same size and bottom-left anchoring as savefig's tight canvas, up to
+    # sub-pixel alignment. Padding may reach past the canvas edge; it is
+    # plain background there.
+    shape = (int(y1 - y0), int(x1 - x0), 4)
+    left, top = int(round(x0)), int(round(height - y0 - shape[0]))
+    crop = np.empty(shape, dtype=np.uint8)
+    crop[:] = np.round(np.multiply(fig.get_facecolor(), 255)).astype(np.uint8)
+    rows = slice(max(top, 0), min(top + crop.shape[0], height))
+    cols = slice(max(left, 0), min(left + crop.shape[1], width))
+    crop[rows.start - top : rows.stop - top, cols.start - left : cols.stop - left] = (
+        buffer[rows, cols]
+    )
+    imsave(path, crop, format="png", origin="upper", dpi=dpi)
+    return bbox
+
+
+def decimate(x, y, max_points=MAX_CURVE_POINTS):
+    """
+    Thin a polyline to at most about `max_points` vertices.
+
+    The curve is cut into `max_points - 1` pieces of equal length (L1 arc
+    length in axis units) and only the first vertex of each piece and the
+    last vertex are kept. Every dropped vertex lies on the curve between two
+    kept vertices less than one piece apart, so it is within L / (max_points
+    - 1) of the drawn line, L being the curve length (at most 2 for a ROC
+    curve). With ``max_points=None`` the curve is returned unchanged.
+    """
+    if max_points is None or x.size <= max_points:
+        return x, y
+    step = np.abs(np.diff(x)) + np.abs(np.diff(y))
+    arc = np.r_[0.0, np.cumsum(step)]
+    if arc[-1] == 0:
+        return x[[0, -1]], y[[0, -1]]
+    piece = np.floor(arc * ((max_points - 1) / arc[-1]))
+    keep = np.r_[True, np.diff(piece) != 0]
+    keep[-1] = True
+    return x[keep], y[keep]
+
+
+class CurveCache:
+    """
+    ROC and precision-recall curves computed once per (model, outcome).
+
+    Parameters:
+    - max_points (int or None): Vertex budget per curve; see `decimate`.
+
+    The first request for a key sorts its scores once (`ranked_counts`);
+    the ROC curve, PR curve, AUC and average precision all derive from those
+    cumulative counts and are reused by every later figure of the call.
+    """
+
+    def __init__(self, max_points=MAX_CURVE_POINTS):
+        self.max_points = max_points
+        self._curves = {}
+
+    def __len__(self):
+        return len(self._curves)
+
+    def get(self, key, y_true, y_score):
+        """Return {"roc": (fpr, tpr, auc), "pr": (recall, precision, ap)}."""
+        if key not in self._curves:
+            self._curves[key] = self._compute(y_true, y_score)
+        return self._curves[key]
+
+    def _compute(self, y_true, y_score):
+        y_true = as_float(y_true)
+        y_score = as_float(y_score)
+        if np.isnan(y_true).any() or np.isnan(y_score).any():
+            raise ValueError("Input contains NaN.")
+        _, tp, fp = ranked_counts(y_true, y_score)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            tpr = np.r_[0.0, tp] / tp[-1]
+            fpr = np.r_[0.0, fp] / fp[-1]
+            precision = tp / (tp + fp)
+        auc_score = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1])) / 2)
+        ap_score = float(np.sum(np.diff(tpr) * precision))
+
+        # As in sklearn, the PR curve stops at the first full-recall point
+        # and starts from (recall 0, precision 1).
+        stop = np.searchsorted(tp, tp[-1]) + 1
+        recall = np.r_[0.0, tpr[1 : stop + 1]]
+        precision = np.r_[1.0, precision[:stop]]
+        return {
+            "roc": (*decimate(fpr, tpr, self.max_points), auc_score),
+            "pr": (*decimate(recall, precision, self.max_points), ap_score),
+        }
+
+
+def draw_roc(
+    ax, true_list, pred_list, outcomes, var_label, decimal_places=2, curves=None
+):
+    """
+    Draw ROC curves for a set of (truth, prediction) pairs on a given Axes.
 
-def draw_roc(ax, true_list, pred_list, outcomes, var_label, decimal_places=2):
-    """Draw ROC curves for a set of (truth, prediction) pairs on a given Axes."""
+    `curves` is a `CurveCache` shared across the figures of one call; a
+    private one is used when it is None.
+    """
+    curves = CurveCache() if curves is None else curves
     for true_labels, pred_labels, outcome in zip(true_list, pred_list, outcomes):
-        fpr, tpr, _ = roc_curve(true_labels, pred_labels)
-        auc_score = auc(fpr, tpr)
+        fpr, tpr, auc_score = curves.get(
+            (var_label, outcome), true_labels, pred_labels
+        )["roc"]
         ax.plot(
             fpr,
             tpr,
@@ -98,11 +263,15 @@ def draw_roc(ax, true_list, pred_list, outcomes, var_label, decimal_places=2):
         )
 
 
-def draw_pr(ax, true_list, pred_list, outcomes, var_label, decimal_places=2):
+def draw_pr(
+    ax, true_list, pred_list, outcomes, var_label, decimal_places=2, curves=None
+):
     """Draw Precision-Recall curves for a set of pairs on a given Axes."""
+    curves = CurveCache() if curves is None else curves
     for true_labels, pred_labels, outcome in zip(true_list, pred_list, outcomes):
-        precision, recall, _ = precision_recall_curve(true_labels, pred_labels)
-        ap_score = average_precision_score(true_labels, pred_labels)
+        recall, precision, ap_score = curves.get(
+            (var_label, outcome), true_labels, pred_labels
+        )["pr"]
         ax.plot(
             recall,
             precision,
@@ -128,3 +297,172 @@ def finalize_pr_axes(ax, title):
     ax.set_ylabel("Precision")
     ax.set_title(title)
     ax.legend(loc="best")
+
+
+def figure_layout(
+    num_vars, plot_type, plot_combinations=False, show_subplots=False, image_prefix=None
+):
+    """
+    Describe the figures one `plot_kfre_metrics` call produces.
+
+    Returns:
+    - list: One (auto_suffix, multi_suffix, panels) tuple per figure. The
+      suffixes name its files (see `save_names`); `multi_suffix` is None
+      when the call produces a single file. Each panel is a (kind, title,
+      models) tuple, kind being "roc" or "pr" and models the variable counts
+      drawn on it; a figure holds one panel, or every panel in subplots mode.
+    """
+    # Multi-output flag: True when one call produces >1 distinct file.
+    multi_output = (
+        (plot_combinations and plot_type == "all_plots")
+        or show_subplots
+        or (len(num_vars) > 1 and not plot_combinations)
+    )
+
+    roc, pr = [], []
+    if plot_combinations:
+        names = ", ".join(map(str, num_vars))
+        roc.append(
+            (
+                ("roc", f"AUC ROC: {names} Variable KFRE", list(num_vars)),
+                "auc_roc_curve_combined",
+                "auc_roc_combined",
+            )
+        )
+        pr.append(
+            (
+                ("pr", f"Precision-Recall: {names} Variable KFRE", list(num_vars)),
+                "pr_curve_combined",
+                "pr_combined",
+            )
+        )
+    else:
+        for n in num_vars:
+            roc.append(
+                (
+                    ("roc", f"AUC ROC: {n} Variable KFRE", [n]),
+                    f"{n}var_auc_roc",
+                    f"{n}var_auc_roc",
+                )
+            )
+            pr.append(
+                (
+                    ("pr", f"Precision-Recall: {n} Variable KFRE", [n]),
+                    f"{n}var_precision_recall",
+                    f"{n}var_precision_recall",
+                )
+            )
+    if plot_type == "auc_roc":
+        pr = []
+    elif plot_type == "precision_recall":
+        roc = []
+
+    if show_subplots:
+        if plot_type == "all_plots" and plot_combinations:
+            auto_suffix = "subplot_all_plots_combination"
+        elif image_prefix:
+            auto_suffix = "subplot"
+        else:
+            auto_suffix = "performance_subplot"
+        return [(auto_suffix, "subplot", [panel for panel, _, _ in roc + pr])]
+
+    if plot_combinations or not (roc and pr):
+        ordered = roc + pr
+    else:
+        # Per-model figures alternate ROC and PR.
+        ordered = [entry for pair in zip(roc, pr) for entry in pair]
+    return [
+        (auto_suffix, multi_suffix if multi_output else None, [panel])
+        for panel, auto_suffix, multi_suffix in ordered
+    ]
+
+
+def save_names(auto_suffix, multi_suffix, image_prefix=None, image_filename=None):
+    """
+    Resolve the (filename, image_filename) pair passed to `save_plot_images`.
+
+    - The auto-generated filename carries `image_prefix` when given.
+    - When `image_filename` is set and `multi_suffix` is given (multi-output
+      mode), the suffix is appended to image_filename so files don't collide.
+    - When `image_filename` is set without `multi_suffix`, image_filename
+      is used verbatim.
+    """
+    filename = f"{image_prefix}_{auto_suffix}" if image_prefix else auto_suffix
+    if image_filename and multi_suffix:
+        return filename, f"{image_filename}_{multi_suffix}"
+    return filename, image_filename
+
+
+def grid_shape(n_panels):
+    """(rows, cols) of the subplot grid for `n_panels` panels, 3 per row."""
+    cols = min(n_panels, 3)
+    return (n_panels + cols - 1) // cols, cols
+
+
+def draw_panels(axes, panels, y_true, preds, outcomes, curves, decimal_places=2):
+    """
+    Draw `panels` (from `figure_layout`) on `axes`, one panel per Axes.
+
+    `preds` maps "{n}var" to the prediction columns aligned with `y_true`
+    and `outcomes`; `curves` is the call's `CurveCache`.
+    """
+    for ax, (kind, title, models) in zip(axes, panels):
+        draw = draw_roc if kind == "roc" else draw_pr
+        for n in models:
+            draw(
+                ax,
+                y_true,
+                preds[f"{n}var"],
+                outcomes,
+                var_label=f"{n}-variable",
+                decimal_places=decimal_places,
+                curves=curves,
+            )
+        finalize = finalize_roc_axes if kind == "roc" else finalize_pr_axes
+        finalize(ax, title)
+
+
+def run_figure_job(job, headless=True):
+    """
+    Run one `plot_kfre_metrics` job and close the figures it created.
+
+    With `headless` (the worker entry point), the process switches to the
+    Agg backend first, so nothing is shown.
+    """
+    import warnings
+
+    if headless:
+        import matplotlib
+
+        matplotlib.use("Agg", force=True)
+    import matplotlib.pyplot as plt
+
+    from .perform_eval import plot_kfre_metrics
+
+    open_before = set(plt.get_fignums())
+    try:
+        with warnings.catch_warnings():
+            # plt.show() on Agg only warns that it cannot show anything.
+            warnings.filterwarnings("ignore", message=".*non-interactive.*")
+            plot_kfre_metrics(**dict(job, mode="plot"))
+    finally:
+        for num in set(plt.get_fignums()) - open_before:
+            plt.close(num)
+
+
+def run_figure_jobs(jobs, n_jobs=None):
+    """
+    Run `plot_kfre_metrics` jobs serially in this process, or across the
+    persistent process pool of headless workers.
+    """
+    from ._parallel import get_pool, resolve_n_jobs
+
+    jobs = list(jobs)
+    n_workers = min(resolve_n_jobs(n_jobs), len(jobs))
+    if n_workers <= 1:
+        for job in jobs:
+            run_figure_job(job, headless=False)
+        return
+    pool = get_pool(n_workers)
+    for future in [pool.submit(run_figure_job, job) for job in jobs]:
+        future.result()
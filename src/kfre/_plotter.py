@@ -0,0 +1,182 @@
+"""
+Object-oriented KFRE plotting without pyplot.
+
+`KFREPlotter` draws the same ROC and precision-recall figures as
+`plot_kfre_metrics`, but builds them as plain `matplotlib.figure.Figure`
+objects on headless Agg canvases. Nothing is registered with pyplot, shown,
+or left open in its figure manager, so long-running report jobs do not
+accumulate figures. Figures and their axes are kept per layout slot and
+cleared and redrawn on the next call, which keeps memory flat across
+thousands of figures.
+"""
+
+from ._plot_utils import (
+    MAX_CURVE_POINTS,
+    CurveCache,
+    draw_panels,
+    figure_layout,
+    grid_shape,
+    save_names,
+    save_plot_images,
+)
+
+
+class KFREPlotter:
+    """
+    Reusable, pyplot-free ROC/PR figure factory for KFRE predictions.
+
+    Parameters:
+    - figsize (tuple): Size of one panel in inches. Default (12, 6).
+    - image_path_png (str, optional): Directory for PNG output.
+    - image_path_svg (str, optional): Directory for SVG output.
+    - bbox_inches (str or None): Bounding box for saved images.
+      Default "tight".
+    - dpi (int, optional): DPI for PNG output.
+    - decimal_places (int): Decimal places of AUC/AP in legends. Default 2.
+    - max_points (int or None): Vertex budget per curve (see
+      `plot_kfre_metrics`). Default 2000.
+    - reuse (bool): Keep each figure and its axes and redraw them on the
+      next call instead of allocating new ones. Default True.
+    - close_after_save (bool): Clear each figure as soon as its files are
+      written, releasing its artists and curve data. Default False.
+
+    Notes:
+    - With `reuse`, the figures returned by `plot` are redrawn by the next
+      call; save or copy what you need first.
+    - With `close_after_save`, saved figures come back empty. Use it when
+      only the files are wanted.
+    """
+
+    def __init__(
+        self,
+        figsize=(12, 6),
+        image_path_png=None,
+        image_path_svg=None,
+        bbox_inches="tight",
+        dpi=None,
+        decimal_places=2,
+        max_points=MAX_CURVE_POINTS,
+        reuse=True,
+        close_after_save=False,
+    ):
+        if not isinstance(bbox_inches, (str, type(None))):
+            raise ValueError("The 'bbox_inches' parameter must be a string or None.")
+        self.figsize = figsize
+        self.image_path_png = image_path_png
+        self.image_path_svg = image_path_svg
+        self.bbox_inches = bbox_inches
+        self.dpi = dpi
+        self.decimal_places = decimal_places
+        self.max_points = max_points
+        self.reuse = reuse
+        self.close_after_save = close_after_save
+        # (slot, rows, cols, n_panels) -> Figure kept for reuse.
+        self._figures = {}
+
+    def __len__(self):
+        """Number of figures currently kept for reuse."""
+        return len(self._figures)
+
+    def _figure(self, slot, n_panels):
+        """A cleared figure with `n_panels` axes for layout slot `slot`."""
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        rows, cols = grid_shape(n_panels)
+        size = (self.figsize[0] * cols, self.figsize[1] * rows)
+        key = (slot, rows, cols, n_panels)
+        fig = self._figures.get(key) if self.reuse else None
+        if fig is None:
+            fig = Figure(figsize=size)
+            FigureCanvasAgg(fig)
+            axs = fig.subplots(rows, cols, squeeze=False).flatten()
+            for ax in axs[n_panels:]:
+                fig.delaxes(ax)
+            if self.reuse:
+                self._figures[key] = fig
+        else:
+            fig.set_size_inches(size)
+            for ax in fig.axes:
+                ax.clear()
+        return fig
+
+    def plot(
+        self,
+        df,
+        num_vars,
+        show_years=(2, 5),
+        plot_type="all_plots",
+        plot_combinations=False,
+        show_subplots=False,
+        save_plots=False,
+        image_prefix=None,
+        image_filename=None,
+    ):
+        """
+        Draw (and optionally save) the figures `plot_kfre_metrics` would.
+
+        Arguments and file names match `plot_kfre_metrics`; `df` must hold
+        the ``kfre_*`` prediction and ``*_year_outcome`` columns.
+
+        Returns:
+        - list of matplotlib.figure.Figure: One figure per plot, or a single
+          grid with `show_subplots`.
+        """
+        from .perform_eval import plot_kfre_metrics
+
+        if save_plots and not (self.image_path_png or self.image_path_svg):
+            raise ValueError(
+                "To save plots, 'image_path_png' or 'image_path_svg' must be "
+                "specified."
+            )
+        # Validation and column collection are shared with plot_kfre_metrics.
+        y_true, preds, outcomes = plot_kfre_metrics(
+            df, num_vars, mode="prep", show_years=show_years, plot_type=plot_type
+        )
+        num_vars = [num_vars] if isinstance(num_vars, int) else list(num_vars)
+
+        curves = CurveCache(self.max_points)
+        layout = figure_layout(
+            num_vars, plot_type, plot_combinations, show_subplots, image_prefix
+        )
+        figures = []
+        for slot, (auto_suffix, multi_suffix, panels) in enumerate(layout):
+            fig = self._figure(slot, len(panels))
+            draw_panels(
+                fig.axes, panels, y_true, preds, outcomes, curves, self.decimal_places
+            )
+            if show_subplots:
+                fig.tight_layout()
+
+            filename, override = save_names(
+                auto_suffix, multi_suffix, image_prefix, image_filename
+            )
+            written = save_plot_images(
+                filename=filename,
+                save_plots=save_plots,
+                image_path_png=self.image_path_png,
+                image_path_svg=self.image_path_svg,
+                image_filename=override,
+                fig=fig,
+                bbox_inches=self.bbox_inches,
+                dpi=self.dpi,
+            )
+            if written and self.close_after_save:
+                self._release(fig)
+            figures.append(fig)
+        return figures
+
+    def _release(self, fig):
+        # Reused figures keep their (now empty) axes for the next call;
+        # others drop everything.
+        if fig in self._figures.values():
+            for ax in fig.axes:
+                ax.clear()
+        else:
+            fig.clear()
+
+    def close(self):
+        """Clear and forget every figure kept for reuse."""
+        for fig in self._figures.values():
+            fig.clear()
+        self._figures.clear()
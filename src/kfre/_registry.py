@@ -0,0 +1,456 @@
+"""
+Compiled KFRE model registry.
+
+The published 4-, 6- and 8-variable KFRE coefficients, centering constants
+and baseline survival (alpha) tables are compiled once into read-only NumPy
+arrays. A `ModelRegistry` stacks the coefficient vectors of all its models
+into a single ``(k, 3)`` matrix so every model's linear predictor can be
+obtained from one ``(n, k) @ (k, 3)`` product over a centered design matrix.
+
+Locally recalibrated coefficient sets are supported through
+`KFREModel.recalibrate` and `ModelRegistry.replace`, which return new
+immutable objects that run through exactly the same fast path.
+"""
+
+import numpy as np
+
+# Design-matrix feature order shared by every model. Each feature enters the
+# equation as coef * (x / scale - center); uACR is passed in on the log scale.
+FEATURES = (
+    "age",
+    "sex",
+    "eGFR",
+    "uACR",
+    "dm",
+    "htn",
+    "albumin",
+    "phosphorous",
+    "bicarbonate",
+    "calcium",
+)
+
+FEATURE_SCALE = {"age": 10.0, "eGFR": 5.0}
+
+# Published centering constants (Tangri et al.).
+PUBLISHED_CENTERS = {
+    "age": 7.036,
+    "sex": 0.5642,
+    "eGFR": 7.222,
+    "uACR": 5.137,
+    "dm": 0.5106,
+    "htn": 0.8501,
+    "albumin": 3.997,
+    "phosphorous": 3.916,
+    "bicarbonate": 25.57,
+    "calcium": 9.355,
+}
+
+# Inputs each KFRE variant needs, keyed by the `columns` mapping names.
+MODEL_REQUIREMENTS = {
+    4: ("age", "sex", "eGFR", "uACR"),
+    6: ("age", "sex", "eGFR", "uACR", "dm", "htn"),
+    8: (
+        "age",
+        "sex",
+        "eGFR",
+        "uACR",
+        "albumin",
+        "phosphorous",
+        "bicarbonate",
+        "calcium",
+    ),
+}
+
+# Published KFRE coefficients (Tangri et al., 2011/2016) and baseline survival
+# (alpha) keyed by (is_north_american, years), one entry per model variant.
+PUBLISHED_PARAMS = {
+    4: {
+        "coefficients": {
+            "age": -0.2201,
+            "sex": 0.2467,
+            "eGFR": -0.5567,
+            "uACR": 0.4510,
+        },
+        "alpha": {
+            (True, 2): 0.9750,
+            (True, 5): 0.9240,
+            (False, 2): 0.9832,
+            (False, 5): 0.9365,
+        },
+    },
+    6: {
+        "coefficients": {
+            "age": -0.2218,
+            "sex": 0.2553,
+            "eGFR": -0.5541,
+            "uACR": 0.4562,
+            "dm": -0.1475,
+            "htn": 0.1426,
+        },
+        "alpha": {
+            (True, 2): 0.9750,
+            (True, 5): 0.9240,
+            (False, 2): 0.9830,
+            (False, 5): 0.9370,
+        },
+    },
+    8: {
+        "coefficients": {
+            "age": -0.1992,
+            "sex": 0.1602,
+            "eGFR": -0.4919,
+            "uACR": 0.3364,
+            "albumin": -0.3441,
+            "phosphorous": +0.2604,
+            "bicarbonate": -0.07354,
+            "calcium": -0.2228,
+        },
+        "alpha": {
+            (True, 2): 0.9780,
+            (True, 5): 0.9301,
+            (False, 2): 0.9827,
+            (False, 5): 0.9245,
+        },
+    },
+}
+
+
+def _frozen(arr):
+    arr = np.array(arr, dtype=float)
+    arr.setflags(write=False)
+    return arr
+
+
+class KFREModel:
+    """
+    An immutable, compiled KFRE model specification.
+
+    Parameters:
+    - num_vars (int): The KFRE variant (4, 6, or 8). Determines which inputs
+      the model uses (see `MODEL_REQUIREMENTS`).
+    - coefficients (dict): One coefficient per required input, keyed by input
+      name (e.g. {"age": -0.2201, "sex": 0.2467, ...}).
+    - alpha (dict): Baseline survival keyed by (is_north_american, years).
+    - centers (dict, optional): Centering constants overriding the published
+      ones, keyed by input name.
+
+    Attributes:
+    - coef (np.ndarray): Read-only coefficient vector in `FEATURES` order
+      (zero for inputs the model does not use).
+    - center (np.ndarray): Read-only centering vector in `FEATURES` order.
+    - years (tuple): Horizons with a baseline survival.
+    - alpha_table (np.ndarray): Read-only (2, len(years)) array of baseline
+      survival; row 0 is non-North American, row 1 North American.
+    - terms (tuple): (name, coefficient, scale, center) per input, in
+      `features` order, for evaluating single patients with plain floats.
+    """
+
+    __slots__ = (
+        "num_vars",
+        "coef",
+        "center",
+        "years",
+        "alpha_table",
+        "terms",
+        "_alpha",
+    )
+
+    def __init__(self, num_vars, coefficients, alpha, centers=None):
+        if num_vars not in MODEL_REQUIREMENTS:
+            raise ValueError(f"num_vars must be 4, 6, or 8; got {num_vars!r}.")
+        required = MODEL_REQUIREMENTS[num_vars]
+        if set(coefficients) != set(required):
+            raise ValueError(
+                f"The {num_vars}-variable model needs exactly one coefficient "
+                f"for each of: {', '.join(required)}."
+            )
+        merged_centers = dict(PUBLISHED_CENTERS)
+        merged_centers.update(centers or {})
+        centers = merged_centers
+
+        years = tuple(sorted({year for _, year in alpha}))
+        alpha_table = np.full((2, len(years)), np.nan)
+        for (is_north_american, year), value in alpha.items():
+            alpha_table[int(bool(is_north_american)), years.index(year)] = value
+        if np.isnan(alpha_table).any():
+            raise ValueError(
+                "alpha must give a baseline survival for both regions "
+                "(is_north_american True and False) at every horizon."
+            )
+
+        set_ = object.__setattr__
+        set_(self, "num_vars", num_vars)
+        set_(self, "coef", _frozen([coefficients.get(f, 0.0) for f in FEATURES]))
+        set_(self, "center", _frozen([centers[f] for f in FEATURES]))
+        set_(self, "years", years)
+        set_(self, "alpha_table", _frozen(alpha_table))
+        # (name, coefficient, scale, center) for the scalar/Series evaluation.
+        set_(
+            self,
+            "terms",
+            tuple(
+                (f, float(coefficients[f]), FEATURE_SCALE.get(f), float(centers[f]))
+                for f in required
+            ),
+        )
+        set_(
+            self,
+            "_alpha",
+            {
+                (bool(region), year): float(alpha_table[region, j])
+                for region in (0, 1)
+                for j, year in enumerate(years)
+            },
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError("KFREModel is immutable; use recalibrate().")
+
+    def __repr__(self):
+        return f"KFREModel(num_vars={self.num_vars}, years={self.years})"
+
+    @property
+    def features(self):
+        """Inputs used by this model, in `FEATURES` order."""
+        return MODEL_REQUIREMENTS[self.num_vars]
+
+    @property
+    def coefficients(self):
+        """Coefficients as a dict keyed by input name."""
+        return {name: coef for name, coef, _, _ in self.terms}
+
+    @property
+    def alpha(self):
+        """Baseline survival as a dict keyed by (is_north_american, years)."""
+        return dict(self._alpha)
+
+    def baseline_survival(self, is_north_american, years):
+        """Baseline survival (alpha) for a region and horizon."""
+        try:
+            return self._alpha[(bool(is_north_american), years)]
+        except KeyError:
+            raise ValueError(
+                f"The {self.num_vars}-variable model has no baseline survival "
+                f"for {years!r} years; available horizons are {self.years}."
+            ) from None
+
+    def linear_predictor(self, **inputs):
+        """
+        Evaluate the linear predictor term by term.
+
+        Accepts scalars, arrays or Series keyed by input name (uACR on the log
+        scale) and returns the same kind of object, so it serves both the
+        single-patient and the Series paths of `risk_pred`.
+        """
+        risk_score = 0.0
+        for name, coef, scale, center in self.terms:
+            x = inputs[name]
+            if scale is not None:
+                x = x / scale
+            risk_score = risk_score + coef * (x - center)
+        return risk_score
+
+    def recalibrate(self, coefficients=None, alpha=None, centers=None):
+        """
+        Return a new model with some coefficients, baseline survivals or
+        centering constants replaced (e.g. a locally recalibrated KFRE).
+        Anything not supplied is carried over from this model.
+        """
+        merged_coefficients = self.coefficients
+        merged_coefficients.update(coefficients or {})
+        merged_alpha = self.alpha
+        merged_alpha.update(alpha or {})
+        merged_centers = dict(zip(FEATURES, self.center.tolist()))
+        merged_centers.update(centers or {})
+        return KFREModel(
+            self.num_vars,
+            merged_coefficients,
+            merged_alpha,
+            centers=merged_centers,
+        )
+
+
+class ModelRegistry:
+    """
+    An immutable collection of compiled `KFREModel` objects keyed by
+    `num_vars`, with their coefficients stacked for a single matrix product.
+
+    Every model's linear predictor equals ``X @ coef_matrix + offsets`` where
+    ``X`` is the design matrix centered on the published constants (see
+    `center_design`). Models with their own centering constants are folded in
+    through ``offsets``, so recalibrated models share the same product.
+
+    Attributes:
+    - keys (tuple): The `num_vars` of the registered models, in order.
+    - coef_matrix (np.ndarray): Read-only (len(FEATURES), len(keys)) matrix.
+    - offsets (np.ndarray): Read-only (len(keys),) intercept adjustments.
+    """
+
+    __slots__ = ("_models", "keys", "coef_matrix", "offsets")
+
+    def __init__(self, models):
+        models = {model.num_vars: model for model in models}
+        keys = tuple(sorted(models))
+        published = np.array([PUBLISHED_CENTERS[f] for f in FEATURES])
+        coef_matrix = np.column_stack([models[k].coef for k in keys])
+        offsets = np.array(
+            [models[k].coef @ (published - models[k].center) for k in keys]
+        )
+
+        set_ = object.__setattr__
+        set_(self, "_models", models)
+        set_(self, "keys", keys)
+        set_(self, "coef_matrix", _frozen(coef_matrix))
+        set_(self, "offsets", _frozen(offsets))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ModelRegistry is immutable; use replace().")
+
+    def __getitem__(self, num_vars):
+        try:
+            return self._models[num_vars]
+        except KeyError:
+            raise ValueError(
+                f"num_vars must be one of {self.keys}; got {num_vars!r}."
+            ) from None
+
+    def __contains__(self, num_vars):
+        return num_vars in self._models
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def __repr__(self):
+        return f"ModelRegistry(keys={self.keys})"
+
+    def replace(self, *models):
+        """Return a new registry with the given models added or replaced."""
+        return ModelRegistry(list(self._models.values()) + list(models))
+
+    def linear_predictors(self, design, features, num_vars):
+        """
+        Compute the linear predictors of several models in one product.
+
+        Parameters:
+        - design (np.ndarray): (n, len(features)) design matrix centered on the
+          published constants (see `center_design`).
+        - features (sequence of str): The `FEATURES` held by ``design``'s
+          columns.
+        - num_vars (sequence of int): Models to evaluate.
+
+        Returns:
+        - np.ndarray: (n, len(num_vars)) linear predictors.
+        """
+        rows = [FEATURES.index(f) for f in features]
+        # Indexing through self[k] raises a clear error for unknown models.
+        cols = [self.keys.index(self[k].num_vars) for k in num_vars]
+        coef = self.coef_matrix[np.ix_(rows, cols)]
+        return design @ coef + self.offsets[cols]
+
+
+def center_design(raw, features):
+    """
+    Build the published-centered design matrix for the given features.
+
+    Parameters:
+    - raw (np.ndarray): (n, len(features)) float64 inputs on their natural
+      scale (uACR as measured; it is log-transformed here, with non-positive
+      values treated as missing).
+    - features (sequence of str): The `FEATURES` held by ``raw``'s columns.
+
+    Returns:
+    - (design, missing): the (n, len(features)) float64 design matrix with
+      non-finite entries zeroed, and a dict of boolean row masks for the
+      features that had any non-finite entry. Zeroing keeps a missing input
+      of one model (e.g. albumin) from turning the other models' linear
+      predictors into NaN through ``0 * NaN``; callers mask those rows per
+      model afterwards.
+    """
+    design = np.array(raw, dtype=float, order="F")
+    missing = {}
+    for j, name in enumerate(features):
+        column = design[:, j]
+        if name == "uACR":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                column[~(column > 0)] = np.nan
+                np.log(column, out=column)
+        scale = FEATURE_SCALE.get(name)
+        if scale is not None:
+            column /= scale
+        column -= PUBLISHED_CENTERS[name]
+        bad = ~np.isfinite(column)
+        if bad.any():
+            column[bad] = 0.0
+            missing[name] = bad
+    return design, missing
+
+
+def scoring_plan(registry, num_vars, years, is_north_american):
+    """
+    Compile the small, picklable arrays `score_block` needs for one request.
+
+    Returns:
+    - dict with "features" (tuple of input names in design order), "coef"
+      ((k, m) coefficients), "offsets" ((m,)), "alpha" ((m, len(years))
+      baseline survivals) and "requires" ((m, k) bool, inputs used by each
+      model). Output column ``j * len(years) + i`` holds model ``j`` at
+      horizon ``i``.
+    """
+    models = [registry[n] for n in num_vars]
+    needed = {f for model in models for f in model.features}
+    features = tuple(f for f in FEATURES if f in needed)
+    rows = [FEATURES.index(f) for f in features]
+    cols = [registry.keys.index(model.num_vars) for model in models]
+    return {
+        "features": features,
+        "coef": np.ascontiguousarray(registry.coef_matrix[np.ix_(rows, cols)]),
+        "offsets": registry.offsets[cols].copy(),
+        "alpha": np.array(
+            [
+                [model.baseline_survival(is_north_american, year) for year in years]
+                for model in models
+            ]
+        ),
+        "requires": np.array(
+            [[f in model.features for f in features] for model in models]
+        ),
+    }
+
+
+def score_block(raw, plan, out):
+    """
+    Score one block of rows in place.
+
+    Every model's linear predictor comes from a single ``(b, k) @ (k, m)``
+    product over the centered design; each horizon is then derived from the
+    shared ``exp(risk_score)``. Rows missing an input a model uses are NaN
+    for that model.
+
+    Parameters:
+    - raw (np.ndarray): (b, k) inputs in ``plan["features"]`` order.
+    - plan (dict): Output of `scoring_plan`.
+    - out (np.ndarray): (b, m * len(years)) array receiving the risks.
+    """
+    features = plan["features"]
+    design, missing = center_design(raw, features)
+    exp_score = np.exp(design @ plan["coef"] + plan["offsets"])
+
+    alpha = plan["alpha"]
+    n_years = alpha.shape[1]
+    for j in range(alpha.shape[0]):
+        invalid = None
+        for name, used in zip(features, plan["requires"][j]):
+            if used and name in missing:
+                invalid = missing[name] if invalid is None else invalid | missing[name]
+        for i in range(n_years):
+            risk = out[:, j * n_years + i]
+            np.power(alpha[j, i], exp_score[:, j], out=risk)
+            np.subtract(1.0, risk, out=risk)
+            if invalid is not None:
+                risk[invalid] = np.nan
+
+
+DEFAULT_REGISTRY = ModelRegistry(
+    KFREModel(n, params["coefficients"], params["alpha"])
+    for n, params in PUBLISHED_PARAMS.items()
+)
@@ -1,6 +1,16 @@
 ################################################################################
 ############################### Library Imports ################################
-from .perform_eval import *
+import numpy as np
+import pandas as pd
+
+from ._conversions import ConversionPlan
+from ._registry import (  # noqa: F401
+    DEFAULT_REGISTRY,
+    MODEL_REQUIREMENTS,
+    KFREModel,  # re-exported by `from .main import *`
+    ModelRegistry,  # re-exported by `from .main import *`
+    scoring_plan,
+)
 
 ################################################################################
 
@@ -33,6 +43,7 @@ class RiskPredictor:
         self,
         df=None,
         columns=None,
+        registry=None,
     ):
         """
         Constructs the necessary attributes for the RiskPredictor object.
@@ -46,9 +57,13 @@ class RiskPredictor:
         'htn': 'Hypertension'}
         apply_conversions (bool, optional): Flag to apply unit conversions.
         Default is False.
+        registry (ModelRegistry, optional): Compiled KFRE models to score with,
+        e.g. one holding locally recalibrated coefficients. Defaults to the
+        published KFRE coefficients.
         """
         self.df = df
         self.columns = columns
+        self.registry = registry
 
     def predict_kfre(
         self,
@@ -57,6 +72,7 @@ class RiskPredictor:
         use_extra_vars=False,
         num_vars=4,
         precision=None,
+        n_jobs=None,
     ):
         """
         Predicts the risk of kidney failure in a patient with chronic kidney
@@ -76,6 +92,9 @@ class RiskPredictor:
           risk calculation. Defaults to False.
         - num_vars (int, optional): Specifies the number of variables to use in
           the prediction model (4, 6, or 8). Defaults to 4.
+        - n_jobs (int, optional): Number of worker processes to split the rows
+          across (-1 for all CPUs). Defaults to None (single process). Results
+          are identical to the single-process path.
 
         Returns:
         - float: A probability value between 0 and 1 representing the patient's
@@ -95,98 +114,28 @@ class RiskPredictor:
           dictionary upon class instantiation for the method to correctly locate
           the necessary data in the DataFrame.
         """
-        # Basic required columns
-        necessary_cols = [
-            self.columns["age"],
-            self.columns["sex"],
-            self.columns["eGFR"],
-            self.columns["uACR"],
-        ]
-
-        # Retrieve data only once
-        df = self.df[necessary_cols].copy()
-
-        # Resolve sex robustly: recognized female/male map to 0/1; unrecognized
-        # values warn and are marked invalid so they yield NaN rather than being
-        # silently coerced. (1 - female) gives the male=1 encoding used below.
-        female_flag, sex_valid = _resolve_sex_series(df[self.columns["sex"]])
-        df[self.columns["sex"]] = (1 - female_flag).astype(int)
-
-        # Extract basic parameters from the DataFrame
-        age = df[self.columns["age"]]
-        sex = df[self.columns["sex"]]
-        eGFR = df[self.columns["eGFR"]]
-        uACR = df[self.columns["uACR"]]
-
         # Validate num_vars up front so unsupported values fail loudly
         # instead of silently returning None.
         if num_vars not in (4, 6, 8):
             raise ValueError(f"num_vars must be 4, 6, or 8; got {num_vars!r}.")
 
-        if use_extra_vars and num_vars == 6:
-            # Extend columns for 6-variable model
-            necessary_cols.extend([self.columns["dm"], self.columns["htn"]])
-            df = self.df[necessary_cols].copy()
-            dm = df[self.columns["dm"]]
-            htn = df[self.columns["htn"]]
-            result = apply_precision(
-                risk_pred(
-                    age,
-                    sex,
-                    eGFR,
-                    uACR,
-                    is_north_american,
-                    dm,
-                    htn,
-                    years=years,
-                ),
-                precision=precision,
-            )
-        elif use_extra_vars and num_vars == 8:
-            # Extend columns for 8-variable model
-            necessary_cols.extend(
-                [
-                    self.columns["albumin"],
-                    self.columns["phosphorous"],
-                    self.columns["bicarbonate"],
-                    self.columns["calcium"],
-                ]
-            )
-            df = self.df[necessary_cols].copy()
-            albumin = df[self.columns["albumin"]]
-            phosphorous = df[self.columns["phosphorous"]]
-            bicarbonate = df[self.columns["bicarbonate"]]
-            calcium = df[self.columns["calcium"]]
-            result = apply_precision(
-                risk_pred(
-                    age,
-                    sex,
-                    eGFR,
-                    uACR,
-                    is_north_american,
-                    None,
-                    None,
-                    albumin,
-                    phosphorous,
-                    bicarbonate,
-                    calcium,
-                    years=years,
-                ),
-                precision=precision,
-            )
-        else:
-            # 4-variable model. Covers use_extra_vars=False, and the explicit
-            # use_extra_vars=True with num_vars=4 case.
-            result = apply_precision(
-                risk_pred(age, sex, eGFR, uACR, is_north_american, years=years),
-                precision=precision,
-            )
+        # The 6- and 8-variable models are only used when extra variables are
+        # requested; otherwise this is the 4-variable model.
+        model = num_vars if use_extra_vars else 4
 
         # Rows with an unrecognized/missing sex value get NaN rather than a
         # prediction based on a silently coerced sex.
-        result = pd.Series(result, index=self.df.index)
-        result[~sex_valid.to_numpy()] = np.nan
-        return result
+        risk = _kfre_scores(
+            self.df,
+            self.columns,
+            num_vars=[model],
+            years=[years],
+            is_north_american=is_north_american,
+            registry=self.registry,
+            n_jobs=n_jobs,
+        )[(model, years)]
+        result = pd.Series(risk, index=self.df.index)
+        return apply_precision(result, precision=precision)
 
     def kfre_person(
         self,
@@ -203,6 +152,7 @@ class RiskPredictor:
         bicarbonate=None,
         calcium=None,
         precision=None,
+        num_vars=None,
     ):
         """
         Predicts kidney failure risk for an individual patient based on provided
@@ -224,44 +174,17 @@ class RiskPredictor:
         - calcium (float, optional): Serum calcium level.
         - precision (int, optional): Number of decimal places to round the
           predicted risk to. If None, no rounding is applied.
+        - num_vars (int, list, or "all", optional): Model(s) to use. When None,
+          the most informative model the inputs support is used (8 > 6 > 4).
 
         Returns:
-        - float: The computed risk of kidney failure.
+        - float: The computed risk of kidney failure. When `years` or
+          `num_vars` is a list (or "all"), a dict of risks keyed by
+          ``kfre_{n}var_{years}year`` covering every model and horizon.
         """
-        errors = []
-
-        if age is None:
-            errors.append("Must supply a value for age.")
-
-        if is_male is None:
-            errors.append("Must specify sex using True or False for is_male.")
-
-        if eGFR is None:
-            errors.append("Must supply a value for eGFR.")
-
-        if uACR is None:
-            errors.append("Must supply a value for uACR.")
-
-        if years not in [2, 5]:
-            errors.append("Value must be 2 or 5 for 2-year risk or 5-year risk.")
-
-        if dm is not None and dm not in [0, 1, True, False]:
-            errors.append("The dm parameter must be either 0, 1, True, or False.")
-
-        if htn is not None and htn not in [0, 1, True, False]:
-            errors.append("The htn parameter must be either 0, 1, True, or False.")
-
-        if is_north_american is None:
-            errors.append("Must specify True or False for is_north_american.")
-
-        if errors:
-            raise ValueError("\n".join(errors))
-
-        # Use is_male directly, since it's already a boolean
-        # Call the risk prediction function with the parameters
-        risk_prediction = risk_pred(
+        return _kfre_person(
             age=age,
-            sex=is_male,
+            is_male=is_male,
             eGFR=eGFR,
             uACR=uACR,
             is_north_american=is_north_american,
@@ -272,8 +195,10 @@ class RiskPredictor:
             phosphorous=phosphorous,
             bicarbonate=bicarbonate,
             calcium=calcium,
+            precision=precision,
+            num_vars=num_vars,
+            registry=self.registry,
         )
-        return apply_precision(risk_prediction, precision=precision)
 
 
 ###############################################################################
@@ -310,15 +235,79 @@ def apply_precision(result, precision=None):
 ################################################################################
 
 
+def _resolve_sex_labels(labels, female_tokens, male_tokens, female_str=None):
+    """
+    Resolve a small array of distinct sex labels.
+
+    Strings are matched case-insensitively after stripping whitespace against
+    ``female_tokens``/``male_tokens``. Without ``female_str``, numbers and
+    booleans follow the KFRE sex encoding used by ``risk_pred`` (0/False =
+    female, 1/True = male). With ``female_str``, a number or boolean is female
+    only if it equals ``female_str`` (numerically or as text, so 1 and "1"
+    agree) and is otherwise unrecognized, as any other label would be.
+
+    Returns
+    -------
+    (female, valid, empty) : tuple of np.ndarray[bool]
+        Per-label female indicator, recognized indicator, and whether the
+        label is blank (missing rather than unrecognized).
+    """
+    import numbers
+
+    n = len(labels)
+    female = np.zeros(n, dtype=bool)
+    valid = np.zeros(n, dtype=bool)
+    empty = np.zeros(n, dtype=bool)
+    for i, label in enumerate(labels):
+        if isinstance(label, (numbers.Number, np.bool_)) and not isinstance(label, str):
+            if female_str is None:
+                if label == 0 or label == 1:
+                    female[i] = label == 0
+                    valid[i] = True
+            elif _same_number(label, female_str) or (
+                str(label).strip().lower() in female_tokens
+            ):
+                female[i] = valid[i] = True
+            continue
+        token = str(label).strip().lower()
+        if token in female_tokens:
+            female[i] = valid[i] = True
+        elif token in male_tokens:
+            valid[i] = True
+        elif not token:
+            empty[i] = True
+    return female, valid, empty
+
+
+def _same_number(label, value):
+    """True if ``value`` parses as a number equal to ``label``."""
+    try:
+        return float(label) == float(value)
+    except (TypeError, ValueError):
+        return False
+
+
 def _resolve_sex_series(sex_series, female_str=None):
     """
     Robustly resolve a sex column into a female indicator and a validity mask.
 
     Recognized values are matched case-insensitively: female {"female", "f"}
     and male {"male", "m"}. If ``female_str`` is provided, that exact label is
-    also accepted as female (case-insensitively). Any non-empty value that is
-    not recognized (e.g. typos, "unknown") triggers a warning and is marked
-    invalid; genuinely missing values (NaN, empty) are marked invalid quietly.
+    also accepted as female (case-insensitively). Without ``female_str``,
+    numeric and boolean columns use the KFRE encoding directly (0/False =
+    female, 1/True = male); with it, their values are matched against
+    ``female_str`` like any other label (so ``female_str=1`` marks 1 as
+    female on a 0/1 column, and 0 is unrecognized). Any
+    non-empty value that is not recognized (e.g. typos, "unknown", a code of 2)
+    triggers a warning and is marked invalid; genuinely missing values (NaN,
+    empty) are marked invalid quietly.
+
+    The column is never normalized row by row. Without ``female_str``,
+    numeric and boolean (including nullable) columns are compared as numbers;
+    categorical columns resolve
+    their categories and reuse the stored codes; everything else (object and
+    Arrow-backed strings) is factorized so only the distinct values are
+    resolved and the result is broadcast back through the codes.
 
     Returns
     -------
@@ -334,28 +323,52 @@ def _resolve_sex_series(sex_series, female_str=None):
     if female_str is not None:
         female_tokens = female_tokens | {str(female_str).strip().lower()}
 
-    normalized = sex_series.astype("string").str.strip().str.lower()
+    dtype = sex_series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        codes = sex_series.cat.codes.to_numpy()
+        labels = sex_series.cat.categories.to_numpy()
+    elif female_str is None and (
+        pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_numeric_dtype(dtype)
+    ):
+        codes = None
+        numeric = sex_series.to_numpy(dtype=float, na_value=np.nan)
+    else:
+        codes, labels = pd.factorize(sex_series)
+        labels = np.asarray(labels, dtype=object)
 
-    female_flag = normalized.isin(female_tokens)
-    male_flag = normalized.isin(male_tokens)
-    valid_mask = female_flag | male_flag
+    if codes is None:
+        female = numeric == 0
+        valid = female | (numeric == 1)
+        unrecognized = ~valid & ~np.isnan(numeric)
+    else:
+        female_u, valid_u, empty_u = _resolve_sex_labels(
+            labels, female_tokens, male_tokens, female_str
+        )
+        # Code -1 (missing) indexes the trailing sentinel: invalid, not flagged.
+        female = np.append(female_u, False)[codes]
+        valid = np.append(valid_u, False)[codes]
+        unrecognized = np.append(~valid_u & ~empty_u, False)[codes]
 
     # Warn about non-empty values that were not recognized (data-quality issue),
     # but stay quiet about genuinely missing entries.
-    non_empty = normalized.notna() & (normalized.str.len() > 0)
-    unrecognized = non_empty & ~valid_mask
     if unrecognized.any():
         bad = sorted(set(sex_series[unrecognized].astype(str)))
+        if female_str is None:
+            also = "or 0/1 for numeric and boolean columns"
+        else:
+            also = f"or values equal to female_str={female_str!r} (female)"
         warnings.warn(
             "Unrecognized sex value(s) "
             f"{bad} were treated as missing (result set to NaN). "
-            "Recognized values are female/f and male/m "
-            "(case-insensitive).",
+            f"Recognized values are female/f and male/m (case-insensitive), {also}.",
             UserWarning,
             stacklevel=2,
         )
 
-    return female_flag.astype(int), valid_mask
+    return (
+        pd.Series(female.astype(int), index=sex_series.index),
+        pd.Series(valid, index=sex_series.index),
+    )
 
 
 ################################################################################
@@ -475,6 +488,8 @@ def predict_kfre(
     use_extra_vars=False,
     num_vars=4,
     precision=None,
+    registry=None,
+    n_jobs=None,
 ):
     """
     A convenience function to predict kidney failure risk using the Tangri risk
@@ -488,18 +503,22 @@ def predict_kfre(
     - use_extra_vars (bool): If True, use additional clinical variables for the
       prediction.
     - num_vars (int): Number of variables used in the model (4, 6, or 8).
+    - registry (ModelRegistry, optional): Compiled KFRE models to score with.
+      Defaults to the published KFRE coefficients.
+    - n_jobs (int, optional): Number of worker processes (-1 for all CPUs).
 
     Returns:
     - Series: CKD risk probabilities for each patient.
     """
 
-    predictor = RiskPredictor(df=df, columns=columns)
+    predictor = RiskPredictor(df=df, columns=columns, registry=registry)
     return predictor.predict_kfre(
         years=years,
         is_north_american=is_north_american,
         use_extra_vars=use_extra_vars,
         num_vars=num_vars,
         precision=precision,
+        n_jobs=n_jobs,
     )
 
 
@@ -520,6 +539,8 @@ def add_kfre_risk_col(
     is_north_american=False,
     copy=True,
     precision=None,
+    registry=None,
+    n_jobs=None,
 ):
     """
     Calculate CKD risks for specified variable num_vars and time frames or for
@@ -537,6 +558,13 @@ def add_kfre_risk_col(
       American region.
     - copy (bool): If True, operates on a copy of the DataFrame. If False,
       modifies the DataFrame in place.
+    - registry (ModelRegistry, optional): Compiled KFRE models to score with,
+      e.g. one where `DEFAULT_REGISTRY.replace(...)` swapped in a locally
+      recalibrated model. Defaults to the published KFRE coefficients.
+    - n_jobs (int, optional): Number of worker processes to split the rows
+      across (-1 for all CPUs). Inputs and outputs are shared through shared
+      memory rather than pickled, and results are bit-identical to the
+      default single-process path.
 
     Returns:
     - DataFrame: The modified or new DataFrame with added risk prediction columns.
@@ -557,63 +585,56 @@ def add_kfre_risk_col(
         "calcium": calcium_col,
     }
 
-    model_requirements = {
-        4: ["age", "sex", "eGFR", "uACR"],
-        6: ["age", "sex", "eGFR", "uACR", "dm", "htn"],
-        8: [
-            "age",
-            "sex",
-            "eGFR",
-            "uACR",
-            "albumin",
-            "phosphorous",
-            "bicarbonate",
-            "calcium",
-        ],
-    }
+    num_vars, years = _resolve_models_and_years(num_vars, years)
+    _check_model_columns(num_vars, column_map)
 
-    # Adjust 'num_vars' and 'years' handling to accept 'all', integer, or iterable
+    # Score every model and time frame in one fused pass, grouping the output
+    # columns by model first and then by time frame.
+    risks = _kfre_scores(
+        df_used,
+        {k: v for k, v in column_map.items() if v is not None},
+        num_vars=num_vars,
+        years=years,
+        is_north_american=is_north_american,
+        registry=registry,
+        n_jobs=n_jobs,
+    )
+    for (model_vars, time_frame), risk in risks.items():
+        risk_column = f"kfre_{model_vars}var_{time_frame}year"
+        df_used[risk_column] = apply_precision(
+            pd.Series(risk, index=df_used.index), precision=precision
+        )
+
+    return df_used
+
+
+def _resolve_models_and_years(num_vars, years):
+    """Accept 'all', an integer, or an iterable for `num_vars` and `years`."""
     num_vars = (
         [4, 6, 8]
         if num_vars == "all"
-        else ([num_vars] if isinstance(num_vars, int) else num_vars)
+        else ([num_vars] if isinstance(num_vars, int) else list(num_vars))
     )
     years = (
         [2, 5]
         if years == "all"
         else ([years] if isinstance(years, int) else list(years))
     )
+    return num_vars, years
 
+
+def _check_model_columns(num_vars, column_map):
+    """Raise if a requested model is missing any of its input columns."""
     for model in num_vars:
-        missing = [req for req in model_requirements[model] if column_map[req] is None]
+        missing = [
+            req for req in MODEL_REQUIREMENTS[model] if column_map.get(req) is None
+        ]
         if missing:
             required_cols = ", ".join(missing)
             raise ValueError(
                 f"{required_cols} needed to complete calculation for {model}var model"
             )
 
-    # Initialize the predictor with the data and columns
-    predictor = RiskPredictor(
-        df_used, {k: v for k, v in column_map.items() if v is not None}
-    )
-
-    # Calculate risks for each model and time frame
-    for model_vars in num_vars:
-        if all(column_map[req] is not None for req in model_requirements[model_vars]):
-            for time_frame in years:
-                risk_column = f"kfre_{model_vars}var_{time_frame}year"
-                df_used[risk_column] = apply_precision(
-                    predictor.predict_kfre(
-                        years=time_frame,
-                        is_north_american=is_north_american,
-                        use_extra_vars=(model_vars > 4),
-                        num_vars=model_vars,
-                    ),
-                    precision=precision,
-                )
-
-    return df_used
-
 
 ################################################################################
 
@@ -626,6 +647,7 @@ def perform_conversions(
     calcium_col=None,
     phosphate_col=None,
     albumin_col=None,
+    dtype=None,
 ):
     """
     Convert specified laboratory columns between SI and conventional units,
@@ -650,77 +672,141 @@ def perform_conversions(
     - calcium_col (str, optional): Column name for calcium.
     - phosphate_col (str, optional): Column name for phosphate.
     - albumin_col (str, optional): Column name for albumin.
+    - dtype (str or np.dtype, optional): dtype of the new columns, e.g.
+      "float32". Default None keeps float64.
+
+    Returns:
+    - DataFrame: A copy of `df` with the converted columns added.
+
+    Notes:
+    - Each call compiles a `ConversionPlan` from ``df.columns`` and prints one
+      line per conversion. To convert many frames or chunks with the same
+      columns, compile the plan once and call its `apply` (optionally
+      ``inplace=True``, without copying `df`) or `transform` instead; the plan
+      reports through the ``kfre`` logger, once.
+    - convert_all is intended for a single pass over a frame of raw input
+      values. To reverse a conversion, pass the specific converted column
+      names explicitly (e.g. calcium_col="Calcium_mg_dl") rather than relying
+      on convert_all, which cannot disambiguate an original column from its
+      own converted output when both are present.
     """
-    # Conversion factors verified against standard reference values
-    # (molar masses / standard SI<->conventional factors):
-    #   Calcium:   1 mmol/L = 4.0 mg/dL    (MW 40.08; x4)
-    #   Phosphate: 1 mmol/L = 3.1 mg/dL    (MW ~31; x3.1)
-    #   Albumin:   1 g/L    = 0.1 g/dL     (x0.1)
-    #   uPCR:      mg/mmol  -> mg/g  via 1 mmol creatinine = 0.11312 g
-    #              (creatinine MW 113.12; x 1/0.11312 ~= 8.8401)
-
-    conversion_factors = {
-        "uPCR": 1 / 0.11312,
-        "Calcium": 4,
-        "Phosphate": 3.1,
-        "Albumin": 1 / 10,
-    }
+    plan = ConversionPlan(
+        df.columns,
+        reverse=reverse,
+        convert_all=convert_all,
+        upcr_col=upcr_col,
+        calcium_col=calcium_col,
+        phosphate_col=phosphate_col,
+        albumin_col=albumin_col,
+        dtype=dtype,
+        verbose=True,
+    )
+    return plan.apply(df.copy(), inplace=True)
 
-    # Define the suffixes for new column names based on conversion direction
-    conversion_suffix = {
-        "uPCR": "mg_g" if not reverse else "mmol_L",
-        "Calcium": "mg_dl" if not reverse else "mmol_L",
-        "Phosphate": "mg_dl" if not reverse else "mmol_L",
-        "Albumin": "g_dl" if not reverse else "g_L",
-    }
 
-    # Initialize columns_to_convert with provided column names or defaults
-    columns_to_convert = {
-        "uPCR": upcr_col,
-        "Calcium": calcium_col,
-        "Phosphate": phosphate_col,
-        "Albumin": albumin_col,
-    }
+################################################################################
+############################ Streaming File Scoring ############################
+################################################################################
 
-    # If convert_all is True, automatically identify columns for conversion by
-    # name. NOTE: convert_all is intended for a single pass over a frame of raw
-    # input values. To reverse a conversion, pass the specific converted column
-    # names explicitly (e.g. calcium_col="Calcium_mg_dl") rather than relying on
-    # convert_all, which cannot disambiguate an original column from its own
-    # converted output when both are present.
-    if convert_all:
-        columns_to_convert = {
-            key: next((col for col in df.columns if key.lower() in col.lower()), None)
-            for key in conversion_factors
-        }
-
-    # Create a deep copy of the DataFrame
-    df = df.copy()
-
-    # Perform conversions
-    for key, orig_col in columns_to_convert.items():
-        if orig_col and orig_col in df.columns:
-            factor = conversion_factors[key]
-            suffix = conversion_suffix[key]
-            # Calculate the converted values
-            converted_values = (
-                df[orig_col] / factor if reverse else df[orig_col] * factor
-            )
-            # Create the new column name
-            new_col = f"{key}_{suffix}"
-            # Add the converted values as a new column to the dataframe using
-            # .loc to avoid SettingWithCopyWarning
-            df.loc[:, new_col] = converted_values
-            print(
-                f"Converted '{orig_col}' to new column '{new_col}' with factor {factor}"
-            )
-        else:
-            print(
-                f"Warning: Column '{orig_col}' not found in DataFrame. "
-                f"No conversion performed for this column."
+
+def score_file(
+    src,
+    dst,
+    column_map,
+    num_vars=8,
+    years=(2, 5),
+    is_north_american=False,
+    chunksize=100_000,
+    keep_cols=None,
+    conversions=None,
+    upcr=None,
+    precision=None,
+    registry=None,
+    n_jobs=None,
+):
+    """
+    Score a CSV or Parquet file chunk by chunk and write the KFRE risk columns
+    incrementally to a CSV or Parquet file.
+
+    Only the columns named in `column_map`, `keep_cols`, `conversions` and
+    `upcr` are read, `chunksize` rows at a time, so peak memory is set by the
+    chunk size rather than the cohort size. Each chunk optionally goes through
+    `perform_conversions` and `upcr_uacr` before all requested models and
+    horizons are scored in one fused pass.
+
+    Parameters:
+    - src (str or path): Input file. Files ending in .parquet or .pq are read
+      as Parquet (requires pyarrow); anything else as CSV.
+    - dst (str or path): Output file, format chosen by extension as for `src`.
+    - column_map (dict): Maps clinical parameter names to column names, as the
+      `columns` argument of `predict_kfre`. Names may refer to columns created
+      by `conversions` or `upcr` (e.g. {"calcium": "Calcium_mg_dl"}).
+    - num_vars (int, list, or "all"): Models to score (4, 6, 8). Default 8.
+    - years (int, tuple, list, or "all"): Horizons to score. Default (2, 5).
+    - is_north_american (bool): True if the data is from North America.
+    - chunksize (int): Rows per chunk. Default 100,000.
+    - keep_cols (list of str, optional): Columns copied to the output ahead of
+      the risk columns, e.g. a patient identifier.
+    - conversions (dict or ConversionPlan, optional): Keyword arguments for
+      `perform_conversions` (or a compiled `ConversionPlan`). A dict is
+      compiled into a plan once from the file header and applied to each
+      chunk in place.
+    - upcr (dict, optional): Keyword arguments for `upcr_uacr` (sex_col,
+      diabetes_col, hypertension_col, upcr_col, female_str). The estimated
+      uACR is stored in the column named by ``column_map["uACR"]``.
+    - precision (int, optional): Decimal places to round the risks to.
+    - registry (ModelRegistry, optional): Compiled KFRE models to score with.
+    - n_jobs (int, optional): Worker processes used to score each chunk.
+
+    Returns:
+    - int: The number of rows written to `dst`.
+    """
+    from ._io import ChunkWriter, iter_chunks, read_header
+
+    column_map = {k: v for k, v in column_map.items() if v is not None}
+    num_vars, years = _resolve_models_and_years(num_vars, years)
+    _check_model_columns(num_vars, column_map)
+    keep_cols = list(keep_cols or [])
+
+    header = read_header(src)
+    wanted = set(column_map.values()) | set(keep_cols)
+    if conversions and not isinstance(conversions, ConversionPlan):
+        conversions = ConversionPlan(header, **conversions)
+    if conversions:
+        wanted |= set(conversions.source_columns)
+    if upcr:
+        wanted |= {v for k, v in upcr.items() if k.endswith("_col")}
+    usecols = [c for c in header if c in wanted]
+
+    risk_cols = [f"kfre_{n}var_{y}year" for n in num_vars for y in years]
+    n_rows = 0
+    with ChunkWriter(dst) as writer:
+        for chunk in iter_chunks(src, usecols, chunksize):
+            if conversions:
+                conversions.apply(chunk, inplace=True)
+            if upcr:
+                chunk[column_map["uACR"]] = upcr_uacr(chunk, **upcr)
+
+            risks = _kfre_scores(
+                chunk,
+                column_map,
+                num_vars=num_vars,
+                years=years,
+                is_north_american=is_north_american,
+                registry=registry,
+                n_jobs=n_jobs,
             )
+            out = chunk[keep_cols].copy()
+            for (n, y), risk in risks.items():
+                out[f"kfre_{n}var_{y}year"] = apply_precision(risk, precision)
+            writer.write(out)
+            n_rows += len(out)
 
-    return df
+        if n_rows == 0:
+            # Empty input: still produce a file with the expected header.
+            writer.write(pd.DataFrame(columns=keep_cols + risk_cols, dtype=float))
+
+    return n_rows
 
 
 ################################################################################
@@ -728,6 +814,35 @@ def perform_conversions(
 ################################################################################
 
 
+# (name, low, high) using inclusive bounds. Ranges are intentionally broad so
+# the check flags clear out-of-scope values, not borderline ones.
+_KFRE_BOUNDS = (
+    ("age", 18, 100),  # adult population
+    ("eGFR", 0, 60),  # KFRE scope: CKD G3-G5 (eGFR < 60)
+    ("uACR", 0, 25000),  # mg/g; upper guard against implausible entries
+)
+_KFRE_BOUNDS_8VAR = (
+    ("albumin", 1.0, 6.0),  # g/dL
+    ("phosphorous", 1.0, 10.0),  # mg/dL
+    ("bicarbonate", 5.0, 45.0),  # mEq/L
+    ("calcium", 5.0, 15.0),  # mg/dL
+)
+
+
+def _emit_out_of_bounds(offenders, stacklevel):
+    import warnings
+
+    warnings.warn(
+        "One or more covariates fall outside the KFRE's intended range: "
+        + "; ".join(offenders)
+        + ". Predictions are still returned but may be unreliable for "
+        "values outside the model's development population "
+        "(adults, CKD stages G3-G5).",
+        UserWarning,
+        stacklevel=stacklevel + 1,
+    )
+
+
 def _warn_out_of_bounds(
     age=None,
     eGFR=None,
@@ -745,25 +860,20 @@ def _warn_out_of_bounds(
     returned; the warning flags possible extrapolation. Works for scalar or
     array-like inputs.
     """
-    import warnings
-
-    # (name, value, low, high) using inclusive bounds. Ranges are intentionally
-    # broad so the check flags clear out-of-scope values, not borderline ones.
-    checks = [
-        ("age", age, 18, 100),  # adult population
-        ("eGFR", eGFR, 0, 60),  # KFRE scope: CKD G3-G5 (eGFR < 60)
-        ("uACR", uACR, 0, 25000),  # mg/g; upper guard against implausible entries
-    ]
-    if model == 8:
-        checks += [
-            ("albumin", albumin, 1.0, 6.0),  # g/dL
-            ("phosphorous", phosphorous, 1.0, 10.0),  # mg/dL
-            ("bicarbonate", bicarbonate, 5.0, 45.0),  # mEq/L
-            ("calcium", calcium, 5.0, 15.0),  # mg/dL
-        ]
+    values = {
+        "age": age,
+        "eGFR": eGFR,
+        "uACR": uACR,
+        "albumin": albumin,
+        "phosphorous": phosphorous,
+        "bicarbonate": bicarbonate,
+        "calcium": calcium,
+    }
+    checks = _KFRE_BOUNDS + (_KFRE_BOUNDS_8VAR if model == 8 else ())
 
     offenders = []
-    for name, val, low, high in checks:
+    for name, low, high in checks:
+        val = values[name]
         if val is None:
             continue
         arr = np.asarray(val, dtype=float)
@@ -775,15 +885,65 @@ def _warn_out_of_bounds(
             offenders.append(f"{name} (expected {low}-{high})")
 
     if offenders:
+        _emit_out_of_bounds(offenders, stacklevel=2)
+
+
+def _warn_non_positive_uacr(uACR, stacklevel=2):
+    """Warn about non-positive uACR entries in an array; return their mask."""
+    invalid = uACR <= 0
+    if invalid.any():
+        import warnings
+
+        n_bad = int(invalid.sum())
         warnings.warn(
-            "One or more covariates fall outside the KFRE's intended range: "
-            + "; ".join(offenders)
-            + ". Predictions are still returned but may be unreliable for "
-            "values outside the model's development population "
-            "(adults, CKD stages G3-G5).",
+            f"{n_bad} uACR value(s) were non-positive and set to NaN "
+            "(uACR must be > 0).",
             UserWarning,
-            stacklevel=2,
+            stacklevel=stacklevel + 1,
         )
+    return invalid
+
+
+def _log_uacr(uACR):
+    """
+    Natural log of uACR with the package's handling of non-positive values.
+
+    uACR is a strictly positive ratio; non-positive values (<= 0) are invalid
+    and must not be silently rescued into a valid-looking result. Scalar input:
+    raise. Array/Series input: warn and set the offending entries to NaN so a
+    single bad row does not abort a whole cohort.
+    """
+    uACR = np.asarray(uACR, dtype=float)
+    if np.ndim(uACR) == 0:
+        if uACR <= 0:
+            raise ValueError(f"uACR must be positive; got {float(uACR)}.")
+        return np.log(uACR)
+
+    invalid = _warn_non_positive_uacr(uACR, stacklevel=3)
+    return np.log(np.where(invalid, np.nan, uACR))
+
+
+def _select_num_vars(num_vars, has_6var, has_8var):
+    """
+    Resolve the KFRE variant: an explicit `num_vars` (validated against the
+    available inputs), else 8 > 6 > 4 precedence.
+    """
+    if num_vars is None:
+        if has_8var:
+            return 8
+        if has_6var:
+            return 6
+        return 4
+    if num_vars not in (4, 6, 8):
+        raise ValueError(f"num_vars must be 4, 6, or 8; got {num_vars!r}.")
+    if num_vars == 8 and not has_8var:
+        raise ValueError(
+            "The 8-variable model requires albumin, phosphorous, "
+            "bicarbonate, and calcium."
+        )
+    if num_vars == 6 and not has_6var:
+        raise ValueError("The 6-variable model requires dm and htn.")
+    return num_vars
 
 
 def risk_pred(
@@ -800,6 +960,7 @@ def risk_pred(
     calcium=None,
     years=2,
     num_vars=None,
+    registry=None,
 ):
     """
     Calculates the risk of kidney failure in a patient with chronic kidney
@@ -840,6 +1001,9 @@ def risk_pred(
       predicted (2 or 5 years).
     - num_vars (int, optional): Force a specific KFRE variant (4, 6, or 8).
       When None (default), the variant is inferred using 8 > 6 > 4 precedence.
+    - registry (ModelRegistry, optional): Compiled model registry to take the
+      coefficients from, e.g. one holding locally recalibrated models. Defaults
+      to the published KFRE coefficients.
 
     Returns:
     - risk_prediction (float): A probability value between 0 and 1 representing
@@ -860,24 +1024,7 @@ def risk_pred(
     )
 
     # Resolve which model to use: explicit override, else 8 > 6 > 4 precedence.
-    if num_vars is None:
-        if has_8var:
-            model = 8
-        elif has_6var:
-            model = 6
-        else:
-            model = 4
-    else:
-        if num_vars not in (4, 6, 8):
-            raise ValueError(f"num_vars must be 4, 6, or 8; got {num_vars!r}.")
-        if num_vars == 8 and not has_8var:
-            raise ValueError(
-                "The 8-variable model requires albumin, phosphorous, "
-                "bicarbonate, and calcium."
-            )
-        if num_vars == 6 and not has_6var:
-            raise ValueError("The 6-variable model requires dm and htn.")
-        model = num_vars
+    model = _select_num_vars(num_vars, has_6var, has_8var)
 
     # Warn if covariates fall outside broad, physiologically plausible ranges
     # for which the KFRE (developed on CKD stages G3-G5 in adults) is intended.
@@ -895,111 +1042,401 @@ def risk_pred(
         model=model,
     )
 
-    # Define the alpha values and risk factor coefficients for the chosen model.
-    if model == 6:
-        # 6-variable model
-        alpha_values = {
-            (True, 2): 0.9750,
-            (True, 5): 0.9240,
-            (False, 2): 0.9830,
-            (False, 5): 0.9370,
-        }
-        risk_factors = {
-            "age": -0.2218,  # Adjusted for 6-var model
-            "sex": 0.2553,  # Adjusted for 6-var model
-            "eGFR": -0.5541,  # Adjusted for 6-var model
-            "uACR": 0.4562,  # Adjusted for 6-var model
-        }
-        dm_factor = -0.1475  # DM risk factor coefficient
-        htn_factor = 0.1426  # HTN risk factor coefficient
-    elif model == 8:
-        # 8-variable model
-        alpha_values = {
-            (True, 2): 0.9780,
-            (True, 5): 0.9301,
-            (False, 2): 0.9827,
-            (False, 5): 0.9245,
-        }
-        risk_factors = {
-            "age": -0.1992,  # Adjusted for 8-var model
-            "sex": 0.1602,  # Adjusted for 8-var model
-            "eGFR": -0.4919,  # Adjusted for 8-var model
-            "uACR": 0.3364,  # Adjusted for 8-var model
-        }
-        # Extra risk factors for the 8-variable model
-        albumin_factor = -0.3441
-        phosph_factor = +0.2604
-        bicarb_factor = -0.07354
-        calcium_factor = -0.2228
-    else:
-        # 4-variable model
-        alpha_values = {
-            (True, 2): 0.9750,
-            (True, 5): 0.9240,
-            (False, 2): 0.9832,
-            (False, 5): 0.9365,
-        }
-        risk_factors = {
-            "age": -0.2201,
-            "sex": 0.2467,
-            "eGFR": -0.5567,
-            "uACR": 0.4510,
-        }
-
-    # Ensure uACR is positive to avoid log(0)
-    # uACR is a strictly positive ratio; non-positive values (<= 0) are
-    # invalid and must not be silently rescued into a valid-looking result.
-    # Scalar input: raise. Array/Series input: warn and set the offending
-    # entries to NaN so a single bad row does not abort a whole cohort.
-    uACR = np.asarray(uACR, dtype=float)
-    invalid = uACR <= 0
-    if np.ndim(uACR) == 0:
-        if bool(invalid):
-            raise ValueError(f"uACR must be positive; got {float(uACR)}.")
-        log_uACR = np.log(uACR)
-    else:
-        if invalid.any():
-            import warnings
-
-            n_bad = int(invalid.sum())
-            warnings.warn(
-                f"{n_bad} uACR value(s) were non-positive and set to NaN "
-                "(uACR must be > 0).",
-                UserWarning,
-                stacklevel=2,
-            )
-        safe = np.where(invalid, np.nan, uACR)
-        log_uACR = np.log(safe)
-
-    # Compute the base risk score using the coefficients
-    risk_score = (
-        risk_factors["age"] * (age / 10 - 7.036)
-        + risk_factors["sex"] * (sex - 0.5642)
-        + risk_factors["eGFR"] * (eGFR / 5 - 7.222)
-        + risk_factors["uACR"] * (log_uACR - 5.137)
+    # Compiled coefficients and baseline survival for the chosen model.
+    kfre_model = (registry or DEFAULT_REGISTRY)[model]
+    risk_score = kfre_model.linear_predictor(
+        age=age,
+        sex=sex,
+        eGFR=eGFR,
+        uACR=_log_uacr(uACR),
+        dm=dm,
+        htn=htn,
+        albumin=albumin,
+        phosphorous=phosphorous,
+        bicarbonate=bicarbonate,
+        calcium=calcium,
     )
 
-    # Adjust risk score for the 6-variable model
-    if model == 6:
-        risk_score += dm_factor * (dm - 0.5106) + htn_factor * (htn - 0.8501)
-
-    # Adjust risk score for the 8-variable model
-    if model == 8:
-        risk_score += (
-            albumin_factor * (albumin - 3.997)
-            + phosph_factor * (phosphorous - 3.916)
-            + bicarb_factor * (bicarbonate - 25.57)
-            + calcium_factor * (calcium - 9.355)
-        )
-
     # Select alpha based on region and years
-    alpha = alpha_values[(is_north_american, years)]
+    alpha = kfre_model.baseline_survival(is_north_american, years)
 
     # Compute the risk prediction
     risk_prediction = 1 - alpha ** np.exp(risk_score)
     return risk_prediction
 
 
+################################################################################
+############################# Fused KFRE Scoring ###############################
+################################################################################
+
+
+def _column_values(df, col):
+    """Return a DataFrame column as a float64 NumPy array."""
+    return df[col].to_numpy(dtype=float)
+
+
+def _kfre_scores(
+    df, columns, num_vars, years, is_north_american, registry=None, n_jobs=None
+):
+    """
+    Score every requested KFRE model and horizon in a single pass.
+
+    Input extraction, sex resolution and uACR validation are done once for the
+    whole frame into a single input matrix. Rows are then scored in fixed-size
+    blocks: each block is centered once, the linear predictors of all requested
+    models come from one matrix product against the registry's stacked
+    coefficients, and both horizons are derived from the shared
+    ``exp(risk_score)``.
+
+    Parameters:
+    - df (DataFrame): The patient data.
+    - columns (dict): Maps clinical parameter names to DataFrame column names.
+    - num_vars (iterable of int): KFRE variants to score (4, 6, and/or 8).
+    - years (iterable of int): Horizons to score (2 and/or 5).
+    - is_north_american (bool): True if the data is from North America.
+    - registry (ModelRegistry, optional): Compiled models to score with.
+      Defaults to the published KFRE coefficients.
+    - n_jobs (int, optional): Worker processes to split the rows across. None
+      or 1 scores in this process; -1 uses all CPUs. Inputs and outputs are
+      exchanged through shared memory and results are bit-identical to the
+      serial path.
+
+    Returns:
+    - dict: ``{(n_vars, year): np.ndarray}`` of risk probabilities. Rows with
+      an unrecognized or missing sex value, or a missing input used by the
+      model, are NaN.
+    """
+    from . import _parallel
+
+    registry = registry or DEFAULT_REGISTRY
+    num_vars = list(dict.fromkeys(num_vars))
+    years = list(dict.fromkeys(years))
+    plan = scoring_plan(registry, num_vars, years, is_north_american)
+    features = plan["features"]
+
+    n_rows = len(df)
+    n_workers = _parallel.resolve_n_jobs(n_jobs)
+    if n_rows <= _parallel.BLOCK_ROWS:
+        n_workers = 1
+    raw_shape = (n_rows, len(features))
+    out_shape = (n_rows, len(num_vars) * len(years))
+    if n_workers > 1:
+        raw, raw_shm = _parallel.shared_array(raw_shape)
+        out, out_shm = _parallel.shared_array(out_shape)
+    else:
+        raw, out = np.empty(raw_shape, order="F"), np.empty(out_shape)
+
+    try:
+        for j, name in enumerate(features):
+            if name != "sex":
+                raw[:, j] = _column_values(df, columns[name])
+
+        # Resolve sex once: (1 - female) gives the male=1 encoding of the KFRE.
+        # Unrecognized/missing sex is stored as NaN so it masks every model.
+        female_flag, sex_valid = _resolve_sex_series(df[columns["sex"]])
+        raw[:, features.index("sex")] = np.where(
+            sex_valid.to_numpy(), 1 - female_flag.to_numpy(), np.nan
+        )
+
+        values = {name: raw[:, j] for j, name in enumerate(features)}
+        _warn_out_of_bounds(
+            age=values["age"],
+            eGFR=values["eGFR"],
+            uACR=values["uACR"],
+            albumin=values.get("albumin"),
+            phosphorous=values.get("phosphorous"),
+            bicarbonate=values.get("bicarbonate"),
+            calcium=values.get("calcium"),
+            model=8 if 8 in num_vars else 4,
+        )
+        _warn_non_positive_uacr(values["uACR"], stacklevel=3)
+        del values
+
+        if n_workers > 1:
+            _parallel.score_parallel(raw, raw_shm, out, out_shm, plan, n_workers)
+        else:
+            _parallel.score_blocks(raw, plan, out)
+
+        results = {}
+        for j, n_vars in enumerate(num_vars):
+            for i, year in enumerate(years):
+                results[(n_vars, year)] = np.array(out[:, j * len(years) + i])
+    finally:
+        if n_workers > 1:
+            del raw, out
+            for shm in (raw_shm, out_shm):
+                shm.close()
+                shm.unlink()
+
+    return results
+
+
+################################################################################
+########################### Single-Patient Scoring #############################
+################################################################################
+
+_PERSON_INPUTS = (
+    "age",
+    "is_male",
+    "eGFR",
+    "uACR",
+    "dm",
+    "htn",
+    "albumin",
+    "phosphorous",
+    "bicarbonate",
+    "calcium",
+)
+
+
+def _person_models(num_vars, has_6var, has_8var):
+    """Models requested from `kfre_person`: one model, a list, or "all"."""
+    if num_vars == "all":
+        num_vars = [4, 6, 8]
+    if isinstance(num_vars, (list, tuple)):
+        return [_select_num_vars(n, has_6var, has_8var) for n in num_vars]
+    return [_select_num_vars(num_vars, has_6var, has_8var)]
+
+
+def _kfre_person(
+    age,
+    is_male,
+    eGFR,
+    uACR,
+    is_north_american,
+    years=2,
+    dm=None,
+    htn=None,
+    albumin=None,
+    phosphorous=None,
+    bicarbonate=None,
+    calcium=None,
+    precision=None,
+    num_vars=None,
+    registry=None,
+):
+    """
+    Scalar fast path behind `kfre_person`.
+
+    Works on plain Python floats with the registry's precompiled terms and
+    baseline survivals: no arrays, Series or per-call coefficient tables. The
+    validation, model selection, uACR and out-of-range rules match
+    `risk_pred`. Returns a float when `years` and `num_vars` are single values,
+    otherwise a dict keyed by the `add_kfre_risk_col` column names
+    (``kfre_{n}var_{years}year``).
+    """
+    import math
+
+    multi = isinstance(years, (list, tuple)) or isinstance(num_vars, (list, tuple, str))
+    horizons = list(years) if isinstance(years, (list, tuple)) else [years]
+
+    errors = []
+
+    if age is None:
+        errors.append("Must supply a value for age.")
+
+    if is_male is None:
+        errors.append("Must specify sex using True or False for is_male.")
+
+    if eGFR is None:
+        errors.append("Must supply a value for eGFR.")
+
+    if uACR is None:
+        errors.append("Must supply a value for uACR.")
+
+    if any(year not in [2, 5] for year in horizons):
+        errors.append("Value must be 2 or 5 for 2-year risk or 5-year risk.")
+
+    if dm is not None and dm not in [0, 1, True, False]:
+        errors.append("The dm parameter must be either 0, 1, True, or False.")
+
+    if htn is not None and htn not in [0, 1, True, False]:
+        errors.append("The htn parameter must be either 0, 1, True, or False.")
+
+    if is_north_american is None:
+        errors.append("Must specify True or False for is_north_american.")
+
+    if errors:
+        raise ValueError("\n".join(errors))
+
+    has_6var = dm is not None and htn is not None
+    has_8var = (
+        albumin is not None
+        and phosphorous is not None
+        and bicarbonate is not None
+        and calcium is not None
+    )
+    models = _person_models(num_vars, has_6var, has_8var)
+
+    uACR = float(uACR)
+    if uACR <= 0:
+        raise ValueError(f"uACR must be positive; got {uACR}.")
+
+    inputs = {
+        "age": float(age),
+        "sex": float(is_male),
+        "eGFR": float(eGFR),
+        "uACR": uACR,
+        "dm": dm,
+        "htn": htn,
+        "albumin": albumin,
+        "phosphorous": phosphorous,
+        "bicarbonate": bicarbonate,
+        "calcium": calcium,
+    }
+
+    # Same scope checks as _warn_out_of_bounds, on plain floats.
+    checks = _KFRE_BOUNDS + (_KFRE_BOUNDS_8VAR if 8 in models else ())
+    offenders = [
+        f"{name} (expected {low}-{high})"
+        for name, low, high in checks
+        if inputs[name] is not None
+        and (float(inputs[name]) < low or float(inputs[name]) > high)
+    ]
+    if offenders:
+        _emit_out_of_bounds(offenders, stacklevel=3)
+
+    inputs["uACR"] = math.log(uACR)
+    registry = registry or DEFAULT_REGISTRY
+    results = {}
+    for n_vars in models:
+        model = registry[n_vars]
+        risk_score = 0.0
+        for name, coef, scale, center in model.terms:
+            x = float(inputs[name])
+            if scale is not None:
+                x = x / scale
+            risk_score += coef * (x - center)
+        exp_score = math.exp(risk_score)
+        for year in horizons:
+            risk = 1.0 - model.baseline_survival(is_north_american, year) ** exp_score
+            if precision is not None:
+                risk = round(risk, precision)
+            results[f"kfre_{n_vars}var_{year}year"] = risk
+
+    if multi:
+        return results
+    return risk
+
+
+def _batch_field(records, name):
+    """One input field of a batch as a float array (NaN where missing)."""
+    if isinstance(records, np.ndarray):
+        if name not in (records.dtype.names or ()):
+            return None
+        return records[name].astype(float)
+    if not any(name in record for record in records):
+        return None
+    return np.array([record.get(name) for record in records], dtype=float)
+
+
+def kfre_person_batch(
+    records,
+    is_north_american=None,
+    years=2,
+    num_vars=None,
+    precision=None,
+    registry=None,
+):
+    """
+    Predict kidney failure risk for many individual patients in a single
+    vectorized evaluation.
+
+    Parameters:
+    - records (list of dict or np.ndarray): Patients described with the
+      keyword names of `kfre_person` (age, is_male, eGFR, uACR, and optionally
+      dm, htn, albumin, phosphorous, bicarbonate, calcium, is_north_american),
+      either as a list of dicts or as a NumPy structured array with those
+      field names. Missing or None values yield NaN for the affected models.
+    - is_north_american (bool, optional): Region for every patient. If None,
+      each record must carry its own `is_north_american` field.
+    - years (int, list, or tuple): Horizon(s) to predict (2 and/or 5).
+    - num_vars (int, list, "all", or None): Model(s) to use. When None, the
+      most informative model whose inputs are present in the records is used
+      (8 > 6 > 4), as in `kfre_person`.
+    - precision (int, optional): Decimal places to round the risks to.
+    - registry (ModelRegistry, optional): Compiled KFRE models to score with.
+
+    Returns:
+    - DataFrame: One row per record and one ``kfre_{n}var_{years}year``
+      column per requested model and horizon.
+    """
+    from ._parallel import score_blocks
+
+    fields = {name: _batch_field(records, name) for name in _PERSON_INPUTS}
+    if fields["age"] is None:
+        n_rows = len(records)
+    else:
+        n_rows = len(fields["age"])
+    for name in ("age", "is_male", "eGFR", "uACR"):
+        if fields[name] is None:
+            raise ValueError(f"Every record needs a value for {name}.")
+
+    has_6var = all(fields[f] is not None for f in ("dm", "htn"))
+    has_8var = all(
+        fields[f] is not None
+        for f in ("albumin", "phosphorous", "bicarbonate", "calcium")
+    )
+    models = _person_models(num_vars, has_6var, has_8var)
+    years = list(years) if isinstance(years, (list, tuple)) else [years]
+    if any(year not in [2, 5] for year in years):
+        raise ValueError("Value must be 2 or 5 for 2-year risk or 5-year risk.")
+
+    if is_north_american is None:
+        region = _batch_field(records, "is_north_american")
+        if region is None:
+            raise ValueError(
+                "Pass is_north_american or give every record an "
+                "is_north_american field."
+            )
+        if np.isnan(region).any():
+            raise ValueError("Every record needs a value for is_north_american.")
+        region = region.astype(bool)
+    else:
+        region = np.full(n_rows, bool(is_north_american))
+
+    values = dict(fields, sex=fields["is_male"])
+    _warn_out_of_bounds(
+        age=values["age"],
+        eGFR=values["eGFR"],
+        uACR=values["uACR"],
+        albumin=values["albumin"],
+        phosphorous=values["phosphorous"],
+        bicarbonate=values["bicarbonate"],
+        calcium=values["calcium"],
+        model=8 if 8 in models else 4,
+    )
+    _warn_non_positive_uacr(values["uACR"], stacklevel=2)
+
+    registry = registry or DEFAULT_REGISTRY
+    out = np.empty((n_rows, len(models) * len(years)))
+    for north_american in (False, True):
+        rows = np.flatnonzero(region == north_american)
+        if rows.size == 0:
+            continue
+        plan = scoring_plan(registry, models, years, north_american)
+        raw = np.column_stack([values[f][rows] for f in plan["features"]])
+        block = np.empty((rows.size, out.shape[1]))
+        score_blocks(raw, plan, block)
+        out[rows] = block
+
+    columns = [f"kfre_{n}var_{year}year" for n in models for year in years]
+    return apply_precision(pd.DataFrame(out, columns=columns), precision=precision)
+
+
+# Evaluation helpers used to be re-exported from this module through a star
+# import of perform_eval; keep every public perform_eval name reachable as
+# ``kfre.main.<name>`` without importing matplotlib or scikit-learn for
+# scoring-only users. perform_eval is imported on the first such lookup.
+def __getattr__(name):
+    if not name.startswith("_"):
+        from . import perform_eval
+
+        if name in vars(perform_eval):
+            return getattr(perform_eval, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 ################################################################################
 # References
 # ------------------------------------------------------------------------------
@@ -4,27 +4,16 @@ KFRE performance evaluation plotting.
 The save and per-curve drawing utilities live in `_plot_utils.py`. This
 module is the public surface and stays focused on argument validation,
 prediction assembly, and plot orchestration.
+
+Only NumPy and pandas are imported at module level. matplotlib, scikit-learn
+and `_plot_utils` are imported inside the functions that need them, so
+outcome labeling and CKD staging stay cheap to import.
 """
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.metrics import (
-    precision_score,
-    average_precision_score,
-    recall_score,
-    roc_auc_score,
-    brier_score_loss,
-    precision_score,
-)
 
-from ._plot_utils import (
-    save_plot_images,
-    draw_roc,
-    draw_pr,
-    finalize_roc_axes,
-    finalize_pr_axes,
-)
+from ._metrics import as_float
 
 ################################################################################
 ################################ ESRD Outcome ##################################
@@ -54,7 +43,8 @@ def class_esrd_outcome(
     KFRE defines it, i.e. initiation of maintenance dialysis or kidney
     transplantation (kidney replacement therapy / ESKD). This is supplied by the
     user; the function does not infer the event from eGFR or any other lab value.
-    years (int): The number of years to use in the condition.
+    years (int or list of int): The number of years to use in the condition.
+    A list labels every horizon in one pass, e.g. ``[2, 5]``.
     duration_col (str): The name of the column containing the duration data
     (follow-up time to event or censoring).
     prefix (str, optional): Custom prefix for the new column name.
@@ -62,12 +52,14 @@ def class_esrd_outcome(
     create_years_col (bool, optional): Whether to create the 'years' column.
     Default is True.
     censor_incomplete (bool, optional): If True, patients with no event whose
-    follow-up is shorter than `years` are labeled NaN (censored) rather than 0,
+    follow-up is shorter than `years` are labeled missing (censored) rather than 0,
     so they can be excluded from fixed-horizon evaluation. Default is False,
     which preserves the naive labeling (all non-events -> 0).
 
     Returns:
-    pd.DataFrame: DataFrame with the new binary outcome column added.
+    pd.DataFrame: DataFrame with one binary outcome column per horizon,
+    ``{years}_year_outcome``, stored as nullable ``Int8`` (``<NA>`` for
+    censored rows). An existing column of that name is overwritten in place.
 
     Notes:
     This is a naive fixed-horizon labeling: with the default
@@ -82,37 +74,88 @@ def class_esrd_outcome(
     handle censoring and competing risks explicitly. Setting
     ``censor_incomplete=True`` provides a basic guard by excluding (NaN)
     non-event patients whose observed follow-up does not reach the horizon.
+    `ipcw_weights` reweights those patients instead of dropping them, and
+    `cumulative_incidence` / `kfre_cumulative_incidence_table` give observed
+    risks that treat death as a competing event.
     """
+    horizons = [years] if np.ndim(years) == 0 else list(years)
+    duration = df[duration_col].to_numpy(dtype=float, na_value=np.nan)
     if create_years_col:
-        # Create a 'years' column based on the duration_col
-        years_col = "ESRD_duration_years"
-        df[years_col] = df[duration_col] / 365.25
-
+        # Convert the duration to years once for every horizon
+        duration = duration / 365.25
+        df["ESRD_duration_years"] = duration
+
+    # One (rows x horizons) pass: event within the horizon -> 1; otherwise 0.
+    event = (df[col] == 1).to_numpy(dtype=bool, na_value=False)[:, None]
+    duration = duration[:, None]
+    cutoffs = np.asarray(horizons, dtype=float)[None, :]
+    outcome = (event & (duration <= cutoffs)).astype(np.int8)
+    if censor_incomplete:
+        # A non-event patient whose follow-up ends before the horizon is
+        # censored, not a confirmed non-event: label missing so they can be
+        # excluded from fixed-horizon evaluation.
+        censored = ~event & (duration < cutoffs)
     else:
-        # Use the provided duration_col directly
-        years_col = duration_col
+        censored = np.zeros(outcome.shape, dtype=bool)
 
-    if prefix is None:
-        column_name = f"{years}_year_outcome"
-    else:
-        column_name = f"{prefix}_{years}_year_outcome"
+    for j, y in enumerate(horizons):
+        if prefix is None:
+            column_name = f"{y}_year_outcome"
+        else:
+            column_name = f"{prefix}_{y}_year_outcome"
+        # Overwrites an existing column in place rather than dropping and
+        # re-appending it.
+        df[column_name] = pd.arrays.IntegerArray(outcome[:, j], censored[:, j])
+    return df
 
-    # Remove the column if it already exists
-    if column_name in df.columns:
-        df.drop(columns=[column_name], inplace=True)
 
-    # Event within the horizon -> 1; otherwise 0.
-    outcome = np.where((df[col] == 1) & (df[years_col] <= years), 1, 0).astype(float)
+def ipcw_weights(df, col, years, duration_col, duration_unit="days"):
+    """Inverse-probability-of-censoring weights for fixed-horizon outcomes.
 
-    if censor_incomplete:
-        # A non-event patient whose follow-up ends before the horizon is
-        # censored, not a confirmed non-event: label NaN so they can be
-        # excluded from fixed-horizon evaluation.
-        censored = (df[col] != 1) & (df[years_col] < years)
-        outcome[censored.to_numpy()] = np.nan
+    Instead of dropping patients censored before the horizon (as
+    ``class_esrd_outcome(censor_incomplete=True)`` followed by the metrics
+    does), weight the remaining patients so they also represent them. The
+    censoring distribution G is the Kaplan-Meier curve of the censoring
+    times, fitted once with one sort and a cumulative product.
 
-    df[column_name] = outcome
-    return df
+    Parameters:
+    df (pd.DataFrame): DataFrame holding the event and duration columns.
+    col (str): Column name of the binary kidney-failure event indicator, as
+    in `class_esrd_outcome`.
+    years (int or list of int): Horizon(s) in years.
+    duration_col (str): Follow-up time to event or censoring.
+    duration_unit (str, optional): "days" (converted with 365.25 days per
+    year, as in `class_esrd_outcome`) or "years". Default is "days".
+
+    Returns:
+    pd.Series or pd.DataFrame: Weights aligned with ``df.index``, named
+    ``{years}_year_ipcw`` (one column per horizon when `years` is a list).
+    Patients with an event within the horizon get 1 / G(event time),
+    patients followed through the horizon get 1 / G(horizon), and patients
+    censored before the horizon (or with a missing duration or event) get 0.
+
+    Notes:
+    Pass the weights as ``sample_weight`` to `eval_kfre_metrics` or
+    `eval_kfre_calibration`; rows with zero weight are ignored there, so the
+    outcome may be labeled with ``censor_incomplete=True``. Death without
+    kidney failure is treated as censoring here; see the competing-risk
+    caveat of `class_esrd_outcome`.
+    """
+    from ._survival import horizon_ipcw
+
+    if duration_unit not in ("days", "years"):
+        raise ValueError("duration_unit must be 'days' or 'years'.")
+    duration = as_float(df[duration_col])
+    if duration_unit == "days":
+        duration = duration / 365.25
+    event = as_float(df[col])
+
+    horizons = [years] if np.ndim(years) == 0 else list(years)
+    weights = pd.DataFrame(
+        {f"{y}_year_ipcw": horizon_ipcw(duration, event, y) for y in horizons},
+        index=df.index,
+    )
+    return weights.iloc[:, 0] if np.ndim(years) == 0 else weights
 
 
 ################################################################################
@@ -120,62 +163,113 @@ def class_esrd_outcome(
 ################################################################################
 
 
+# eGFR cut points (mL/min/1.73 m^2) and KDIGO G stages; "Not Classified"
+# (missing eGFR) is the last category.
+_EGFR_CUTS = np.array([15.0, 30.0, 45.0, 60.0, 90.0])
+_CKD_STAGES = [
+    "CKD Stage 5",
+    "CKD Stage 4",
+    "CKD Stage 3b",
+    "CKD Stage 3a",
+    "CKD Stage 2",
+    "CKD Stage 1",
+    "Not Classified",
+]
+# uACR cut points (mg/g): A1 < 30 <= A2 <= 300 < A3.
+_UACR_CUTS = np.array([30.0, np.nextafter(300.0, np.inf)])
+_ALBUMINURIA_STAGES = ["A1", "A2", "A3", "Not Classified"]
+# KDIGO heat map: risk category by G stage (rows, in _CKD_STAGES order) and
+# A stage (columns); the last row and column are "Not Classified".
+_KDIGO_RISKS = [
+    "Low Risk",
+    "Moderately Increased Risk",
+    "High Risk",
+    "Very High Risk",
+    "Not Classified",
+]
+_KDIGO_GRID = np.array(
+    [
+        [3, 3, 3, 4],  # G5
+        [3, 3, 3, 4],  # G4
+        [2, 3, 3, 4],  # G3b
+        [1, 2, 3, 4],  # G3a
+        [0, 1, 2, 4],  # G2
+        [0, 1, 2, 4],  # G1
+        [4, 4, 4, 4],  # Not Classified
+    ],
+    dtype=np.int8,
+)
+
+
 def class_ckd_stages(
     df,
     egfr_col="eGFR",
     stage_col=None,
     combined_stage_col=None,
+    uacr_col=None,
+    albuminuria_col=None,
+    kdigo_col=None,
 ):
     """
     Classifies CKD stages based on eGFR values in a specified column of a DataFrame.
 
+    Each eGFR value is placed with one `np.searchsorted` over the stage cut
+    points (90, 60, 45, 30, 15), and every derived column is stored as a
+    `pd.Categorical` (one byte per row) rather than as strings.
+
     Parameters:
     df (pd.DataFrame): DataFrame containing eGFR values.
     egfr_col (str): Name of the column in df containing eGFR values. Default is 'eGFR'.
     stage_col (str): Name of the new column to be created for CKD stage.
     combined_stage_col (str): Name of the new column to be created for combined
     CKD stage.
+    uacr_col (str, optional): Name of the column in df containing uACR values
+    in mg/g. Required for `albuminuria_col` and `kdigo_col`.
+    albuminuria_col (str, optional): Name of the new column to be created for
+    the KDIGO albuminuria stage: "A1" (< 30), "A2" (30 - 300) or "A3" (> 300).
+    kdigo_col (str, optional): Name of the new column to be created for the
+    KDIGO G x A heat-map risk category ("Low Risk", "Moderately Increased
+    Risk", "High Risk" or "Very High Risk").
 
     Returns:
     pd.DataFrame: DataFrame with new columns containing CKD stages.
+
+    Notes:
+    Rows with a missing eGFR (or, for the albuminuria and heat-map columns,
+    a missing uACR) are "Not Classified".
     """
 
-    if stage_col:
-        # Define the conditions for each CKD stage according to eGFR values
-        conditions = [
-            (df[egfr_col] >= 90),  # Condition for Stage 1
-            (df[egfr_col] >= 60) & (df[egfr_col] < 90),  # Condition for Stage 2
-            (df[egfr_col] >= 45) & (df[egfr_col] < 60),  # Condition for Stage 3a
-            (df[egfr_col] >= 30) & (df[egfr_col] < 45),  # Condition for Stage 3b
-            (df[egfr_col] >= 15) & (df[egfr_col] < 30),  # Condition for Stage 4
-            (df[egfr_col] < 15),  # Condition for Stage 5
-        ]
+    if (albuminuria_col or kdigo_col) and not uacr_col:
+        raise ValueError("uacr_col is required for albuminuria_col and kdigo_col.")
 
-        # Define the stage names that correspond to each condition
-        choices = [
-            "CKD Stage 1",
-            "CKD Stage 2",
-            "CKD Stage 3a",
-            "CKD Stage 3b",
-            "CKD Stage 4",
-            "CKD Stage 5",
-        ]
+    if stage_col or combined_stage_col or kdigo_col:
+        egfr = df[egfr_col].to_numpy(dtype=float, na_value=np.nan)
+        # 0 for Stage 5 up to 5 for Stage 1; NaN sorts past every cut point.
+        g_stage = np.searchsorted(_EGFR_CUTS, egfr, side="right").astype(np.int8)
+        g_stage[np.isnan(egfr)] = len(_CKD_STAGES) - 1
 
-        # Create a new column in the DataFrame
-        df[stage_col] = np.select(conditions, choices, default="Not Classified")
+    if stage_col:
+        df[stage_col] = pd.Categorical.from_codes(g_stage, _CKD_STAGES)
 
     if combined_stage_col:
-        # Combine conditions for CKD stages 3, 4, and 5 according to eGFR values
-        combined_conditions = df[egfr_col] < 60
-
-        # Define the stage names that correspond to the combined condition
-        combined_choices = ["CKD Stage 3 - 5"]
-
-        # Create a new column in the DataFrame
-        df[combined_stage_col] = np.select(
-            [combined_conditions], combined_choices, default="Not Classified"
+        # Stages 3a to 5 (eGFR < 60) share one label.
+        df[combined_stage_col] = pd.Categorical.from_codes(
+            (g_stage > 3).astype(np.int8), ["CKD Stage 3 - 5", "Not Classified"]
         )
 
+    if albuminuria_col or kdigo_col:
+        uacr = df[uacr_col].to_numpy(dtype=float, na_value=np.nan)
+        a_stage = np.searchsorted(_UACR_CUTS, uacr, side="right").astype(np.int8)
+        a_stage[np.isnan(uacr)] = len(_ALBUMINURIA_STAGES) - 1
+        if albuminuria_col:
+            df[albuminuria_col] = pd.Categorical.from_codes(
+                a_stage, _ALBUMINURIA_STAGES
+            )
+        if kdigo_col:
+            df[kdigo_col] = pd.Categorical.from_codes(
+                _KDIGO_GRID[g_stage, a_stage], _KDIGO_RISKS
+            )
+
     return df
 
 
@@ -201,6 +295,7 @@ def plot_kfre_metrics(
     show_subplots=False,
     decimal_places=2,
     dpi=None,
+    max_points=2000,
 ):
     """
     Generate true labels and predicted probabilities for 2-year and 5-year
@@ -248,6 +343,11 @@ def plot_kfre_metrics(
         Decimal places for AUC/AP scores in legends. Default 2.
     dpi : int, optional
         DPI for PNG output. Default None (matplotlib default).
+    max_points : int or None, optional
+        Maximum number of vertices drawn per curve. Curves with more distinct
+        scores are thinned so that no dropped point is farther than about
+        2 / max_points (in axis units) from the drawn line. None draws every
+        point. Default 2000.
 
     Returns
     -------
@@ -255,8 +355,14 @@ def plot_kfre_metrics(
         When mode is 'prep' or 'both', returns `(y_true, preds, outcomes)`.
     """
 
-    def format_list_or_tuple(items):
-        return ", ".join(map(str, items))
+    from ._plot_utils import (
+        CurveCache,
+        draw_panels,
+        figure_layout,
+        grid_shape,
+        save_names,
+        save_plot_images,
+    )
 
     # ------------------------------------------------------------------
     # Argument validation
@@ -317,7 +423,8 @@ def plot_kfre_metrics(
             raise ValueError(
                 f"No outcome columns found matching pattern for {year}-year outcomes."
             )
-        y_true.append(df[outcome_cols[0]])
+        col = outcome_cols[0]
+        y_true.append(pd.Series(as_float(df[col]), index=df.index, name=col))
         outcomes.append(f"{year}-year")
 
     preds = {}
@@ -329,223 +436,82 @@ def plot_kfre_metrics(
         return result
 
     # ------------------------------------------------------------------
-    # Filename resolution helpers
+    # Plotting
     # ------------------------------------------------------------------
-    def _auto_name(suffix):
-        """Auto-generated filename with optional image_prefix."""
-        return f"{image_prefix}_{suffix}" if image_prefix else suffix
-
-    def _save(auto_suffix, multi_suffix=None, fig=None):
-        """
-        Resolve filename and call save_plot_images.
-
-        - When `image_filename` is set and `multi_suffix` is given (multi-output
-          mode), the suffix is appended to image_filename so files don't collide.
-        - When `image_filename` is set without `multi_suffix`, image_filename
-          is used verbatim.
-        """
-        if image_filename and multi_suffix:
-            effective_override = f"{image_filename}_{multi_suffix}"
-        else:
-            effective_override = image_filename
+    if mode not in ["plot", "both"]:
+        return result if mode == "both" else None
+
+    import matplotlib.pyplot as plt
+
+    # Each (model, outcome) curve is computed once and shared by every
+    # figure or subplot of this call.
+    curves = CurveCache(max_points)
+
+    layout = figure_layout(
+        num_vars, plot_type, plot_combinations, show_subplots, image_prefix
+    )
+    for auto_suffix, multi_suffix, panels in layout:
+        rows, cols = grid_shape(len(panels))
+        fig, axs = plt.subplots(
+            rows,
+            cols,
+            figsize=(figsize[0] * cols, figsize[1] * rows),
+            squeeze=False,
+        )
+        axs = axs.flatten()
+        draw_panels(axs, panels, y_true, preds, outcomes, curves, decimal_places)
+        if show_subplots:
+            for ax in axs[len(panels) :]:
+                fig.delaxes(ax)
+            fig.tight_layout()
+
+        filename, override = save_names(
+            auto_suffix, multi_suffix, image_prefix, image_filename
+        )
         save_plot_images(
-            filename=_auto_name(auto_suffix),
+            filename=filename,
             save_plots=save_plots,
             image_path_png=image_path_png,
             image_path_svg=image_path_svg,
-            image_filename=effective_override,
+            image_filename=override,
             fig=fig,
             bbox_inches=bbox_inches,
             dpi=dpi,
         )
+        plt.show()
 
-    # ------------------------------------------------------------------
-    # Plotting
-    # ------------------------------------------------------------------
-    roc_figs, pr_figs = [], []
-
-    if mode not in ["plot", "both"]:
-        return result if mode == "both" else None
-
-    # Multi-output flag: True when one call produces >1 distinct file.
-    multi_output = (
-        (plot_combinations and plot_type == "all_plots")
-        or show_subplots
-        or (len(num_vars) > 1 and not plot_combinations)
-    )
-
-    if plot_combinations:
-        # ---- All variables overlaid on the same axes ----
-        if plot_type in ["auc_roc", "all_plots"]:
-            fig, ax = plt.subplots(figsize=figsize)
-            for n in num_vars:
-                draw_roc(
-                    ax,
-                    y_true,
-                    preds[f"{n}var"],
-                    outcomes,
-                    var_label=f"{n}-variable",
-                    decimal_places=decimal_places,
-                )
-            finalize_roc_axes(
-                ax,
-                f"AUC ROC: {format_list_or_tuple(num_vars)} Variable KFRE",
-            )
-            if not show_subplots:
-                _save(
-                    auto_suffix="auc_roc_curve_combined",
-                    multi_suffix="auc_roc_combined" if multi_output else None,
-                    fig=fig,
-                )
-            roc_figs.append(fig)
-            if not show_subplots:
-                plt.show()
-            else:
-                plt.close(fig)
-
-        if plot_type in ["precision_recall", "all_plots"]:
-            fig, ax = plt.subplots(figsize=figsize)
-            for n in num_vars:
-                draw_pr(
-                    ax,
-                    y_true,
-                    preds[f"{n}var"],
-                    outcomes,
-                    var_label=f"{n}-variable",
-                    decimal_places=decimal_places,
-                )
-            finalize_pr_axes(
-                ax,
-                f"Precision-Recall: {format_list_or_tuple(num_vars)} Variable KFRE",
-            )
-            if not show_subplots:
-                _save(
-                    auto_suffix="pr_curve_combined",
-                    multi_suffix="pr_combined" if multi_output else None,
-                    fig=fig,
-                )
-            pr_figs.append(fig)
-            if not show_subplots:
-                plt.show()
-            else:
-                plt.close(fig)
-
-    else:
-        # ---- One figure per variable count ----
-        for n in num_vars:
-            pred_list = preds[f"{n}var"]
-
-            if plot_type in ["auc_roc", "all_plots"]:
-                fig, ax = plt.subplots(figsize=figsize)
-                draw_roc(
-                    ax,
-                    y_true,
-                    pred_list,
-                    outcomes,
-                    var_label=f"{n}-variable",
-                    decimal_places=decimal_places,
-                )
-                finalize_roc_axes(ax, f"AUC ROC: {n} Variable KFRE")
-                if not show_subplots:
-                    _save(
-                        auto_suffix=f"{n}var_auc_roc",
-                        multi_suffix=(f"{n}var_auc_roc" if multi_output else None),
-                        fig=fig,
-                    )
-                roc_figs.append(fig)
-                if not show_subplots:
-                    plt.show()
-                else:
-                    plt.close(fig)
-
-            if plot_type in ["precision_recall", "all_plots"]:
-                fig, ax = plt.subplots(figsize=figsize)
-                draw_pr(
-                    ax,
-                    y_true,
-                    pred_list,
-                    outcomes,
-                    var_label=f"{n}-variable",
-                    decimal_places=decimal_places,
-                )
-                finalize_pr_axes(ax, f"Precision-Recall: {n} Variable KFRE")
-                if not show_subplots:
-                    _save(
-                        auto_suffix=f"{n}var_precision_recall",
-                        multi_suffix=(
-                            f"{n}var_precision_recall" if multi_output else None
-                        ),
-                        fig=fig,
-                    )
-                pr_figs.append(fig)
-                if not show_subplots:
-                    plt.show()
-                else:
-                    plt.close(fig)
+    if mode == "both":
+        return result
+    return None
 
-    # ------------------------------------------------------------------
-    # Subplots grid (preserves the original line-replay approach)
-    # ------------------------------------------------------------------
-    if show_subplots:
-        subplot_figs = []
-        if plot_type in ["auc_roc", "all_plots"]:
-            subplot_figs += roc_figs
-        if plot_type in ["precision_recall", "all_plots"]:
-            subplot_figs += pr_figs
-
-        if subplot_figs:
-            subplot_cols = min(len(subplot_figs), 3)
-            subplot_rows = (len(subplot_figs) + subplot_cols - 1) // subplot_cols
-            fig, axs = plt.subplots(
-                subplot_rows,
-                subplot_cols,
-                figsize=(figsize[0] * subplot_cols, figsize[1] * subplot_rows),
-            )
 
-            if subplot_rows == 1 and subplot_cols == 1:
-                axs = np.array([axs])
-            elif subplot_rows == 1 or subplot_cols == 1:
-                axs = np.expand_dims(axs, axis=0 if subplot_rows == 1 else 1)
-
-            axs = axs.flatten()
-            for ax, fig_ in zip(axs, subplot_figs):
-                fig_.axes[0].get_figure().sca(fig_.axes[0])
-                for line in fig_.axes[0].get_lines():
-                    xdata = line.get_xdata()
-                    ydata = line.get_ydata()
-                    if (
-                        len(xdata) != 2
-                        or len(ydata) != 2
-                        or not ((xdata == [0, 1]).all() and (ydata == [0, 1]).all())
-                    ):
-                        ax.plot(xdata, ydata, label=line.get_label())
-                if "roc" in fig_.axes[0].get_title().lower():
-                    ax.plot([0, 1], [0, 1], linestyle="--")
-                ax.legend(loc="best")
-                ax.set_title(fig_.axes[0].get_title())
-                ax.set_xlabel(fig_.axes[0].get_xlabel())
-                ax.set_ylabel(fig_.axes[0].get_ylabel())
-            for ax in axs[len(subplot_figs) :]:
-                fig.delaxes(ax)
-            plt.tight_layout()
+def plot_kfre_metrics_jobs(jobs, n_jobs=None):
+    """
+    Render many independent `plot_kfre_metrics` figures, optionally in parallel.
 
-            if plot_type == "all_plots" and plot_combinations:
-                auto_suffix = "subplot_all_plots_combination"
-            elif image_prefix:
-                auto_suffix = "subplot"
-            else:
-                auto_suffix = "performance_subplot"
+    Parameters
+    ----------
+    jobs : iterable of dict
+        Keyword arguments of one `plot_kfre_metrics` call each (including
+        its ``df``). Jobs should save their figures (``save_plots=True`` or
+        ``image_filename``) with distinct names; ``mode`` is forced to
+        'plot'.
+    n_jobs : int, optional
+        Worker processes (negative values count back from the number of
+        CPUs). Workers use the headless Agg backend and close every figure
+        after saving it. Default None runs the jobs one after another in
+        this process, with its current backend.
+
+    Notes
+    -----
+    Each job's DataFrame is pickled to its worker, so pass only the columns
+    the job needs (the ``*_year_outcome`` and ``kfre_*`` columns). Figures
+    are independent, so for reports made of many figures the wall time
+    drops roughly with the number of workers.
+    """
+    from ._plot_utils import run_figure_jobs
 
-            _save(
-                auto_suffix=auto_suffix,
-                multi_suffix="subplot",
-                fig=fig,
-            )
-            plt.show()
-
-    if mode == "both":
-        return result
-    return None
+    run_figure_jobs(jobs, n_jobs)
 
 
 ################################################################################
@@ -553,49 +519,12 @@ def plot_kfre_metrics(
 ################################################################################
 
 
-def eval_kfre_metrics(
-    df,
-    n_var_list,
-    outcome_years=2,
-    decimal_places=6,
-):
+def _eval_years(n_var_list, outcome_years):
     """
-    Calculate metrics for multiple outcomes and store the results in a DataFrame.
-
-    This function computes a set of performance metrics for multiple binary
-    classification models given the true labels and the predicted probabilities
-    for each outcome. The metrics calculated include precision
-    (positive predictive value), average precision, sensitivity (recall),
-    specificity, AUC ROC, and Brier score.
-
-    Parameters:
-    ----------
-    df : pd.DataFrame
-        The input DataFrame containing the necessary columns for truth and
-        predictions.
-    n_var_list : list of int
-        List of variable numbers to consider, e.g., [4, 6, 8].
-    outcome_years : list, tuple, or int, optional
-        List, tuple, or single year to consider for outcomes, default is [2].
-    decimal_places : int, optional
-        Number of decimal places for the calculated metrics. Default is 6.
-
-    Returns:
-    -------
-    pd.DataFrame
-        A DataFrame containing the calculated metrics for each outcome.
+    Validate the model/horizon arguments shared by the evaluation functions.
 
-    Notes:
-    -----
-    - Precision is calculated with a threshold of 0.5 for the predicted
-      probabilities.
-    - Sensitivity is also known as recall.
-    - Specificity is calculated as the recall for the negative class.
-    - AUC ROC is calculated using the receiver operating characteristic curve.
-    - Brier score measures the mean squared difference between predicted
-      probabilities and the true binary outcomes.
+    Returns outcome_years as a list.
     """
-
     # Ensure outcome_years is a list
     if isinstance(outcome_years, int):
         outcome_years = [outcome_years]
@@ -617,6 +546,18 @@ def eval_kfre_metrics(
             "Invalid value for year in outcome_years. Valid options are 2, 5, "
             "or both as a list or tuple."
         )
+    return outcome_years
+
+
+def _eval_inputs(df, n_var_list, outcome_years):
+    """
+    Validate the model/horizon arguments and collect their columns.
+
+    Returns (outcomes, y_true, preds_n_var_dict): outcome labels such as
+    "2_year", the matching outcome Series, and {n_var: [prediction Series or
+    None per outcome]}.
+    """
+    outcome_years = _eval_years(n_var_list, outcome_years)
 
     # Extract the true labels for the outcomes using regex
     y_true = []
@@ -624,7 +565,8 @@ def eval_kfre_metrics(
     for year in outcome_years:
         outcome_col = df.filter(regex=f".*{year}_year_outcome").columns
         if not outcome_col.empty:
-            y_true.append(df[outcome_col[0]])
+            col = outcome_col[0]
+            y_true.append(pd.Series(as_float(df[col]), index=df.index, name=col))
             outcomes.append(f"{year}_year")
         else:
             raise ValueError(f"{year}_year_outcome must exist to derive these metrics.")
@@ -648,6 +590,142 @@ def eval_kfre_metrics(
             else:
                 preds_n_var_dict[n_var].append(None)
 
+    return outcomes, y_true, preds_n_var_dict
+
+
+def _horizon_weight(df, sample_weight, outcome):
+    """
+    Row weights for `outcome` (e.g. "2_year") as a float array, or None.
+
+    `sample_weight` is None, a column name, an array aligned with `df`, or a
+    dict mapping each year to one of those.
+    """
+    if isinstance(sample_weight, dict):
+        year = int(outcome.split("_")[0])
+        if year not in sample_weight:
+            raise ValueError(f"sample_weight has no entry for {year} years.")
+        sample_weight = sample_weight[year]
+    if sample_weight is None:
+        return None
+    if isinstance(sample_weight, str):
+        sample_weight = df[sample_weight]
+    weight = np.asarray(sample_weight, dtype=float)
+    if weight.shape != (len(df),):
+        raise ValueError("sample_weight must have one value per row of df.")
+    return weight
+
+
+# Row labels of the metrics table, in table order.
+_METRIC_LABELS = {
+    "precision": "Precision/PPV",
+    "average_precision": "Average Precision",
+    "sensitivity": "Sensitivity",
+    "specificity": "Specificity",
+    "auc_roc": "AUC ROC",
+    "brier": "Brier Score",
+}
+
+
+def eval_kfre_metrics(
+    df,
+    n_var_list,
+    outcome_years=2,
+    decimal_places=6,
+    ci=None,
+    n_boot=1000,
+    seed=None,
+    n_jobs=None,
+    sample_weight=None,
+):
+    """
+    Calculate metrics for multiple outcomes and store the results in a DataFrame.
+
+    This function computes a set of performance metrics for multiple binary
+    classification models given the true labels and the predicted probabilities
+    for each outcome. The metrics calculated include precision
+    (positive predictive value), average precision, sensitivity (recall),
+    specificity, AUC ROC, and Brier score.
+
+    Parameters:
+    ----------
+    df : pd.DataFrame
+        The input DataFrame containing the necessary columns for truth and
+        predictions.
+    n_var_list : list of int
+        List of variable numbers to consider, e.g., [4, 6, 8].
+    outcome_years : list, tuple, or int, optional
+        List, tuple, or single year to consider for outcomes, default is [2].
+    decimal_places : int, optional
+        Number of decimal places for the calculated metrics. Default is 6.
+    ci : float, optional
+        Confidence level as a percentage (e.g. 95). When given, every metric
+        gets a percentile bootstrap interval; see Notes. Default is None (no
+        intervals).
+    n_boot : int, optional
+        Number of bootstrap resamples per horizon when `ci` is set.
+        Default is 1000.
+    seed : int, optional
+        Seed for the bootstrap resamples.
+    n_jobs : int, optional
+        Worker processes for the bootstrap (negative values count back from
+        the number of CPUs). With any integer, each horizon's resamples come
+        from seed streams spawned from ``np.random.SeedSequence(seed)``, so
+        the intervals are identical for every worker count. Default None
+        runs serially on a single ``np.random.default_rng(seed)`` stream.
+    sample_weight : str, array-like, or dict, optional
+        Row weights for every metric, e.g. from `ipcw_weights`: a column
+        name, an array aligned with `df`, or a dict mapping each year in
+        `outcome_years` to one of those. Rows with zero weight are ignored,
+        so their outcome may be missing. Not supported together with `ci`.
+
+    Returns:
+    -------
+    pd.DataFrame
+        A DataFrame containing the calculated metrics for each outcome. With
+        `ci`, each outcome column is followed by ``<outcome>_lower`` and
+        ``<outcome>_upper`` columns, and paired differences against the first
+        model in `n_var_list` are appended as
+        ``<year>_year_<n>_minus_<ref>_var_kfre`` columns (each with its own
+        lower/upper bounds).
+
+    Notes:
+    -----
+    - Precision is calculated with a threshold of 0.5 for the predicted
+      probabilities.
+    - Sensitivity is also known as recall.
+    - Specificity is calculated as the recall for the negative class.
+    - AUC ROC is calculated using the receiver operating characteristic curve.
+    - Brier score measures the mean squared difference between predicted
+      probabilities and the true binary outcomes.
+    - All six metrics are derived from one sort of each prediction column
+      (cumulative true/false positive counts); scikit-learn is not required.
+    - With `ci`, one set of `n_boot` resamples is drawn per horizon and every
+      model and metric is evaluated on those same resamples, so the interval
+      of a model difference (e.g. 8-var minus 4-var AUC ROC) is a paired
+      bootstrap interval. Rows missing the outcome or any evaluated model's
+      prediction for that horizon are dropped first, so all models are
+      compared on the same patients. Resamples in which a metric is
+      undefined are skipped for that metric.
+    """
+
+    from ._metrics import summary_metrics
+
+    outcomes, y_true, preds_n_var_dict = _eval_inputs(df, n_var_list, outcome_years)
+
+    if ci is not None:
+        if sample_weight is not None:
+            raise ValueError("sample_weight cannot be combined with ci.")
+        return _eval_metrics_ci(
+            outcomes,
+            y_true,
+            preds_n_var_dict,
+            ci,
+            n_boot,
+            seed,
+            decimal_places,
+            n_jobs,
+        )
+
     # Initialize an empty list to store the calculated metrics for each
     # combination of variables and outcomes
     metrics_list_n_var = []
@@ -658,38 +736,19 @@ def eval_kfre_metrics(
         for outcome, true_labels, pred_labels in zip(outcomes, y_true, preds):
             # Only calculate metrics if the predicted labels are not None
             if pred_labels is not None:
-                # Calculate precision (positive predictive value)
-                precision = precision_score(true_labels, pred_labels > 0.5)
-                # Calculate sensitivity (recall)
-                sensitivity = recall_score(true_labels, pred_labels > 0.5)
-                # Calculate specificity (recall for the negative class)
-                specificity = recall_score(
-                    true_labels,
-                    pred_labels > 0.5,
-                    pos_label=0,
-                )
-                # Calculate AUC ROC (Area Under the Receiver Operating
-                # Characteristic curve)
-                auc_roc = roc_auc_score(true_labels, pred_labels)
-                # Calculate Brier score (mean squared difference between
-                # predicted probabilities and true binary outcomes)
-                brier = brier_score_loss(true_labels, pred_labels)
-                # Calculate average precision (area under the precision-recall curve)
-                average_precision = average_precision_score(
+                # Every metric from one sort of the predicted probabilities
+                values = summary_metrics(
                     true_labels,
                     pred_labels,
+                    sample_weight=_horizon_weight(df, sample_weight, outcome),
                 )
 
                 # Create a dictionary to store the calculated metrics
                 metrics = {
-                    "Precision/PPV": round(precision, decimal_places),
-                    "Average Precision": round(average_precision, decimal_places),
-                    "Sensitivity": round(sensitivity, decimal_places),
-                    "Specificity": round(specificity, decimal_places),
-                    "AUC ROC": round(auc_roc, decimal_places),
-                    "Brier Score": round(brier, decimal_places),
-                    "Outcome": f"{outcome}_{n_var}_var_kfre",
+                    label: round(values[metric], decimal_places)
+                    for metric, label in _METRIC_LABELS.items()
                 }
+                metrics["Outcome"] = f"{outcome}_{n_var}_var_kfre"
 
                 # Append the dictionary to the metrics list
                 metrics_list_n_var.append(metrics)
@@ -708,6 +767,856 @@ def eval_kfre_metrics(
     return metrics_df_n_var
 
 
+def _eval_metrics_ci(
+    outcomes, y_true, preds_n_var_dict, ci, n_boot, seed, decimal_places, n_jobs
+):
+    """Metrics table with shared-resample bootstrap CIs; see eval_kfre_metrics."""
+    from ._bootstrap import bootstrap_all_metrics, percentile_ci, seed_source
+
+    source = seed_source(seed, n_jobs)
+    # Spawned sources get one independent child per horizon; a Generator is
+    # consumed horizon after horizon.
+    if isinstance(source, np.random.SeedSequence):
+        sources = source.spawn(len(outcomes))
+    else:
+        sources = [source] * len(outcomes)
+    results = {}
+    differences = {}
+    for i, (outcome, labels) in enumerate(zip(outcomes, y_true)):
+        models = {
+            n_var: np.asarray(preds[i], dtype=float)
+            for n_var, preds in preds_n_var_dict.items()
+            if preds[i] is not None
+        }
+        if not models:
+            continue
+
+        labels = as_float(labels)
+        keep = ~np.isnan(labels)
+        for score in models.values():
+            keep &= ~np.isnan(score)
+        points, values = bootstrap_all_metrics(
+            labels[keep].astype(int),
+            {n_var: score[keep] for n_var, score in models.items()},
+            n_boot,
+            sources[i],
+            n_jobs=n_jobs,
+        )
+
+        for n_var in models:
+            results[(n_var, outcome)] = points[n_var], values[n_var]
+        ref, *others = models
+        for n_var in others:
+            differences[f"{outcome}_{n_var}_minus_{ref}_var_kfre"] = (
+                {m: points[n_var][m] - points[ref][m] for m in _METRIC_LABELS},
+                {m: values[n_var][m] - values[ref][m] for m in _METRIC_LABELS},
+            )
+
+    # Same column order as the table without intervals.
+    ordered = {
+        f"{outcome}_{n_var}_var_kfre": results[(n_var, outcome)]
+        for n_var in preds_n_var_dict
+        for outcome in outcomes
+        if (n_var, outcome) in results
+    }
+    ordered.update(differences)
+
+    table = {}
+    for name, (point, boot) in ordered.items():
+        bounds = [percentile_ci(boot[m], ci)[:2] for m in _METRIC_LABELS]
+        table[name] = [point[m] for m in _METRIC_LABELS]
+        table[f"{name}_lower"] = [lower for lower, _ in bounds]
+        table[f"{name}_upper"] = [upper for _, upper in bounds]
+
+    metrics_df = pd.DataFrame(table, index=list(_METRIC_LABELS.values()), dtype=float)
+    metrics_df = metrics_df.round(decimal_places).rename_axis("Metrics")
+    return metrics_df.rename_axis("Outcome", axis=1)
+
+
+def eval_kfre_metrics_binned(
+    data,
+    n_var_list,
+    outcome_years=2,
+    n_bins=10000,
+    threshold=0.5,
+    decimal_places=6,
+    chunksize=100_000,
+    return_accumulators=False,
+):
+    """
+    Calculate the `eval_kfre_metrics` table in bounded memory.
+
+    Rows are summarized chunk by chunk into one `kfre.ScoreAccumulator` per
+    ``kfre_{n}var_{y}year`` column (per-class histograms over ``n_bins``
+    equal-width risk bins, exact confusion counts and Brier sums), so the
+    data never has to fit in memory at once. Accumulators merge by addition,
+    so per-site or per-partition results can be reduced map-reduce style and
+    passed back in to produce the final table.
+
+    Parameters:
+    ----------
+    data : pd.DataFrame, str, path-like, iterable, or dict
+        A DataFrame; a CSV or Parquet file read in chunks of ``chunksize``
+        rows; an iterable of DataFrame chunks; or an already-reduced dict of
+        ``{"<year>_year_<n>_var_kfre": ScoreAccumulator}`` as returned with
+        ``return_accumulators=True``.
+    n_var_list : list of int
+        Models to evaluate, any of 4, 6 and 8.
+    outcome_years : list, tuple, or int, optional
+        Horizons to evaluate, 2 and/or 5. Default is 2.
+    n_bins : int, optional
+        Risk bins for AUC ROC and average precision. Default is 10,000.
+    threshold : float, optional
+        Cutoff for precision, sensitivity and specificity. Default is 0.5.
+    decimal_places : int, optional
+        Number of decimal places for the calculated metrics. Default is 6.
+    chunksize : int, optional
+        Rows per chunk when ``data`` is a file. Default is 100,000.
+    return_accumulators : bool, optional
+        Also return the dict of accumulators. Default is False.
+
+    Returns:
+    -------
+    pd.DataFrame or (pd.DataFrame, dict)
+        The `eval_kfre_metrics` table plus "AUC ROC Max Error" and
+        "Average Precision Max Error" rows: the largest possible distance
+        between the binned and the exact value (see
+        `kfre.ScoreAccumulator`). Brier score and the threshold metrics are
+        exact.
+    """
+    import os
+
+    from ._accumulator import ScoreAccumulator
+
+    if isinstance(data, dict):
+        accumulators = data
+        outcomes = [f"{y}_year" for y in _eval_years(n_var_list, outcome_years)]
+    else:
+        if isinstance(data, pd.DataFrame):
+            chunks = [data]
+        elif isinstance(data, (str, os.PathLike)):
+            from ._io import iter_chunks
+
+            chunks = iter_chunks(data, None, chunksize)
+        else:
+            chunks = data
+
+        accumulators = {}
+        outcomes = []
+        for chunk in chunks:
+            outcomes, y_true, preds_n_var_dict = _eval_inputs(
+                chunk, n_var_list, outcome_years
+            )
+            for n_var, preds in preds_n_var_dict.items():
+                for outcome, labels, scores in zip(outcomes, y_true, preds):
+                    if scores is None:
+                        continue
+                    name = f"{outcome}_{n_var}_var_kfre"
+                    if name not in accumulators:
+                        accumulators[name] = ScoreAccumulator(n_bins, threshold)
+                    accumulators[name].update(labels, scores)
+
+    table = {}
+    for n_var in n_var_list:
+        for outcome in outcomes:
+            name = f"{outcome}_{n_var}_var_kfre"
+            if name not in accumulators:
+                continue
+            acc = accumulators[name]
+            values = acc.metrics()
+            auc_low, auc_high = acc.auc_bounds()
+            ap_low, ap_high = acc.ap_bounds()
+            ap = values["average_precision"]
+            table[name] = [values[m] for m in _METRIC_LABELS] + [
+                (auc_high - auc_low) / 2,
+                max(ap - ap_low, ap_high - ap),
+            ]
+
+    index = list(_METRIC_LABELS.values()) + [
+        "AUC ROC Max Error",
+        "Average Precision Max Error",
+    ]
+    metrics_df = pd.DataFrame(table, index=index, dtype=float)
+    metrics_df = metrics_df.round(decimal_places).rename_axis("Metrics")
+    metrics_df = metrics_df.rename_axis("Outcome", axis=1)
+    if return_accumulators:
+        return metrics_df, accumulators
+    return metrics_df
+
+
+################################################################################
+########################### Operating-Point Table ##############################
+################################################################################
+
+
+def eval_kfre_operating_points(
+    df,
+    n_var_list,
+    outcome_years=2,
+    thresholds=(0.03, 0.05, 0.10, 0.40),
+    decimal_places=6,
+):
+    """
+    Tabulate clinical operating points of KFRE predictions at many cutoffs.
+
+    For every ``kfre_{n}var_{y}year`` column, each threshold is evaluated from
+    one sort of the column plus a single ``np.searchsorted`` into its
+    cumulative true/false positive counts, so a dense grid (e.g.
+    ``np.linspace(0.01, 0.99, 1000)``) costs about the same as one cutoff.
+
+    Parameters:
+    ----------
+    df : pd.DataFrame
+        DataFrame holding the ``kfre_*`` predictions and the
+        ``*_year_outcome`` columns (as for `eval_kfre_metrics`).
+    n_var_list : list of int
+        Models to evaluate, any of 4, 6 and 8.
+    outcome_years : list, tuple, or int, optional
+        Horizons to evaluate, 2 and/or 5. Default is 2.
+    thresholds : float or array-like, optional
+        Risk cutoffs in [0, 1). A patient is flagged when the predicted risk
+        is greater than the cutoff, as in `eval_kfre_metrics`. Default is
+        (0.03, 0.05, 0.10, 0.40).
+    decimal_places : int, optional
+        Number of decimal places for the reported values. Default is 6.
+
+    Returns:
+    -------
+    pd.DataFrame
+        One row per (outcome column, threshold) with columns "Outcome",
+        "Threshold", "Sensitivity", "Specificity", "PPV", "NPV",
+        "Flagged Fraction", "Net Benefit" and "Net Benefit (Treat All)".
+
+    Notes:
+    -----
+    - Rows with a missing outcome or prediction are dropped per column.
+    - Net benefit follows decision-curve analysis:
+      ``TP/n - FP/n * t / (1 - t)`` at cutoff ``t``; the treat-all reference
+      is ``prevalence - (1 - prevalence) * t / (1 - t)``.
+    - Ratios with an empty denominator (e.g. PPV when nobody is flagged) are
+      NaN.
+    """
+    from ._metrics import operating_points
+
+    thresholds = np.atleast_1d(np.asarray(thresholds, dtype=float))
+    if thresholds.ndim != 1 or ((thresholds < 0) | (thresholds >= 1)).any():
+        raise ValueError("thresholds must be values in [0, 1).")
+
+    outcomes, y_true, preds_n_var_dict = _eval_inputs(df, n_var_list, outcome_years)
+
+    odds = thresholds / (1 - thresholds)
+    tables = []
+    for n_var, preds in preds_n_var_dict.items():
+        for outcome, labels, scores in zip(outcomes, y_true, preds):
+            if scores is None:
+                continue
+            labels = as_float(labels)
+            scores = np.asarray(scores, dtype=float)
+            keep = ~(np.isnan(labels) | np.isnan(scores))
+            cells = operating_points(labels[keep], scores[keep], thresholds)
+            tp, fp, fn, tn = (cells[k].astype(float) for k in ("tp", "fp", "fn", "tn"))
+            n = float(keep.sum())
+            prevalence = (tp[0] + fn[0]) / n if n else np.nan
+            with np.errstate(invalid="ignore", divide="ignore"):
+                tables.append(
+                    pd.DataFrame(
+                        {
+                            "Outcome": f"{outcome}_{n_var}_var_kfre",
+                            "Threshold": thresholds,
+                            "Sensitivity": tp / (tp + fn),
+                            "Specificity": tn / (tn + fp),
+                            "PPV": tp / (tp + fp),
+                            "NPV": tn / (tn + fn),
+                            "Flagged Fraction": (tp + fp) / n,
+                            "Net Benefit": tp / n - fp / n * odds,
+                            "Net Benefit (Treat All)": (
+                                prevalence - (1 - prevalence) * odds
+                            ),
+                        }
+                    )
+                )
+
+    columns = [
+        "Outcome",
+        "Threshold",
+        "Sensitivity",
+        "Specificity",
+        "PPV",
+        "NPV",
+        "Flagged Fraction",
+        "Net Benefit",
+        "Net Benefit (Treat All)",
+    ]
+    if not tables:
+        return pd.DataFrame(columns=columns)
+    table = pd.concat(tables, ignore_index=True)
+    return table.round({c: decimal_places for c in columns[2:]})
+
+
+def eval_kfre_subgroup_metrics(
+    df,
+    n_var_list,
+    by,
+    outcome_years=2,
+    threshold=0.5,
+    decimal_places=6,
+):
+    """
+    Calculate the `eval_kfre_metrics` metrics within every subgroup.
+
+    Instead of looping ``df.groupby(by)`` and evaluating each group
+    separately, every ``kfre_{n}var_{y}year`` column is lexsorted once by
+    (group, predicted risk) and all groups are scored together with
+    segmented cumulative sums, so thousands of small subgroups (e.g. site x
+    sex x CKD stage x age band) take about as long as one evaluation.
+
+    Parameters:
+    ----------
+    df : pd.DataFrame
+        DataFrame holding the ``kfre_*`` predictions, the ``*_year_outcome``
+        columns (as for `eval_kfre_metrics`) and the grouping columns.
+    n_var_list : list of int
+        Models to evaluate, any of 4, 6 and 8.
+    by : str or list of str
+        Column(s) defining the subgroups, e.g. ``["region", "sex",
+        "CKD_stage"]``. Rows with a missing group value are dropped.
+    outcome_years : list, tuple, or int, optional
+        Horizons to evaluate, 2 and/or 5. Default is 2.
+    threshold : float, optional
+        Cutoff for precision, sensitivity and specificity. Default is 0.5.
+    decimal_places : int, optional
+        Number of decimal places for the metric values. Default is 6.
+
+    Returns:
+    -------
+    pd.DataFrame
+        Tidy long table with one row per (subgroup, outcome column, metric):
+        the `by` columns, "Outcome" (e.g. ``2_year_4_var_kfre``), "N" and
+        "Events" (rows and events evaluated in the subgroup), "Metric"
+        (labels as in `eval_kfre_metrics`) and "Value".
+
+    Notes:
+    -----
+    - Rows with a missing outcome or prediction are dropped per column.
+    - AUC ROC and average precision are NaN in subgroups with a single
+      outcome class (where `eval_kfre_metrics` raises); threshold metrics
+      with an empty denominator are 0, as in `eval_kfre_metrics`.
+    """
+    from ._metrics import grouped_metrics
+
+    by = [by] if isinstance(by, str) else list(by)
+    outcomes, y_true, preds_n_var_dict = _eval_inputs(df, n_var_list, outcome_years)
+
+    grouped = df.groupby(by, sort=True, observed=True, dropna=True)
+    codes = grouped.ngroup().to_numpy(dtype=float)
+    keys = grouped.size().index.to_frame(index=False)
+    n_groups = len(keys)
+    in_group = ~np.isnan(codes)
+
+    metrics = list(_METRIC_LABELS)
+    labels_col = np.tile(list(_METRIC_LABELS.values()), n_groups)
+    key_rows = np.repeat(np.arange(n_groups), len(metrics))
+    tables = []
+    for n_var, preds in preds_n_var_dict.items():
+        for outcome, labels, scores in zip(outcomes, y_true, preds):
+            if scores is None:
+                continue
+            labels = as_float(labels)
+            scores = np.asarray(scores, dtype=float)
+            keep = in_group & ~(np.isnan(labels) | np.isnan(scores))
+            values = grouped_metrics(
+                codes[keep].astype(np.int64),
+                n_groups,
+                labels[keep],
+                scores[keep],
+                threshold,
+            )
+            table = keys.iloc[key_rows].reset_index(drop=True)
+            table["Outcome"] = f"{outcome}_{n_var}_var_kfre"
+            table["N"] = np.repeat(values["n"], len(metrics))
+            table["Events"] = np.repeat(values["events"], len(metrics))
+            table["Metric"] = labels_col
+            table["Value"] = np.column_stack([values[m] for m in metrics]).ravel()
+            tables.append(table)
+
+    columns = by + ["Outcome", "N", "Events", "Metric", "Value"]
+    if not tables:
+        return pd.DataFrame(columns=columns)
+    table = pd.concat(tables, ignore_index=True)
+    return table.round({"Value": decimal_places})
+
+
+################################################################################
+########################### Survival Discrimination ############################
+################################################################################
+
+
+def _survival_arrays(duration, event, risk):
+    """Float arrays with rows missing any of the three values dropped."""
+    duration = as_float(duration)
+    event = as_float(event)
+    risk = np.asarray(risk, dtype=float)
+    keep = ~(np.isnan(duration) | np.isnan(event) | np.isnan(risk))
+    return duration[keep], (event[keep] == 1).astype(int), risk[keep]
+
+
+def concordance_index(duration, event, risk, method="harrell", tau=None):
+    """
+    Concordance index (C-index) of risk scores against survival data.
+
+    A pair of patients is comparable when the one with the shorter follow-up
+    had the event (a censored patient with the same follow-up time also
+    counts as having outlived it). The pair is concordant when that patient
+    has the higher predicted risk; tied risks count one half. Pairs are
+    counted with a vectorized merge-sort style counter in O(n log^2 n), so
+    hundreds of thousands of patients take about a second.
+
+    Parameters:
+    - duration (array-like): Follow-up time to event or censoring.
+    - event (array-like): 1 if the event (e.g. kidney failure) was observed,
+      0 if censored.
+    - risk (array-like): Predicted risk; higher means an earlier event.
+    - method (str): "harrell" for Harrell's C, or "uno" for Uno's C, which
+      weights each case by 1 / G(t-)^2, the inverse squared Kaplan-Meier
+      probability of remaining uncensored just before its event time.
+      Default "harrell".
+    - tau (float, optional): Truncation time; only events at or before
+      `tau` count as cases. Recommended for Uno's C.
+
+    Rows with a missing value in any input are dropped.
+
+    Returns:
+    - float: The C-index, or NaN if no pair is comparable.
+    """
+    from ._survival import censoring_weights, concordance
+
+    if method not in ("harrell", "uno"):
+        raise ValueError("method must be 'harrell' or 'uno'.")
+    duration, event, risk = _survival_arrays(duration, event, risk)
+    weights = None
+    if method == "uno":
+        weights = censoring_weights(duration, event) ** 2
+        weights[np.isnan(weights)] = 0.0
+    return concordance(duration, event, risk, tau=tau, weights=weights)[0]
+
+
+def time_dependent_auc(duration, event, risk, times):
+    """
+    Cumulative/dynamic time-dependent AUC.
+
+    At each time t, cases are patients with the event at or before t and
+    controls are patients still under follow-up after t. Cases are weighted
+    by the inverse probability of remaining uncensored (Kaplan-Meier
+    censoring curve), so the estimate accounts for right-censoring.
+
+    Parameters:
+    - duration (array-like): Follow-up time to event or censoring.
+    - event (array-like): 1 if the event was observed, 0 if censored.
+    - risk (array-like): Predicted risk; higher means an earlier event.
+    - times (float or array-like): Horizon(s), in the units of `duration`.
+
+    Returns:
+    - float or np.ndarray: AUC at each time (NaN where there are no cases or
+      no controls).
+    """
+    from ._survival import censoring_weights, cumulative_dynamic_auc
+
+    duration, event, risk = _survival_arrays(duration, event, risk)
+    weights = censoring_weights(duration, event)
+    weights[np.isnan(weights)] = 0.0
+    aucs = np.array(
+        [
+            cumulative_dynamic_auc(duration, event, risk, t, weights)
+            for t in np.atleast_1d(times)
+        ]
+    )
+    return float(aucs[0]) if np.ndim(times) == 0 else aucs
+
+
+def eval_kfre_survival_metrics(
+    df,
+    n_var_list,
+    duration_col,
+    event_col,
+    outcome_years=(2, 5),
+    duration_unit="days",
+    decimal_places=6,
+):
+    """
+    Calculate censoring-aware discrimination metrics for KFRE predictions.
+
+    Uses the follow-up duration and event indicator directly (the columns
+    `class_esrd_outcome` consumes) instead of a fixed-horizon label. For each
+    ``kfre_{n}var_{y}year`` column, Harrell's and Uno's C-index are computed
+    with follow-up truncated at the ``y``-year horizon, together with the
+    cumulative/dynamic time-dependent AUC at ``y`` years.
+
+    Parameters:
+    ----------
+    df : pd.DataFrame
+        DataFrame holding the predictions, durations and events.
+    n_var_list : list of int
+        Models to evaluate, any of 4, 6 and 8.
+    duration_col : str
+        Follow-up time to event or censoring.
+    event_col : str
+        1 if the kidney-failure event was observed, 0 if censored.
+    outcome_years : list, tuple, or int, optional
+        Horizons to evaluate, 2 and/or 5. Default is (2, 5).
+    duration_unit : str, optional
+        "days" (converted with 365.25 days per year, as in
+        `class_esrd_outcome`) or "years". Default is "days".
+    decimal_places : int, optional
+        Number of decimal places for the calculated metrics. Default is 6.
+
+    Returns:
+    -------
+    pd.DataFrame
+        Rows "Harrell's C", "Uno's C" and "Time-Dependent AUC", one column
+        per available prediction column, laid out like `eval_kfre_metrics`.
+    """
+    if duration_unit not in ("days", "years"):
+        raise ValueError("duration_unit must be 'days' or 'years'.")
+    years = _eval_years(n_var_list, outcome_years)
+    duration = as_float(df[duration_col])
+    if duration_unit == "days":
+        duration = duration / 365.25
+
+    table = {}
+    for n_var in n_var_list:
+        for year in years:
+            col = f"kfre_{n_var}var_{year}year"
+            if col not in df.columns:
+                continue
+            risk = df[col]
+            table[f"{year}_year_{n_var}_var_kfre"] = [
+                concordance_index(duration, df[event_col], risk, tau=year),
+                concordance_index(duration, df[event_col], risk, "uno", tau=year),
+                time_dependent_auc(duration, df[event_col], risk, year),
+            ]
+
+    index = ["Harrell's C", "Uno's C", "Time-Dependent AUC"]
+    metrics_df = pd.DataFrame(table, index=index, dtype=float)
+    metrics_df = metrics_df.round(decimal_places).rename_axis("Metrics")
+    return metrics_df.rename_axis("Outcome", axis=1)
+
+
+################################################################################
+############################### Competing Risks ################################
+################################################################################
+
+
+def cumulative_incidence(duration, event, times, cause=1, group=None):
+    """
+    Aalen-Johansen cumulative incidence under competing risks.
+
+    Unlike the naive share of patients with the event, the estimate treats
+    competing events (e.g. death before kidney failure) as removing the
+    patient from risk rather than as censoring or as event-free follow-up,
+    so it is the observed risk a KFRE prediction should be compared with.
+
+    Parameters:
+    - duration (array-like): Follow-up time to first event or censoring.
+    - event (array-like): Event type code per patient: 0 if censored,
+      `cause` for the event of interest (e.g. 1 for kidney failure), any
+      other value for a competing event (e.g. 2 for death).
+    - times (float or array-like): Time(s) at which to evaluate, in the
+      units of `duration`.
+    - cause (int): Event code of interest. Default 1.
+    - group (array-like, optional): Group label per patient (e.g. a risk
+      bin or subgroup). All groups are estimated together from one sort.
+
+    Rows with a missing duration, event or group are dropped.
+
+    Returns:
+    - float, np.ndarray, or pd.DataFrame: The cumulative incidence at each
+      time; with `group`, a DataFrame indexed by group with one column per
+      time.
+    """
+    from ._survival import aalen_johansen
+
+    duration = as_float(duration)
+    event = as_float(event)
+    keep = ~(np.isnan(duration) | np.isnan(event))
+    if group is not None:
+        group = pd.Series(np.asarray(group))
+        keep &= group.notna().to_numpy()
+        codes, labels = pd.factorize(group[keep], sort=True)
+        cif = aalen_johansen(duration[keep], event[keep], times, cause, codes)
+        return pd.DataFrame(cif, index=labels, columns=np.atleast_1d(times))
+    cif = aalen_johansen(duration[keep], event[keep], times, cause)[0]
+    return float(cif[0]) if np.ndim(times) == 0 else cif
+
+
+def kfre_cumulative_incidence_table(
+    df,
+    n_var_list,
+    duration_col,
+    event_col,
+    outcome_years=(2, 5),
+    bins=10,
+    cause=1,
+    duration_unit="days",
+    decimal_places=6,
+):
+    """
+    Competing-risk observed vs. predicted risk by bin of predicted risk.
+
+    For every ``kfre_{n}var_{y}year`` column, patients are binned by
+    predicted risk and the observed risk of each bin is the Aalen-Johansen
+    cumulative incidence of kidney failure at ``y`` years, with death (or
+    any other non-zero event code) as a competing event. All bins of a
+    column are estimated from one sort.
+
+    Parameters:
+    ----------
+    df : pd.DataFrame
+        DataFrame holding the predictions, durations and event codes.
+    n_var_list : list of int
+        Models to evaluate, any of 4, 6 and 8.
+    duration_col : str
+        Follow-up time to first event or censoring.
+    event_col : str
+        Event type code: 0 censored, `cause` for kidney failure, any other
+        value for a competing event such as death.
+    outcome_years : list, tuple, or int, optional
+        Horizons to evaluate, 2 and/or 5. Default is (2, 5).
+    bins : int or array-like, optional
+        Number of quantile bins of the predicted risk, or explicit bin
+        edges (as for `kfre_calibration_table`). ``bins=1`` gives the
+        overall comparison. Default is 10.
+    cause : int, optional
+        Event code of kidney failure. Default is 1.
+    duration_unit : str, optional
+        "days" (converted with 365.25 days per year) or "years". Default
+        is "days".
+    decimal_places : int, optional
+        Number of decimal places. Default is 6.
+
+    Returns:
+    -------
+    pd.DataFrame
+        One row per (outcome column, bin) with columns "Outcome", "Bin",
+        "Lower", "Upper", "N", "Observed Risk", "Mean Predicted" and
+        "O/E Ratio". Empty bins have NaN risks.
+    """
+    from ._calibration import CalibrationBins
+    from ._survival import aalen_johansen
+
+    if duration_unit not in ("days", "years"):
+        raise ValueError("duration_unit must be 'days' or 'years'.")
+    years = _eval_years(n_var_list, outcome_years)
+    duration = as_float(df[duration_col])
+    if duration_unit == "days":
+        duration = duration / 365.25
+    event = as_float(df[event_col])
+    known = ~(np.isnan(duration) | np.isnan(event))
+
+    tables = []
+    for n_var in n_var_list:
+        for year in years:
+            col = f"kfre_{n_var}var_{year}year"
+            if col not in df.columns:
+                continue
+            scores = as_float(df[col])
+            keep = known & ~np.isnan(scores)
+            scores = scores[keep]
+            if np.ndim(bins) == 0:
+                calib = CalibrationBins.from_quantiles(scores, int(bins))
+            else:
+                calib = CalibrationBins(bins)
+            group = calib.bin_index(scores)
+
+            n = np.bincount(group, minlength=calib.n_bins)
+            observed = np.full(calib.n_bins, np.nan)
+            cif = aalen_johansen(duration[keep], event[keep], year, cause, group)
+            observed[: cif.shape[0]] = cif[:, 0]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                predicted = np.bincount(group, scores, calib.n_bins) / n
+                tables.append(
+                    pd.DataFrame(
+                        {
+                            "Outcome": f"{year}_year_{n_var}_var_kfre",
+                            "Bin": np.arange(1, calib.n_bins + 1),
+                            "Lower": calib.edges[:-1],
+                            "Upper": calib.edges[1:],
+                            "N": n,
+                            "Observed Risk": observed,
+                            "Mean Predicted": predicted,
+                            "O/E Ratio": observed / predicted,
+                        }
+                    )
+                )
+
+    if not tables:
+        return pd.DataFrame()
+    table = pd.concat(tables, ignore_index=True)
+    numeric = ["Lower", "Upper", "Observed Risk", "Mean Predicted", "O/E Ratio"]
+    return table.round({c: decimal_places for c in numeric})
+
+
+################################################################################
+############################# Calibration Metrics ##############################
+################################################################################
+
+
+def _calibration_bins(labels, scores, bins, weight=None):
+    """Filled CalibrationBins for one column; `bins` is a count or edges."""
+    from ._calibration import CalibrationBins
+
+    if np.ndim(bins) == 0:
+        scores = np.asarray(scores, dtype=float)
+        used = scores if weight is None else scores[weight > 0]
+        calib = CalibrationBins.from_quantiles(used, int(bins))
+    else:
+        calib = CalibrationBins(bins)
+    return calib.update(labels, scores, sample_weight=weight)
+
+
+def eval_kfre_calibration(
+    df,
+    n_var_list,
+    outcome_years=2,
+    bins=10,
+    decimal_places=6,
+    sample_weight=None,
+):
+    """
+    Calculate calibration metrics for KFRE predictions.
+
+    For every ``kfre_{n}var_{y}year`` column this reports observed and
+    expected events, their ratio, the calibration intercept
+    (calibration-in-the-large) and slope, and the expected calibration error.
+
+    Parameters:
+    ----------
+    df : pd.DataFrame
+        DataFrame holding the ``kfre_*`` predictions and the
+        ``*_year_outcome`` columns (as for `eval_kfre_metrics`).
+    n_var_list : list of int
+        Models to evaluate, any of 4, 6 and 8.
+    outcome_years : list, tuple, or int, optional
+        Horizons to evaluate, 2 and/or 5. Default is 2.
+    bins : int or array-like, optional
+        Number of quantile bins of the predicted risk (10 gives deciles), or
+        explicit bin edges. Use fixed edges when results from several
+        chunks or sites will be combined. Default is 10.
+    decimal_places : int, optional
+        Number of decimal places for the calculated metrics. Default is 6.
+    sample_weight : str, array-like, or dict, optional
+        Row weights, e.g. from `ipcw_weights`, given as for
+        `eval_kfre_metrics`. Counts, events and the logistic fits are then
+        weighted; rows with zero weight are ignored.
+
+    Returns:
+    -------
+    pd.DataFrame
+        Metrics as rows and one column per outcome, laid out like
+        `eval_kfre_metrics`.
+
+    Notes:
+    -----
+    - Rows with a missing outcome or prediction are dropped per column.
+    - O/E Ratio is total observed over total expected (summed predicted
+      risk) events; above 1 means risk is underestimated.
+    - Calibration Intercept is the intercept of a logistic model of the
+      outcome with the logit of the predicted risk as an offset; Calibration
+      Slope is the coefficient of that logit when it is fitted freely. Ideal
+      values are 0 and 1. Both come from a vectorized Newton-Raphson fit and
+      are NaN when the outcome has a single class.
+    - ECE (expected calibration error) is the count-weighted mean absolute
+      difference between observed rate and mean predicted risk per bin.
+    """
+    from ._calibration import calibration_fit
+
+    outcomes, y_true, preds_n_var_dict = _eval_inputs(df, n_var_list, outcome_years)
+
+    table = {}
+    for n_var, preds in preds_n_var_dict.items():
+        for outcome, labels, scores in zip(outcomes, y_true, preds):
+            if scores is None:
+                continue
+            labels = as_float(labels)
+            scores = np.asarray(scores, dtype=float)
+            weight = _horizon_weight(df, sample_weight, outcome)
+            keep = ~(np.isnan(labels) | np.isnan(scores))
+            if weight is not None:
+                keep &= ~np.isnan(weight) & (weight != 0)
+                weight = weight[keep]
+            labels, scores = labels[keep], scores[keep]
+
+            calib = _calibration_bins(labels, scores, bins, weight)
+            intercept, slope = calibration_fit(labels, scores, weight)
+            table[f"{outcome}_{n_var}_var_kfre"] = [
+                calib.observed.sum(),
+                calib.expected.sum(),
+                calib.oe_ratio(),
+                intercept,
+                slope,
+                calib.ece(),
+            ]
+
+    index = [
+        "Observed Events",
+        "Expected Events",
+        "O/E Ratio",
+        "Calibration Intercept",
+        "Calibration Slope",
+        "ECE",
+    ]
+    metrics_df = pd.DataFrame(table, index=index, dtype=float)
+    metrics_df = metrics_df.round(decimal_places).rename_axis("Metrics")
+    return metrics_df.rename_axis("Outcome", axis=1)
+
+
+def kfre_calibration_table(
+    df,
+    n_var_list,
+    outcome_years=2,
+    bins=10,
+    decimal_places=6,
+    sample_weight=None,
+):
+    """
+    Binned calibration table (e.g. by decile of predicted risk).
+
+    Parameters match `eval_kfre_calibration`.
+
+    Returns:
+    -------
+    pd.DataFrame
+        One row per (outcome column, bin) with columns "Outcome", "Bin",
+        "Lower", "Upper", "N", "Observed", "Expected", "Observed Rate",
+        "Mean Predicted" and "O/E Ratio". Empty bins (from tied quantiles)
+        have NaN rates. With `sample_weight`, "N", "Observed" and "Expected"
+        are weighted sums.
+
+    Notes:
+    -----
+    The per-bin counts are sums, so tables computed with the same explicit
+    ``bins`` edges on separate chunks or sites can be combined by adding
+    "N", "Observed" and "Expected" per bin (see `kfre.CalibrationBins`).
+    """
+    outcomes, y_true, preds_n_var_dict = _eval_inputs(df, n_var_list, outcome_years)
+
+    tables = []
+    for n_var, preds in preds_n_var_dict.items():
+        for outcome, labels, scores in zip(outcomes, y_true, preds):
+            if scores is None:
+                continue
+            weight = _horizon_weight(df, sample_weight, outcome)
+            calib = _calibration_bins(labels, scores, bins, weight)
+            table = calib.table()
+            table.insert(0, "Outcome", f"{outcome}_{n_var}_var_kfre")
+            tables.append(table)
+
+    if not tables:
+        return pd.DataFrame()
+    table = pd.concat(tables, ignore_index=True)
+    numeric = table.columns.drop(["Outcome", "Bin", "N"])
+    return table.round({c: decimal_places for c in numeric})
+
+
 ################################################################################
 ############################ Bootstrap Metric CI ###############################
 ################################################################################
@@ -722,6 +1631,7 @@ def bootstrap_metric_ci(
     threshold=0.5,
     seed=None,
     progress=True,
+    n_jobs=None,
 ):
     """
     Estimate a bootstrap confidence interval for a performance metric.
@@ -743,6 +1653,20 @@ def bootstrap_metric_ci(
     - ci (float): Confidence level as a percentage (e.g. 95). Default 95.
     - threshold (float): Cutoff for threshold-based metrics. Default 0.5.
     - seed (int, optional): Seed for reproducibility.
+    - progress (bool): Show a tqdm progress bar if tqdm is installed.
+    - n_jobs (int, optional): Worker processes for the resamples (negative
+      values count back from the number of CPUs, e.g. -1 for all). Default
+      None scores serially with the resample stream of earlier releases.
+      Any integer switches to per-chunk seed streams spawned from
+      ``np.random.SeedSequence(seed)``, so a given seed gives identical
+      results for every integer ``n_jobs`` (1, 2, -1, ...), though not the
+      same resamples as ``n_jobs=None``.
+
+    Resamples are drawn and scored in memory-bounded blocks: AUC ROC and
+    average precision come from per-score class counts (rank statistics) and
+    the threshold metrics from confusion-matrix counts, one ``np.bincount``
+    per block, so no per-resample sorting or sklearn calls are involved.
+    A given seed draws the same resamples as earlier releases.
 
     Returns:
     - dict: {"metric": str, "point": float, "lower": float, "upper": float,
@@ -750,40 +1674,10 @@ def bootstrap_metric_ci(
       full sample and lower/upper are the CI bounds. Values are NaN if the metric
       cannot be computed on the full sample.
     """
-    import numpy as np
-    from sklearn.metrics import (
-        precision_score,
-        recall_score,
-        roc_auc_score,
-        average_precision_score,
-        brier_score_loss,
-    )
-
-    def _compute(yt, ys):
-        # Returns the metric value or np.nan if undefined for this sample.
-        classes = np.unique(yt)
-        if metric == "brier":
-            return brier_score_loss(yt, ys)
-        if metric in ("auc_roc", "average_precision"):
-            if classes.size < 2:
-                return np.nan
-            if metric == "auc_roc":
-                return roc_auc_score(yt, ys)
-            return average_precision_score(yt, ys)
-        # Threshold-based metrics
-        yp = (ys > threshold).astype(int)
-        if metric == "precision":
-            return precision_score(yt, yp, zero_division=0)
-        if metric == "sensitivity":
-            return recall_score(yt, yp, zero_division=0)
-        if metric == "specificity":
-            return recall_score(yt, yp, pos_label=0, zero_division=0)
-        raise ValueError(
-            f"Unknown metric {metric!r}. Choose from: precision, "
-            "average_precision, sensitivity, specificity, auc_roc, brier."
-        )
+    from ._bootstrap import bootstrap_values, percentile_ci, seed_source
+    from ._metrics import metric_values, prepare
 
-    y_true = np.asarray(y_true, dtype=float)
+    y_true = as_float(y_true)
     y_score = np.asarray(y_score, dtype=float)
 
     # Drop pairs with NaN in either array (e.g. censored outcomes).
@@ -791,40 +1685,122 @@ def bootstrap_metric_ci(
     y_true = y_true[keep].astype(int)
     y_score = y_score[keep]
 
-    point = _compute(y_true, y_score) if y_true.size else np.nan
-
-    rng = np.random.default_rng(seed)
+    codes, n_codes = prepare(metric, y_true, y_score, threshold)
     n = y_true.size
-    boot_vals = []
+    point = (
+        metric_values(metric, codes, n_codes, np.arange(n)[None, :])[0] if n else np.nan
+    )
+
+    source = seed_source(seed, n_jobs)
 
     # Single progress bar over all resamples for this call.
-    iterator = range(n_boot)
+    bar = None
     if progress:
         try:
             from tqdm import tqdm
 
-            iterator = tqdm(iterator, total=n_boot, desc=f"Bootstrapping {metric}")
+            bar = tqdm(total=n_boot, desc=f"Bootstrapping {metric}")
         except ImportError:
             print("tqdm not installed; proceeding without a progress bar.")
 
-    for _ in iterator:
-        idx = rng.integers(0, n, size=n)
-        val = _compute(y_true[idx], y_score[idx])
-        if not np.isnan(val):
-            boot_vals.append(val)
+    try:
+        values = bootstrap_values(
+            metric, codes, n_codes, n, n_boot, source, n_jobs, bar
+        )
+    finally:
+        if bar is not None:
+            bar.close()
+    lower, upper, n_valid = percentile_ci(values, ci)
 
-    if boot_vals:
-        alpha = (100 - ci) / 2
-        lower = float(np.percentile(boot_vals, alpha))
-        upper = float(np.percentile(boot_vals, 100 - alpha))
-    else:
-        lower = upper = np.nan
+    return {
+        "metric": metric,
+        "point": float(point) if not np.isnan(point) else np.nan,
+        "lower": lower,
+        "upper": upper,
+        "ci": float(ci),
+        "n_boot_valid": n_valid,
+    }
+
+
+def bootstrap_metric_ci_stream(
+    data,
+    metric="auc_roc",
+    n_boot=1000,
+    ci=95,
+    threshold=0.5,
+    seed=None,
+    columns=None,
+    chunksize=100_000,
+    n_bins=1000,
+):
+    """
+    Bootstrap confidence interval in one streaming pass over the data.
+
+    For cohorts too large to resample in memory. Each row gets an independent
+    Poisson(1) weight per replicate, generated chunk by chunk, and every
+    replicate accumulates only the weighted sufficient statistics of the
+    metric: per-class score histograms for AUC ROC / average precision,
+    confusion-matrix counts for the threshold metrics, and squared-error sums
+    for the Brier score. Memory is proportional to ``n_boot x n_bins``, not
+    to the number of rows.
+
+    Parameters:
+    - data (str, path-like, or iterable): A CSV or Parquet file (requires
+      ``columns``), or an iterable of ``(y_true, y_score)`` array pairs, one
+      per chunk. NaN pairs are dropped.
+    - metric (str): One of "precision", "average_precision", "sensitivity",
+      "specificity", "auc_roc", "brier".
+    - n_boot (int): Number of bootstrap replicates. Default 1000.
+    - ci (float): Confidence level as a percentage (e.g. 95). Default 95.
+    - threshold (float): Cutoff for threshold-based metrics. Default 0.5.
+    - seed (int, optional): Seed for reproducibility. For a given seed the
+      result does not depend on how the rows are chunked (up to floating-point
+      summation order for the Brier score).
+    - columns (tuple, optional): ``(y_true_col, y_score_col)`` to read when
+      ``data`` is a file.
+    - chunksize (int): Rows per chunk when reading a file. Default 100,000.
+    - n_bins (int): Equal-width score bins over [0, 1] for AUC ROC and
+      average precision. Threshold metrics and the Brier score are exact.
+
+    Returns:
+    - dict: Same keys as ``bootstrap_metric_ci``.
+
+    Notes:
+    - Poisson weights approximate multinomial resampling; the intervals agree
+      with ``bootstrap_metric_ci`` up to Monte Carlo error, but not draw for
+      draw.
+    - Binned AUC ROC treats scores sharing a bin as tied. With the default
+      1,000 bins on [0, 1] this changes AUC by at most half the share of
+      (event, non-event) pairs falling in the same bin.
+    """
+    import os
+
+    from ._bootstrap import PoissonBootstrap, percentile_ci
+
+    if isinstance(data, (str, os.PathLike)):
+        from ._io import iter_chunks
+
+        if columns is None or len(columns) != 2:
+            raise ValueError(
+                "columns must be (y_true_col, y_score_col) when data is a file."
+            )
+        y_col, score_col = columns
+        data = (
+            (chunk[y_col], chunk[score_col])
+            for chunk in iter_chunks(data, list(columns), chunksize)
+        )
+
+    boot = PoissonBootstrap(metric, n_boot, seed, threshold, n_bins)
+    for y_true, y_score in data:
+        boot.update(y_true, y_score)
 
+    point, values = boot.values()
+    lower, upper, n_valid = percentile_ci(values, ci)
     return {
         "metric": metric,
         "point": float(point) if not np.isnan(point) else np.nan,
         "lower": lower,
         "upper": upper,
         "ci": float(ci),
-        "n_boot_valid": len(boot_vals),
+        "n_boot_valid": n_valid,
     }
@@ -44,3 +44,49 @@ def test_add_kfre_risk_col_4var_2year():
     val = out["kfre_4var_2year"].iloc[0]
     assert isinstance(val, float)
     assert 0 <= val <= 1
+
+
+def test_add_kfre_risk_col_fused_matches_predict_kfre():
+    # All model/horizon columns come from one fused pass; each must match the
+    # single-model predict_kfre result.
+    import numpy as np
+    from kfre import predict_kfre
+
+    df = pd.concat([sample_for_risk()] * 3, ignore_index=True)
+    df["SEX"] = ["Male", "female", "unknown"]
+    df["Age"] = [50, 64, 71]
+    cols = {
+        "age": "Age",
+        "sex": "SEX",
+        "eGFR": "eGFR-EPI",
+        "uACR": "uACR",
+        "dm": "Diabetes (1=yes; 0=no)",
+        "htn": "Hypertension (1=yes; 0=no)",
+        "albumin": "Albumin_g_dl",
+        "phosphorous": "Phosphate_mg_dl",
+        "bicarbonate": "Bicarbonate (mmol/L)",
+        "calcium": "Calcium_mg_dl",
+    }
+    out = add_kfre_risk_col(
+        df,
+        **{f"{k}_col": v for k, v in cols.items()},
+        num_vars="all",
+        years="all",
+        is_north_american=False,
+    )
+    for n in (4, 6, 8):
+        for year in (2, 5):
+            expected = predict_kfre(
+                df,
+                cols,
+                years=year,
+                is_north_american=False,
+                use_extra_vars=True,
+                num_vars=n,
+            )
+            np.testing.assert_allclose(
+                out[f"kfre_{n}var_{year}year"].to_numpy(),
+                expected.to_numpy(),
+                rtol=1e-12,
+            )
+    assert out["kfre_8var_5year"].isna().tolist() == [False, False, True]
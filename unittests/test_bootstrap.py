@@ -58,3 +58,102 @@ class TestBootstrapMetricCI:
             bootstrap_metric_ci(yt_l, ys_l, "auc_roc", n_boot=300, seed=5)
         )
         assert w_large < w_small
+
+
+def _reference_ci(y_true, y_score, metric, n_boot, seed, threshold=0.5):
+    # The original one-resample-at-a-time sklearn loop.
+    from sklearn.metrics import (
+        average_precision_score,
+        brier_score_loss,
+        precision_score,
+        recall_score,
+        roc_auc_score,
+    )
+
+    def compute(yt, ys):
+        if metric == "brier":
+            return brier_score_loss(yt, ys)
+        if metric in ("auc_roc", "average_precision"):
+            if np.unique(yt).size < 2:
+                return np.nan
+            fn = roc_auc_score if metric == "auc_roc" else average_precision_score
+            return fn(yt, ys)
+        yp = (ys > threshold).astype(int)
+        if metric == "precision":
+            return precision_score(yt, yp, zero_division=0)
+        if metric == "sensitivity":
+            return recall_score(yt, yp, zero_division=0)
+        return recall_score(yt, yp, pos_label=0, zero_division=0)
+
+    rng = np.random.default_rng(seed)
+    n = y_true.size
+    vals = [
+        compute(y_true[i], y_score[i])
+        for i in (rng.integers(0, n, n) for _ in range(n_boot))
+    ]
+    vals = np.array([v for v in vals if not np.isnan(v)])
+    return (
+        compute(y_true, y_score),
+        np.percentile(vals, 2.5),
+        np.percentile(vals, 97.5),
+        vals.size,
+    )
+
+
+@pytest.mark.parametrize(
+    "metric",
+    [
+        "auc_roc",
+        "average_precision",
+        "precision",
+        "sensitivity",
+        "specificity",
+        "brier",
+    ],
+)
+@pytest.mark.parametrize("n", [31, 250])
+def test_matches_resample_loop_for_fixed_seed(metric, n):
+    # Rounded scores create ties; small n makes single-class resamples likely.
+    rng = np.random.default_rng(n)
+    y_true = (rng.random(n) < 0.1).astype(int)
+    y_score = np.round(np.clip(0.2 + 0.4 * y_true + rng.normal(0, 0.2, n), 0, 1), 1)
+    r = bootstrap_metric_ci(
+        y_true, y_score, metric, n_boot=150, seed=11, progress=False
+    )
+    point, lower, upper, n_valid = _reference_ci(y_true, y_score, metric, 150, 11)
+    assert r["n_boot_valid"] == n_valid
+    np.testing.assert_allclose(
+        [r["point"], r["lower"], r["upper"]], [point, lower, upper], rtol=1e-12
+    )
+
+
+def test_resamples_span_several_blocks(monkeypatch):
+    from kfre import _bootstrap
+
+    y_true, y_score = _data()
+    full = bootstrap_metric_ci(
+        y_true, y_score, "auc_roc", n_boot=50, seed=2, progress=False
+    )
+    monkeypatch.setattr(_bootstrap, "BLOCK_ELEMENTS", 3 * y_true.size)
+    blocked = bootstrap_metric_ci(
+        y_true, y_score, "auc_roc", n_boot=50, seed=2, progress=False
+    )
+    assert blocked == full
+
+
+def test_n_jobs_results_do_not_depend_on_worker_count():
+    y_true, y_score = _data(n=300)
+    runs = [
+        bootstrap_metric_ci(
+            y_true, y_score, "auc_roc", n_boot=600, seed=4, progress=False, n_jobs=j
+        )
+        for j in (1, 2, 3)
+    ]
+    assert runs[0] == runs[1] == runs[2]
+    assert runs[0]["n_boot_valid"] == 600
+
+
+def test_n_jobs_zero_raises():
+    y_true, y_score = _data()
+    with pytest.raises(ValueError):
+        bootstrap_metric_ci(y_true, y_score, n_boot=10, progress=False, n_jobs=0)
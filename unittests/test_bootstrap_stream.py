@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+from kfre import bootstrap_metric_ci, bootstrap_metric_ci_stream
+
+
+def _data(n=4000, seed=0):
+    rng = np.random.default_rng(seed)
+    y_true = (rng.random(n) < 0.15).astype(int)
+    y_score = np.clip(0.1 + 0.3 * y_true + rng.normal(0, 0.2, n), 0, 1)
+    return y_true, y_score
+
+
+def _chunks(y_true, y_score, size):
+    return [
+        (y_true[i : i + size], y_score[i : i + size])
+        for i in range(0, len(y_true), size)
+    ]
+
+
+@pytest.mark.parametrize("metric", ["auc_roc", "average_precision", "specificity"])
+def test_result_does_not_depend_on_chunking(metric):
+    y_true, y_score = _data()
+    a = bootstrap_metric_ci_stream(_chunks(y_true, y_score, 333), metric, 200, seed=3)
+    b = bootstrap_metric_ci_stream([(y_true, y_score)], metric, 200, seed=3)
+    assert a == b
+
+
+@pytest.mark.parametrize("metric", ["precision", "sensitivity", "specificity", "brier"])
+def test_exact_point_and_comparable_interval(metric):
+    y_true, y_score = _data()
+    stream = bootstrap_metric_ci_stream(
+        _chunks(y_true, y_score, 1000), metric, 400, seed=1
+    )
+    exact = bootstrap_metric_ci(
+        y_true, y_score, metric, n_boot=400, seed=1, progress=False
+    )
+    assert stream["point"] == pytest.approx(exact["point"], rel=1e-12)
+    width = exact["upper"] - exact["lower"]
+    assert stream["lower"] == pytest.approx(exact["lower"], abs=0.25 * width)
+    assert stream["upper"] == pytest.approx(exact["upper"], abs=0.25 * width)
+
+
+def test_binned_auc_is_close_to_exact():
+    y_true, y_score = _data()
+    stream = bootstrap_metric_ci_stream([(y_true, y_score)], "auc_roc", 50, seed=0)
+    exact = bootstrap_metric_ci(y_true, y_score, "auc_roc", n_boot=1, progress=False)
+    assert abs(stream["point"] - exact["point"]) < 1e-3
+    assert stream["lower"] <= stream["point"] <= stream["upper"]
+
+
+def test_reads_csv_in_chunks(tmp_path):
+    y_true, y_score = _data(n=500)
+    path = tmp_path / "scores.csv"
+    y_nan = y_true.astype(float)
+    y_nan[:5] = np.nan
+    pd.DataFrame({"y": y_nan, "risk": y_score}).to_csv(path, index=False)
+    from_file = bootstrap_metric_ci_stream(
+        path, "auc_roc", 100, seed=2, columns=("y", "risk"), chunksize=64
+    )
+    in_memory = bootstrap_metric_ci_stream(
+        [(y_true[5:], y_score[5:])], "auc_roc", 100, seed=2
+    )
+    assert from_file == in_memory
+
+
+def test_file_requires_columns(tmp_path):
+    with pytest.raises(ValueError):
+        bootstrap_metric_ci_stream(tmp_path / "scores.csv", "auc_roc", 10)
+
+
+def test_unknown_metric_raises():
+    with pytest.raises(ValueError):
+        bootstrap_metric_ci_stream([], metric="f1")
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kfre import CalibrationBins, eval_kfre_calibration, kfre_calibration_table
+from kfre._calibration import calibration_fit
+
+
+def _cohort(n=5000, scale=1.0, seed=0):
+    rng = np.random.default_rng(seed)
+    risk = rng.beta(1, 8, n)
+    outcome = (rng.random(n) < np.clip(risk * scale, 0, 1)).astype(float)
+    return pd.DataFrame({"2_year_outcome": outcome, "kfre_4var_2year": risk})
+
+
+def test_summary_values():
+    df = _cohort(scale=1.3)
+    table = eval_kfre_calibration(df, [4], [2], decimal_places=12)
+    col = table["2_year_4_var_kfre"]
+    assert col["Observed Events"] == df["2_year_outcome"].sum()
+    assert col["Expected Events"] == pytest.approx(df["kfre_4var_2year"].sum())
+    assert col["O/E Ratio"] == pytest.approx(
+        df["2_year_outcome"].sum() / df["kfre_4var_2year"].sum()
+    )
+    assert col["O/E Ratio"] > 1.1  # risk is underestimated by construction
+    assert col["Calibration Intercept"] > 0
+
+
+def test_calibration_fit_matches_unpenalized_logistic_regression():
+    from sklearn.linear_model import LogisticRegression
+
+    df = _cohort()
+    y = df["2_year_outcome"].to_numpy()
+    p = df["kfre_4var_2year"].to_numpy()
+    _, slope = calibration_fit(y, p)
+    lp = np.log(p / (1 - p))[:, None]
+    ref = LogisticRegression(C=np.inf, tol=1e-12, max_iter=1000).fit(lp, y)
+    assert slope == pytest.approx(ref.coef_[0, 0], rel=1e-5)
+
+
+def test_calibration_fit_single_class_is_nan():
+    intercept, slope = calibration_fit(np.zeros(10), np.full(10, 0.2))
+    assert np.isnan(intercept) and np.isnan(slope)
+
+
+def test_decile_table_and_ece():
+    df = _cohort()
+    table = kfre_calibration_table(df, [4], [2], decimal_places=12)
+    assert list(table["Bin"]) == list(range(1, 11))
+    assert table["N"].sum() == len(df)
+    assert (table["N"] == len(df) / 10).all()
+    ece = (table["Observed"] - table["Expected"]).abs().sum() / len(df)
+    summary = eval_kfre_calibration(df, [4], [2], decimal_places=12)
+    assert summary.loc["ECE", "2_year_4_var_kfre"] == pytest.approx(ece)
+
+
+def test_bins_merge_across_chunks():
+    df = _cohort()
+    edges = np.linspace(0, 1, 21)
+    whole = CalibrationBins(edges).update(df["2_year_outcome"], df["kfre_4var_2year"])
+    parts = [
+        CalibrationBins(edges).update(chunk["2_year_outcome"], chunk["kfre_4var_2year"])
+        for chunk in (df.iloc[:1500], df.iloc[1500:4000], df.iloc[4000:])
+    ]
+    merged = parts[0] + parts[1] + parts[2]
+    np.testing.assert_allclose(merged.n, whole.n)
+    np.testing.assert_allclose(merged.observed, whole.observed)
+    np.testing.assert_allclose(merged.expected, whole.expected)
+    assert merged.ece() == pytest.approx(whole.ece())
+    with pytest.raises(ValueError, match="identical edges"):
+        merged.merge(CalibrationBins(np.linspace(0, 1, 11)))
+
+
+def test_fixed_edges_and_missing_rows():
+    df = _cohort()
+    df.loc[:99, "kfre_4var_2year"] = np.nan
+    table = kfre_calibration_table(df, [4], [2], bins=[0, 0.05, 0.1, 1])
+    assert list(table["Upper"]) == [0.05, 0.1, 1]
+    assert table["N"].sum() == len(df) - 100
+
+
+def test_calibration_fit_separated_outcome_warns_and_is_nan():
+    p = np.linspace(0.01, 0.99, 200)
+    y = (p > 0.5).astype(float)
+    with pytest.warns(RuntimeWarning, match="did not converge"):
+        intercept, slope = calibration_fit(y, p)
+    assert np.isnan(slope)
+    assert np.isfinite(intercept)  # slope fixed at 1: not separated
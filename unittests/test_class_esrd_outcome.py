@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from kfre import class_esrd_outcome
 
@@ -22,3 +23,46 @@ def test_class_esrd_outcome_column_created():
     # values match ESRD flag when follow-up >= years
     assert out.loc[0, "2_year_outcome"] == 0
     assert out.loc[1, "2_year_outcome"] == 1
+
+
+def test_censored_int8_outcomes_feed_evaluators():
+    """Int8 outcomes with <NA> (censor_incomplete=True) go straight in."""
+    from kfre import (
+        bootstrap_metric_ci,
+        eval_kfre_calibration,
+        eval_kfre_metrics,
+        eval_kfre_operating_points,
+        eval_kfre_subgroup_metrics,
+        ipcw_weights,
+        kfre_calibration_table,
+    )
+
+    rng = np.random.default_rng(0)
+    n = 400
+    risk = rng.beta(1, 5, n)
+    df = pd.DataFrame(
+        {
+            "event": (rng.random(n) < 2 * risk).astype(int),
+            "days": rng.uniform(100, 3000, n),
+            "site": rng.choice(["a", "b"], n),
+            "kfre_4var_2year": risk,
+            "kfre_4var_5year": np.clip(2 * risk, 0, 1),
+        }
+    )
+    class_esrd_outcome(df, "event", [2, 5], "days", censor_incomplete=True)
+    assert df["2_year_outcome"].dtype == "Int8"
+    assert df["2_year_outcome"].isna().any()
+
+    weights = ipcw_weights(df, "event", [2, 5], "days")
+    by_year = {2: weights["2_year_ipcw"], 5: weights["5_year_ipcw"]}
+    metrics = eval_kfre_metrics(df, [4], [2, 5], sample_weight=by_year)
+    assert metrics.notna().all().all()
+    assert eval_kfre_metrics(df, [4], 2, ci=95, n_boot=20, seed=0).shape == (6, 3)
+    assert eval_kfre_operating_points(df, [4], [2, 5]).notna().any().any()
+    assert eval_kfre_calibration(df, [4], [2, 5], sample_weight=by_year).shape[1] == 2
+    assert len(kfre_calibration_table(df, [4], 2))
+    assert len(eval_kfre_subgroup_metrics(df, [4], "site", [2, 5])) == 2 * 2 * 6
+    ci = bootstrap_metric_ci(
+        df["2_year_outcome"], df["kfre_4var_2year"], "auc_roc", n_boot=20, seed=0
+    )
+    assert np.isfinite(ci["point"])
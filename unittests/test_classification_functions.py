@@ -1,4 +1,5 @@
 import pandas as pd
+import pytest
 from kfre import class_esrd_outcome, class_ckd_stages
 
 
@@ -71,3 +72,86 @@ def test_class_ckd_stages_only_stage_col():
     )
     assert out["stg"].iloc[0] == "CKD Stage 5"
     assert "combined" not in out.columns
+
+
+def test_class_ckd_stages_categorical_and_missing():
+    df = pd.DataFrame({"eG": [90, 89.99, 59.9, None]})
+    out = class_ckd_stages(df, egfr_col="eG", stage_col="stage", combined_stage_col="c")
+    assert isinstance(out["stage"].dtype, pd.CategoricalDtype)
+    assert out["stage"].cat.codes.dtype == "int8"
+    assert out["stage"].tolist() == [
+        "CKD Stage 1",
+        "CKD Stage 2",
+        "CKD Stage 3a",
+        "Not Classified",
+    ]
+    assert out["c"].tolist() == [
+        "Not Classified",
+        "Not Classified",
+        "CKD Stage 3 - 5",
+        "Not Classified",
+    ]
+
+
+def test_class_ckd_stages_albuminuria_and_kdigo_grid():
+    df = pd.DataFrame(
+        {
+            "eG": [95, 75, 50, 50, 35, 35, 20, 10, None, 95],
+            "uACR": [10, 30, 29.9, 300, 10, 300.1, 5, 5, 500, None],
+        }
+    )
+    out = class_ckd_stages(
+        df, egfr_col="eG", uacr_col="uACR", albuminuria_col="A", kdigo_col="risk"
+    )
+    assert out["A"].tolist() == [
+        "A1",
+        "A2",
+        "A1",
+        "A2",
+        "A1",
+        "A3",
+        "A1",
+        "A1",
+        "A3",
+        "Not Classified",
+    ]
+    assert out["risk"].tolist() == [
+        "Low Risk",
+        "Moderately Increased Risk",
+        "Moderately Increased Risk",
+        "High Risk",
+        "High Risk",
+        "Very High Risk",
+        "Very High Risk",
+        "Very High Risk",
+        "Not Classified",
+        "Not Classified",
+    ]
+    # Albuminuria alone does not need an eGFR column.
+    only_a = class_ckd_stages(df[["uACR"]].copy(), uacr_col="uACR", albuminuria_col="A")
+    assert list(only_a.columns) == ["uACR", "A"]
+    with pytest.raises(ValueError, match="uacr_col"):
+        class_ckd_stages(df, egfr_col="eG", kdigo_col="risk")
+
+
+def test_class_esrd_outcome_multiple_horizons_one_pass():
+    df = pd.DataFrame({"ev": [1, 0, 1, 0, None], "d": [400, 500, 1500, 2000, 3000]})
+    out = class_esrd_outcome(df, "ev", [2, 5], "d", censor_incomplete=True)
+    assert out["2_year_outcome"].dtype == "Int8"
+    assert out["2_year_outcome"].fillna(-1).tolist() == [1, -1, 0, 0, 0]
+    assert out["5_year_outcome"].fillna(-1).tolist() == [1, -1, 1, 0, 0]
+    for years in (2, 5):
+        single = class_esrd_outcome(
+            df[["ev", "d"]].copy(), "ev", years, "d", censor_incomplete=True
+        )
+        pd.testing.assert_series_equal(
+            single[f"{years}_year_outcome"], out[f"{years}_year_outcome"]
+        )
+
+
+def test_class_esrd_outcome_overwrites_in_place():
+    df = pd.DataFrame({"ev": [1, 0], "d": [1.5, 2.5], "2_year_outcome": [9, 9]})
+    df["other"] = 0
+    out = class_esrd_outcome(df, "ev", 2, "d", create_years_col=False)
+    assert list(out.columns) == ["ev", "d", "2_year_outcome", "other"]
+    assert out["2_year_outcome"].tolist() == [1, 0]
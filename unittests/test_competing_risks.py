@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kfre import cumulative_incidence, kfre_cumulative_incidence_table
+from kfre._survival import aalen_johansen, km_curve, step_value
+
+
+def _naive_cif(time, event, horizon, cause=1):
+    cif, surv = 0.0, 1.0
+    for t in np.unique(time):
+        if t > horizon:
+            break
+        at_risk = np.sum(time >= t)
+        died = np.sum((time == t) & (event != 0))
+        failed = np.sum((time == t) & (event == cause))
+        cif += surv * failed / at_risk
+        surv *= 1 - died / at_risk
+    return cif
+
+
+def _competing_data(n, seed):
+    rng = np.random.default_rng(seed)
+    time = rng.integers(1, 30, n).astype(float)
+    event = rng.choice([0, 1, 2], n, p=[0.5, 0.2, 0.3])
+    return time, event
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_grouped_matches_per_group_definition(seed):
+    time, event = _competing_data(1500, seed)
+    group = np.random.default_rng(seed).integers(0, 6, time.size)
+    horizons = [0.5, 4, 12.5, 29, 100]
+    cif = aalen_johansen(time, event, horizons, group=group)
+    expected = [
+        [_naive_cif(time[group == g], event[group == g], h) for h in horizons]
+        for g in range(6)
+    ]
+    np.testing.assert_allclose(cif, expected, atol=1e-12)
+    competing = aalen_johansen(time, event, horizons, cause=2, group=group)
+    assert competing[2, -1] == pytest.approx(
+        _naive_cif(time[group == 2], event[group == 2], 100, cause=2)
+    )
+
+
+def test_without_competing_events_equals_one_minus_km():
+    time, event = _competing_data(800, 5)
+    event = np.minimum(event, 1)
+    times, surv = km_curve(time, event)
+    assert cumulative_incidence(time, event, 10) == pytest.approx(
+        1 - step_value(times, surv, 10.0)
+    )
+
+
+def test_empty_group_is_nan():
+    time = np.array([1.0, 2.0, 2.0, 3.0])
+    event = np.array([1, 2, 1, 0])
+    group = np.array([0, 0, 0, 2])
+    cif = aalen_johansen(time, event, [1.5, 2, 5], group=group)
+    np.testing.assert_allclose(cif[0], [1 / 3, 2 / 3, 2 / 3])
+    assert np.isnan(cif[1]).all()
+    np.testing.assert_array_equal(cif[2], [0, 0, 0])
+
+
+def test_public_wrapper_groups_and_missing():
+    time, event = _competing_data(500, 1)
+    time[:5] = np.nan
+    labels = np.where(np.arange(500) % 2, "male", "female").astype(object)
+    labels[7] = None
+    table = cumulative_incidence(time, event, [5, 10], group=labels)
+    assert list(table.index) == ["female", "male"]
+    keep = ~np.isnan(time) & (labels != None)  # noqa: E711
+    male = keep & (labels == "male")
+    assert table.loc["male", 10] == pytest.approx(
+        _naive_cif(time[male], event[male], 10)
+    )
+    overall = cumulative_incidence(time, event, [5, 10])
+    assert overall.shape == (2,)
+
+
+def test_cumulative_incidence_table():
+    rng = np.random.default_rng(7)
+    n = 4000
+    risk = rng.beta(1, 8, n)
+    df = pd.DataFrame(
+        {
+            "kfre_4var_2year": risk,
+            "kfre_4var_5year": np.clip(2.5 * risk, 0, 1),
+            "years": rng.uniform(0.1, 7, n),
+            "code": rng.choice([0, 1, 2], n, p=[0.6, 0.15, 0.25]),
+        }
+    )
+    table = kfre_cumulative_incidence_table(
+        df, [4], "years", "code", bins=5, duration_unit="years"
+    )
+    assert list(table["Outcome"].unique()) == ["2_year_4_var_kfre", "5_year_4_var_kfre"]
+    assert list(table.columns) == [
+        "Outcome",
+        "Bin",
+        "Lower",
+        "Upper",
+        "N",
+        "Observed Risk",
+        "Mean Predicted",
+        "O/E Ratio",
+    ]
+    first = table[table["Outcome"] == "2_year_4_var_kfre"]
+    assert first["N"].sum() == n
+    bins = np.searchsorted(first["Upper"].to_numpy()[:-1], risk, side="right")
+    low = bins == 0
+    assert first["Observed Risk"].iloc[0] == pytest.approx(
+        _naive_cif(df["years"][low].to_numpy(), df["code"][low].to_numpy(), 2),
+        abs=1e-6,
+    )
+    overall = kfre_cumulative_incidence_table(
+        df, [4], "years", "code", 5, bins=1, duration_unit="years"
+    )
+    assert overall["Observed Risk"].iloc[0] == pytest.approx(
+        cumulative_incidence(df["years"], df["code"], 5), abs=1e-6
+    )
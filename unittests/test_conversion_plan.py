@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kfre import ConversionPlan, perform_conversions, score_file
+
+
+def _labs(n=100, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "id": np.arange(n),
+            "uPCR (mg/mmol)": rng.uniform(10, 300, n),
+            "Calcium": rng.uniform(2.0, 2.6, n),
+            "Phosphate": rng.uniform(0.8, 1.6, n),
+            "Albumin": rng.integers(30, 45, n),
+        }
+    )
+
+
+def test_plan_compiles_columns_once():
+    df = _labs()
+    plan = ConversionPlan(df.columns, convert_all=True)
+    assert plan.source_columns == [
+        "uPCR (mg/mmol)",
+        "Calcium",
+        "Phosphate",
+        "Albumin",
+    ]
+    assert plan.new_columns == [
+        "uPCR_mg_g",
+        "Calcium_mg_dl",
+        "Phosphate_mg_dl",
+        "Albumin_g_dl",
+    ]
+    back = ConversionPlan(["Calcium_mg_dl"], reverse=True, calcium_col="Calcium_mg_dl")
+    assert back.new_columns == ["Calcium_mmol_L"]
+
+
+def test_transform_and_apply_match_perform_conversions():
+    df = _labs()
+    expected = perform_conversions(df, convert_all=True)
+    plan = ConversionPlan(df.columns, convert_all=True)
+
+    new = plan.transform(df)
+    assert list(new.columns) == plan.new_columns and new.index.equals(df.index)
+    pd.testing.assert_frame_equal(new, expected[plan.new_columns])
+    np.testing.assert_allclose(new["uPCR_mg_g"], df["uPCR (mg/mmol)"] / 0.11312)
+
+    # Several chunks through one plan give the same result as one frame.
+    chunks = [plan.apply(df.iloc[i : i + 40]) for i in range(0, len(df), 40)]
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+
+
+def test_apply_leaves_input_and_inplace_writes():
+    df = _labs()
+    plan = ConversionPlan(df.columns, calcium_col="Calcium")
+    out = plan.apply(df)
+    assert "Calcium_mg_dl" in out.columns and "Calcium_mg_dl" not in df.columns
+
+    same = plan.apply(df, inplace=True)
+    assert same is df
+    np.testing.assert_allclose(df["Calcium_mg_dl"], df["Calcium"] * 4)
+
+
+def test_float32_output():
+    df = _labs()
+    out = perform_conversions(df, convert_all=True, dtype="float32")
+    assert (out[["uPCR_mg_g", "Albumin_g_dl"]].dtypes == np.float32).all()
+    assert out["id"].dtype == df["id"].dtype
+    np.testing.assert_allclose(out["Albumin_g_dl"], df["Albumin"] / 10, rtol=1e-6)
+
+
+def test_plan_logs_once_and_perform_conversions_prints(caplog, capsys):
+    df = _labs()
+    plan = ConversionPlan(df.columns, calcium_col="Calcium", albumin_col="Alb")
+    with caplog.at_level("INFO", logger="kfre"):
+        plan.apply(df)
+    assert "Converted 'Calcium' to new column 'Calcium_mg_dl'" in caplog.text
+    assert any(
+        r.levelname == "WARNING" and "Column 'Alb' not found" in r.message
+        for r in caplog.records
+    )
+    caplog.clear()
+    with caplog.at_level("INFO", logger="kfre"):
+        plan.apply(df)
+    assert caplog.records == []
+    assert capsys.readouterr().out == ""
+
+    perform_conversions(df, albumin_col="Alb")
+    assert "Warning: Column 'Alb' not found" in capsys.readouterr().out
+    with pytest.raises(KeyError):
+        plan.apply(df.drop(columns="Calcium"))
+
+
+def test_perform_conversions_returns_deep_copy():
+    df = _labs()
+    out = perform_conversions(df, calcium_col="Calcium")
+    out.loc[0, "Phosphate"] = -1.0
+    assert df.loc[0, "Phosphate"] > 0
+    assert "Calcium_mg_dl" not in df.columns
+
+
+def test_score_file_accepts_plan(tmp_path):
+    rng = np.random.default_rng(1)
+    n = 120
+    df = pd.DataFrame(
+        {
+            "Age": rng.uniform(40, 85, n),
+            "Sex": rng.choice(["Male", "Female"], n),
+            "eGFR": rng.uniform(10, 55, n),
+            "uACR": rng.uniform(5, 2000, n),
+            "Albumin": rng.uniform(30, 45, n),
+            "Phosphate": rng.uniform(0.8, 1.6, n),
+            "Bicarbonate": rng.uniform(18, 30, n),
+            "Calcium": rng.uniform(2.0, 2.6, n),
+        }
+    )
+    src = tmp_path / "in.csv"
+    df.to_csv(src, index=False)
+    columns = {
+        "age": "Age",
+        "sex": "Sex",
+        "eGFR": "eGFR",
+        "uACR": "uACR",
+        "albumin": "Albumin_g_dl",
+        "phosphorous": "Phosphate_mg_dl",
+        "bicarbonate": "Bicarbonate",
+        "calcium": "Calcium_mg_dl",
+    }
+    plan = ConversionPlan(df.columns, convert_all=True)
+    score_file(src, tmp_path / "a.csv", columns, num_vars=8, conversions=plan)
+    score_file(
+        src,
+        tmp_path / "b.csv",
+        columns,
+        num_vars=8,
+        chunksize=50,
+        conversions={"convert_all": True},
+    )
+    a, b = pd.read_csv(tmp_path / "a.csv"), pd.read_csv(tmp_path / "b.csv")
+    pd.testing.assert_frame_equal(a, b)
+    assert a.notna().all().all()
@@ -25,3 +25,116 @@ def test_eval_kfre_metrics_minimal():
     idx = metrics.index
     assert "AUC ROC" in idx
     assert "Brier Score" in idx
+
+
+def _cohort(n=600, seed=0):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({"2_year_outcome": (rng.random(n) < 0.2).astype(int)})
+    for n_var, signal in ((4, 0.2), (8, 0.4)):
+        noise = rng.random(n) * 0.6
+        df[f"kfre_{n_var}var_2year"] = signal * df["2_year_outcome"] + noise
+    return df
+
+
+def test_eval_kfre_metrics_ci_columns_and_points():
+    df = _cohort()
+    plain = eval_kfre_metrics(df, [4, 8], [2])
+    table = eval_kfre_metrics(df, [4, 8], [2], ci=95, n_boot=200, seed=3)
+
+    assert list(table.columns) == [
+        "2_year_4_var_kfre",
+        "2_year_4_var_kfre_lower",
+        "2_year_4_var_kfre_upper",
+        "2_year_8_var_kfre",
+        "2_year_8_var_kfre_lower",
+        "2_year_8_var_kfre_upper",
+        "2_year_8_minus_4_var_kfre",
+        "2_year_8_minus_4_var_kfre_lower",
+        "2_year_8_minus_4_var_kfre_upper",
+    ]
+    assert list(table.index) == list(plain.index)
+    pd.testing.assert_frame_equal(
+        table[plain.columns], plain, check_exact=False, atol=1e-6
+    )
+    diff = table["2_year_8_minus_4_var_kfre"]
+    assert (
+        (diff - (plain["2_year_8_var_kfre"] - plain["2_year_4_var_kfre"])).abs() <= 2e-6
+    ).all()
+    for col in ("2_year_4_var_kfre", "2_year_8_minus_4_var_kfre"):
+        assert (table[f"{col}_lower"] <= table[col] + 1e-9).all()
+        assert (table[col] <= table[f"{col}_upper"] + 1e-9).all()
+    # The 8-var model is built to discriminate better on every resample.
+    assert table.loc["AUC ROC", "2_year_8_minus_4_var_kfre_lower"] > 0
+
+
+def test_eval_kfre_metrics_ci_shares_bootstrap_metric_ci_resamples():
+    from kfre import bootstrap_metric_ci
+
+    df = _cohort()
+    table = eval_kfre_metrics(
+        df, [4], [2], ci=90, n_boot=150, seed=9, decimal_places=12
+    )
+    r = bootstrap_metric_ci(
+        df["2_year_outcome"],
+        df["kfre_4var_2year"],
+        "auc_roc",
+        n_boot=150,
+        ci=90,
+        seed=9,
+        progress=False,
+    )
+    row = table.loc["AUC ROC"]
+    assert abs(row["2_year_4_var_kfre_lower"] - r["lower"]) < 1e-11
+    assert abs(row["2_year_4_var_kfre_upper"] - r["upper"]) < 1e-11
+
+
+def test_eval_kfre_metrics_ci_drops_missing_rows():
+    df = _cohort()
+    df.loc[:20, "2_year_outcome"] = None
+    df.loc[30:40, "kfre_8var_2year"] = None
+    table = eval_kfre_metrics(df, [4, 8], [2], ci=95, n_boot=50, seed=0)
+    assert table.notna().all().all()
+
+
+def test_eval_kfre_metrics_ci_n_jobs_is_deterministic():
+    df = _cohort(n=300)
+    df["5_year_outcome"] = df["2_year_outcome"]
+    df["kfre_4var_5year"] = df["kfre_4var_2year"]
+    one = eval_kfre_metrics(df, [4, 8], [2, 5], ci=95, n_boot=300, seed=5, n_jobs=1)
+    two = eval_kfre_metrics(df, [4, 8], [2, 5], ci=95, n_boot=300, seed=5, n_jobs=2)
+    pd.testing.assert_frame_equal(one, two)
+    # Each horizon gets its own spawned stream.
+    assert not one["2_year_4_var_kfre_lower"].equals(one["5_year_4_var_kfre_lower"])
+
+
+def test_summary_metrics_match_sklearn():
+    import numpy as np
+    from sklearn import metrics as skm
+
+    from kfre._metrics import summary_metrics
+
+    rng = np.random.default_rng(1)
+    y = (rng.random(2000) < 0.3).astype(int)
+    # Rounded scores create ties, including scores exactly at the cutoff.
+    s = np.round(np.clip(0.3 * y + rng.random(2000) * 0.7, 0, 1), 2)
+    got = summary_metrics(y, s)
+    expected = {
+        "precision": skm.precision_score(y, s > 0.5),
+        "average_precision": skm.average_precision_score(y, s),
+        "sensitivity": skm.recall_score(y, s > 0.5),
+        "specificity": skm.recall_score(y, s > 0.5, pos_label=0),
+        "auc_roc": skm.roc_auc_score(y, s),
+        "brier": skm.brier_score_loss(y, s),
+    }
+    for metric, value in expected.items():
+        assert abs(got[metric] - value) < 1e-12, metric
+
+
+def test_eval_kfre_metrics_single_class_raises():
+    import pytest
+
+    df = pd.DataFrame({"kfre_4var_2year": [0.1, 0.9], "2_year_outcome": [1, 1]})
+    with pytest.raises(ValueError, match="Only one class"):
+        eval_kfre_metrics(df, [4], [2])
@@ -0,0 +1,96 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from PIL import Image
+
+from kfre import plot_kfre_metrics_jobs
+from kfre._plot_utils import save_plot_images
+
+
+def _figure():
+    fig, ax = plt.subplots(figsize=(6, 4))
+    ax.plot([0, 0.3, 1], [0, 0.7, 1], label="curve")
+    ax.set_title("Title")
+    ax.set_xlabel("x")
+    ax.legend(loc="best")
+    return fig
+
+
+def test_png_from_single_render_matches_savefig(tmp_path, monkeypatch):
+    fig = _figure()
+    reference = tmp_path / "reference.png"
+    fig.savefig(reference, bbox_inches="tight", dpi=120)
+
+    calls = []
+    original = fig.savefig
+    monkeypatch.setattr(
+        fig, "savefig", lambda *a, **k: calls.append(a[0]) or original(*a, **k)
+    )
+    written = save_plot_images(
+        "out", True, str(tmp_path / "png"), str(tmp_path / "svg"), fig=fig, dpi=120
+    )
+    assert written == [
+        str(tmp_path / "png" / "out.png"),
+        str(tmp_path / "svg" / "out.svg"),
+    ]
+    # Only the SVG goes through savefig; the PNG reuses the Agg render.
+    assert calls == [written[1]]
+
+    new = np.asarray(Image.open(written[0]))
+    old = np.asarray(Image.open(reference))
+    # Same canvas as savefig's; only sub-pixel alignment of antialiased
+    # edges may differ.
+    assert new.shape == old.shape
+    assert np.abs(new.astype(int) - old).mean() < 2
+    assert open(written[1]).read().lstrip().startswith("<?xml")
+    plt.close(fig)
+
+
+def test_untight_and_nothing_to_save(tmp_path):
+    fig = _figure()
+    written = save_plot_images(
+        "out", True, str(tmp_path), None, fig=fig, bbox_inches=None
+    )
+    width, height = Image.open(written[0]).size
+    assert (width, height) == (600, 400)
+    assert save_plot_images("out", False, str(tmp_path), None, fig=fig) == []
+    plt.close(fig)
+
+
+def _job_df(seed):
+    rng = np.random.default_rng(seed)
+    y = (rng.random(300) < 0.3).astype(int)
+    return pd.DataFrame(
+        {
+            "2_year_outcome": y,
+            "kfre_4var_2year": np.clip(0.3 * y + rng.random(300) * 0.7, 0, 1),
+        }
+    )
+
+
+def test_figure_jobs_serial_and_parallel(tmp_path):
+    open_before = plt.get_fignums()
+    for n_jobs in (None, 2):
+        out = tmp_path / str(n_jobs)
+        jobs = [
+            dict(
+                df=_job_df(site),
+                num_vars=4,
+                show_years=2,
+                image_path_png=str(out),
+                image_filename=f"site{site}",
+                plot_type="auc_roc",
+            )
+            for site in range(3)
+        ]
+        plot_kfre_metrics_jobs(jobs, n_jobs=n_jobs)
+        assert sorted(p.name for p in out.iterdir()) == [
+            "site0.png",
+            "site1.png",
+            "site2.png",
+        ]
+    assert plt.get_fignums() == open_before
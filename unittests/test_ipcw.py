@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import (
+    average_precision_score,
+    brier_score_loss,
+    roc_auc_score,
+)
+
+from kfre import (
+    class_esrd_outcome,
+    eval_kfre_calibration,
+    eval_kfre_metrics,
+    ipcw_weights,
+    kfre_calibration_table,
+)
+from kfre._calibration import CalibrationBins, calibration_fit
+from kfre._metrics import summary_metrics
+from kfre._survival import km_curve, step_value
+
+
+def _cohort(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    risk = rng.beta(1, 6, n)
+    event_time = rng.exponential(3.0 / (0.2 + 3 * risk))
+    censor_time = rng.uniform(0.5, 8.0, n)
+    event = (event_time <= censor_time).astype(int)
+    days = np.minimum(event_time, censor_time) * 365.25
+    df = pd.DataFrame(
+        {
+            "event": event,
+            "duration": days,
+            "kfre_4var_2year": risk,
+            "kfre_4var_5year": np.clip(2 * risk, 0, 1),
+        }
+    )
+    for years in (2, 5):
+        class_esrd_outcome(df, "event", years, "duration", censor_incomplete=True)
+    return df
+
+
+def test_weights_follow_censoring_km():
+    df = _cohort()
+    w = ipcw_weights(df, "event", 2, "duration")
+    assert w.name == "2_year_ipcw" and w.index.equals(df.index)
+
+    t = df["duration"].to_numpy() / 365.25
+    e = df["event"].to_numpy()
+    censored_early = (e == 0) & (t < 2)
+    assert np.all(w[censored_early] == 0)
+    assert np.all(w[~censored_early] >= 1)
+
+    times, surv = km_curve(t, 1 - e)
+    cases = (e == 1) & (t <= 2)
+    np.testing.assert_allclose(w[cases], 1 / step_value(times, surv, t[cases], True))
+
+    # With continuous times the weighted event share reproduces the
+    # Kaplan-Meier cumulative incidence and the weights sum to n.
+    times, surv = km_curve(t, e)
+    assert w[cases].sum() / len(df) == pytest.approx(1 - step_value(times, surv, 2.0))
+    assert w.sum() == pytest.approx(len(df))
+
+
+def test_multiple_horizons_and_missing_rows():
+    df = _cohort(300)
+    df.loc[[3, 7], "duration"] = np.nan
+    w = ipcw_weights(df, "event", [2, 5], "duration")
+    assert list(w.columns) == ["2_year_ipcw", "5_year_ipcw"]
+    assert np.all(w.loc[[3, 7]] == 0)
+    single = ipcw_weights(df, "event", 5, "duration")
+    np.testing.assert_array_equal(w["5_year_ipcw"], single)
+    with pytest.raises(ValueError):
+        ipcw_weights(df, "event", 2, "duration", duration_unit="months")
+
+
+def test_weighted_summary_metrics_match_sklearn():
+    df = _cohort(seed=1)
+    w = ipcw_weights(df, "event", 2, "duration").to_numpy()
+    keep = w > 0
+    y = df["2_year_outcome"].to_numpy(dtype=float, na_value=np.nan)[keep]
+    p = df["kfre_4var_2year"].to_numpy()[keep]
+    values = summary_metrics(df["2_year_outcome"], df["kfre_4var_2year"], 0.2, w)
+    assert values["auc_roc"] == pytest.approx(
+        roc_auc_score(y, p, sample_weight=w[keep]), abs=1e-12
+    )
+    assert values["average_precision"] == pytest.approx(
+        average_precision_score(y, p, sample_weight=w[keep]), abs=1e-12
+    )
+    assert values["brier"] == pytest.approx(
+        brier_score_loss(y, p, sample_weight=w[keep]), abs=1e-12
+    )
+    flagged = p > 0.2
+    assert values["sensitivity"] == pytest.approx(
+        np.sum(w[keep] * y * flagged) / np.sum(w[keep] * y)
+    )
+
+
+def test_unit_weights_match_unweighted():
+    df = _cohort(500, seed=2).dropna()
+    y, p = df["2_year_outcome"], df["kfre_4var_2year"]
+    assert summary_metrics(y, p, sample_weight=np.ones(len(df))) == pytest.approx(
+        summary_metrics(y, p)
+    )
+    assert calibration_fit(y.to_numpy(), p.to_numpy(), np.ones(len(df))) == (
+        pytest.approx(calibration_fit(y.to_numpy(), p.to_numpy()))
+    )
+
+
+def test_integer_weights_equal_repeated_rows():
+    rng = np.random.default_rng(3)
+    y = (rng.random(400) < 0.3).astype(float)
+    p = np.clip(0.3 + 0.2 * (y - 0.3) + rng.normal(0, 0.15, 400), 0.01, 0.99)
+    w = rng.integers(0, 4, 400)
+    rep_y, rep_p = np.repeat(y, w), np.repeat(p, w)
+    assert summary_metrics(y, p, sample_weight=w) == pytest.approx(
+        summary_metrics(rep_y, rep_p), abs=1e-12
+    )
+    assert calibration_fit(y, p, w.astype(float)) == pytest.approx(
+        calibration_fit(rep_y, rep_p), abs=1e-8
+    )
+    edges = np.linspace(0, 1, 6)
+    weighted = CalibrationBins(edges).update(y, p, sample_weight=w)
+    repeated = CalibrationBins(edges).update(rep_y, rep_p)
+    np.testing.assert_allclose(weighted.n, repeated.n)
+    np.testing.assert_allclose(weighted.observed, repeated.observed)
+    np.testing.assert_allclose(weighted.expected, repeated.expected)
+
+
+def test_eval_functions_accept_sample_weight():
+    df = _cohort(seed=4)
+    weights = ipcw_weights(df, "event", [2, 5], "duration")
+    df["w2"] = weights["2_year_ipcw"]
+    by_year = {2: "w2", 5: weights["5_year_ipcw"].to_numpy()}
+
+    metrics = eval_kfre_metrics(df, [4], [2, 5], sample_weight=by_year)
+    y = df["2_year_outcome"].to_numpy(dtype=float, na_value=np.nan)
+    keep = df["w2"].to_numpy() > 0
+    assert metrics.loc["AUC ROC", "2_year_4_var_kfre"] == pytest.approx(
+        roc_auc_score(
+            y[keep], df["kfre_4var_2year"][keep], sample_weight=df["w2"][keep]
+        ),
+        abs=1e-6,
+    )
+    same = eval_kfre_metrics(df, [4], 2, sample_weight="w2")
+    pd.testing.assert_series_equal(
+        same["2_year_4_var_kfre"], metrics["2_year_4_var_kfre"]
+    )
+
+    calib = eval_kfre_calibration(df, [4], [2, 5], sample_weight=by_year)
+    observed = calib.loc["Observed Events", "2_year_4_var_kfre"]
+    assert observed == pytest.approx(np.sum(df["w2"][keep] * y[keep]), abs=1e-5)
+    table = kfre_calibration_table(df, [4], 2, sample_weight="w2")
+    assert table["N"].sum() == pytest.approx(df["w2"].sum())
+
+
+def test_sample_weight_errors():
+    df = _cohort(200)
+    with pytest.raises(ValueError, match="ci"):
+        eval_kfre_metrics(df, [4], 2, ci=95, sample_weight=np.ones(len(df)))
+    with pytest.raises(ValueError, match="one value per row"):
+        eval_kfre_metrics(df, [4], 2, sample_weight=np.ones(3))
+    with pytest.raises(ValueError, match="5 years"):
+        eval_kfre_metrics(
+            df, [4], [2, 5], sample_weight={2: ipcw_weights(df, "event", 2, "duration")}
+        )
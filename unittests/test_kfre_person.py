@@ -21,3 +21,63 @@ def test_kfre_person_basic(years, expected_range):
     assert isinstance(val, float)
     low, high = expected_range
     assert low <= val <= high
+
+
+def test_kfre_person_matches_risk_pred_for_every_model():
+    from kfre.main import risk_pred
+
+    inputs = dict(age=64, eGFR=22, uACR=410, is_north_american=True)
+    extras = dict(
+        dm=1, htn=1, albumin=3.6, phosphorous=4.4, bicarbonate=23, calcium=9.1
+    )
+    out = kfre_person(is_male=True, years=[2, 5], num_vars="all", **inputs, **extras)
+    assert len(out) == 6
+    for n, kwargs in [
+        (4, {}),
+        (6, dict(dm=1, htn=1)),
+        (
+            8,
+            {
+                k: extras[k]
+                for k in ("albumin", "phosphorous", "bicarbonate", "calcium")
+            },
+        ),
+    ]:
+        for years in (2, 5):
+            expected = risk_pred(sex=1, years=years, num_vars=n, **inputs, **kwargs)
+            assert out[f"kfre_{n}var_{years}year"] == pytest.approx(expected, rel=1e-12)
+
+
+def test_kfre_person_batch_matches_scalar_path():
+    import numpy as np
+    from kfre import kfre_person_batch
+
+    records = [
+        dict(age=57.28, is_male=False, eGFR=15.0, uACR=1762.0, is_north_american=False),
+        dict(age=70.0, is_male=True, eGFR=35.0, uACR=120.0, is_north_american=True),
+        dict(age=66.0, is_male=True, eGFR=28.0, uACR=None, is_north_american=True),
+    ]
+    out = kfre_person_batch(records, years=[2, 5])
+    assert list(out.columns) == ["kfre_4var_2year", "kfre_4var_5year"]
+    for i, record in enumerate(records[:2]):
+        for years in (2, 5):
+            assert out[f"kfre_4var_{years}year"].iloc[i] == pytest.approx(
+                kfre_person(years=years, **record), rel=1e-12
+            )
+    assert np.isnan(out["kfre_4var_2year"].iloc[2])
+
+    structured = np.array(
+        [(57.28, False, 15.0, 1762.0)],
+        dtype=[("age", float), ("is_male", bool), ("eGFR", float), ("uACR", float)],
+    )
+    single = kfre_person_batch(structured, is_north_american=False, years=2)
+    assert single["kfre_4var_2year"].iloc[0] == pytest.approx(
+        out["kfre_4var_2year"].iloc[0], rel=1e-12
+    )
+
+
+def test_kfre_person_batch_requires_region():
+    from kfre import kfre_person_batch
+
+    with pytest.raises(ValueError):
+        kfre_person_batch([dict(age=60, is_male=True, eGFR=20, uACR=100)])
@@ -0,0 +1,47 @@
+import subprocess
+import sys
+
+import pytest
+
+PROBE = """
+import sys
+import kfre
+kfre.risk_pred(60, 1, 25, 200, False)
+kfre.kfre_person(60, True, 25, 200, False)
+heavy = [m for m in ("matplotlib", "sklearn", "kfre._plot_utils") if m in sys.modules]
+print(",".join(heavy))
+"""
+
+
+def test_scoring_does_not_import_plotting_or_sklearn():
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], check=True, capture_output=True, text=True
+    ).stdout.strip()
+    assert out == ""
+
+
+def test_evaluation_names_resolve_lazily():
+    import kfre
+    from kfre import perform_eval
+
+    assert kfre.eval_kfre_metrics is perform_eval.eval_kfre_metrics
+    assert kfre.plot_kfre_metrics is perform_eval.plot_kfre_metrics
+    assert "class_ckd_stages" in dir(kfre)
+
+
+def test_main_forwards_every_public_perform_eval_name():
+    import kfre.main
+    from kfre import perform_eval
+
+    public = [
+        name
+        for name, obj in vars(perform_eval).items()
+        if not name.startswith("_") and callable(obj)
+    ]
+    assert {"eval_kfre_subgroup_metrics", "kfre_calibration_table"} <= set(public)
+    for name in public:
+        assert getattr(kfre.main, name) is getattr(perform_eval, name)
+    from kfre.main import ipcw_weights  # noqa: F401
+
+    with pytest.raises(AttributeError):
+        kfre.main._eval_inputs
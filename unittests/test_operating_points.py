@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import confusion_matrix
+
+from kfre import eval_kfre_operating_points
+
+
+def _cohort(n=1500, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({"2_year_outcome": (rng.random(n) < 0.1).astype(float)})
+    risk = np.clip(0.3 * df["2_year_outcome"] + rng.random(n) * 0.5, 0, 1)
+    df["kfre_4var_2year"] = np.round(risk, 2)  # ties, some exactly at cutoffs
+    return df
+
+
+def test_matches_confusion_matrix_at_each_threshold():
+    df = _cohort()
+    thresholds = [0.0, 0.03, 0.05, 0.1, 0.4, 0.5]
+    table = eval_kfre_operating_points(df, [4], [2], thresholds, decimal_places=12)
+    assert list(table["Threshold"]) == thresholds
+    y, s = df["2_year_outcome"], df["kfre_4var_2year"]
+    n = len(df)
+    for _, row in table.iterrows():
+        t = row["Threshold"]
+        tn, fp, fn, tp = confusion_matrix(y, s > t, labels=[0, 1]).ravel()
+        assert row["Sensitivity"] == pytest.approx(tp / (tp + fn))
+        assert row["Specificity"] == pytest.approx(tn / (tn + fp))
+        assert row["PPV"] == pytest.approx(tp / (tp + fp))
+        assert row["NPV"] == pytest.approx(tn / (tn + fn))
+        assert row["Flagged Fraction"] == pytest.approx((tp + fp) / n)
+        assert row["Net Benefit"] == pytest.approx(tp / n - fp / n * t / (1 - t))
+
+
+def test_dense_grid_and_long_layout():
+    df = _cohort()
+    df["kfre_8var_2year"] = df["kfre_4var_2year"]
+    grid = np.linspace(0.01, 0.99, 1000)
+    table = eval_kfre_operating_points(df, [4, 8], 2, grid)
+    assert len(table) == 2000
+    assert set(table["Outcome"]) == {"2_year_4_var_kfre", "2_year_8_var_kfre"}
+    sens = table.loc[table["Outcome"] == "2_year_4_var_kfre", "Sensitivity"]
+    assert sens.is_monotonic_decreasing
+
+
+def test_missing_rows_dropped_and_empty_flags_nan():
+    df = _cohort()
+    df.loc[:9, "2_year_outcome"] = np.nan
+    table = eval_kfre_operating_points(df, [4], [2], 0.99)
+    assert table.loc[0, "Flagged Fraction"] == 0
+    assert np.isnan(table.loc[0, "PPV"])
+
+
+@pytest.mark.parametrize("bad", [1.0, -0.1, [0.1, 1.5]])
+def test_invalid_thresholds_raise(bad):
+    with pytest.raises(ValueError, match="thresholds"):
+        eval_kfre_operating_points(_cohort(), [4], [2], bad)
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kfre import add_kfre_risk_col, predict_kfre
+from kfre import _parallel
+
+
+def _cohort(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "Age": rng.uniform(30, 90, n),
+            "Sex": rng.choice(["Male", "Female"], n),
+            "eGFR": rng.uniform(5, 59, n),
+            "uACR": rng.uniform(1, 3000, n),
+            "Alb": rng.uniform(2.5, 5, n),
+            "Phos": rng.uniform(2, 7, n),
+            "Bicarb": rng.uniform(15, 30, n),
+            "Ca": rng.uniform(7.5, 10.5, n),
+        }
+    )
+    df.loc[::97, "Alb"] = np.nan
+    return df
+
+
+_COLS = dict(
+    age_col="Age",
+    sex_col="Sex",
+    eGFR_col="eGFR",
+    uACR_col="uACR",
+    albumin_col="Alb",
+    phosphorous_col="Phos",
+    bicarbonate_col="Bicarb",
+    calcium_col="Ca",
+)
+
+
+def test_parallel_is_bit_identical_to_serial():
+    # More than two blocks so the rows are really split across workers.
+    df = _cohort(2 * _parallel.BLOCK_ROWS + 123)
+    serial = add_kfre_risk_col(df, **_COLS, num_vars=[4, 8], years="all")
+    parallel = add_kfre_risk_col(df, **_COLS, num_vars=[4, 8], years="all", n_jobs=2)
+    risk_cols = [c for c in serial.columns if c.startswith("kfre_")]
+    assert len(risk_cols) == 4
+    for col in risk_cols:
+        np.testing.assert_array_equal(parallel[col].to_numpy(), serial[col].to_numpy())
+    assert serial["kfre_8var_2year"].isna().sum() == df["Alb"].isna().sum()
+
+
+def test_predict_kfre_accepts_n_jobs():
+    df = _cohort(500)
+    cols = {"age": "Age", "sex": "Sex", "eGFR": "eGFR", "uACR": "uACR"}
+    a = predict_kfre(df, cols, years=5, is_north_american=True)
+    b = predict_kfre(df, cols, years=5, is_north_american=True, n_jobs=-1)
+    np.testing.assert_array_equal(a.to_numpy(), b.to_numpy())
+
+
+def test_resolve_n_jobs():
+    assert _parallel.resolve_n_jobs(None) == 1
+    assert _parallel.resolve_n_jobs(3) == 3
+    assert _parallel.resolve_n_jobs(-1) >= 1
+    with pytest.raises(ValueError):
+        _parallel.resolve_n_jobs(0)
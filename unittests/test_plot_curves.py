@@ -0,0 +1,109 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import (
+    auc,
+    average_precision_score,
+    precision_recall_curve,
+    roc_curve,
+)
+
+from kfre._plot_utils import CurveCache, decimate
+from kfre.perform_eval import plot_kfre_metrics
+
+
+def _scores(n, seed=0):
+    rng = np.random.default_rng(seed)
+    y = (rng.random(n) < 0.2).astype(int)
+    p = np.round(np.clip(0.2 + 0.3 * (y - 0.2) + rng.normal(0, 0.2, n), 0, 1), 3)
+    return y, p
+
+
+def _segment_distance(px, py, x, y):
+    # Distance from each point to the nearest segment of the polyline (x, y).
+    ax, ay, bx, by = x[:-1], y[:-1], x[1:], y[1:]
+    dx, dy = bx - ax, by - ay
+    length = np.maximum(dx**2 + dy**2, 1e-300)
+    t = np.clip(((px[:, None] - ax) * dx + (py[:, None] - ay) * dy) / length, 0, 1)
+    return np.min(np.hypot(ax + t * dx - px[:, None], ay + t * dy - py[:, None]), 1)
+
+
+def test_curves_match_sklearn():
+    y, p = _scores(5000)
+    curves = CurveCache(max_points=None).get("m", y, p)
+    fpr, tpr, auc_score = curves["roc"]
+    ref_fpr, ref_tpr, _ = roc_curve(y, p, drop_intermediate=False)
+    np.testing.assert_allclose(fpr, ref_fpr)
+    np.testing.assert_allclose(tpr, ref_tpr)
+    assert auc_score == pytest.approx(auc(ref_fpr, ref_tpr), abs=1e-12)
+
+    recall, precision, ap_score = curves["pr"]
+    ref_precision, ref_recall, _ = precision_recall_curve(y, p)
+    np.testing.assert_allclose(recall, ref_recall[::-1])
+    np.testing.assert_allclose(precision, ref_precision[::-1])
+    assert ap_score == pytest.approx(average_precision_score(y, p), abs=1e-12)
+
+
+def test_decimation_is_bounded():
+    y, p = _scores(40_000, seed=1)
+    p = p + np.random.default_rng(2).normal(0, 1e-4, p.size)
+    full = CurveCache(max_points=None).get("m", y, p)
+    thin = CurveCache(max_points=300).get("m", y, p)
+    for kind in ("roc", "pr"):
+        x, yy, score = full[kind]
+        tx, ty, thin_score = thin[kind]
+        assert tx.size <= 301 < x.size
+        assert thin_score == score
+        assert (tx[0], ty[0], tx[-1], ty[-1]) == (x[0], yy[0], x[-1], yy[-1])
+        length = np.sum(np.abs(np.diff(x)) + np.abs(np.diff(yy)))
+        assert _segment_distance(x, yy, tx, ty).max() <= length / 299
+    x = np.linspace(0, 1, 10)
+    assert decimate(x, x, None)[0] is x
+    assert decimate(x, x, 100)[0] is x
+
+
+def test_each_curve_is_computed_once(monkeypatch):
+    import kfre._plot_utils as plot_utils
+
+    monkeypatch.setattr(plt, "show", lambda: None)
+    calls = []
+    original = plot_utils.ranked_counts
+
+    def counting(*args):
+        calls.append(1)
+        return original(*args)
+
+    monkeypatch.setattr(plot_utils, "ranked_counts", counting)
+    y, p = _scores(500)
+    df = pd.DataFrame(
+        {
+            "2_year_outcome": y,
+            "5_year_outcome": y,
+            "kfre_4var_2year": p,
+            "kfre_4var_5year": p,
+            "kfre_6var_2year": p,
+            "kfre_6var_5year": p,
+        }
+    )
+    plot_kfre_metrics(df, [4, 6], mode="plot", show_subplots=True)
+    # 2 models x 2 horizons, shared by the ROC and PR panels.
+    assert len(calls) == 4
+
+    fig = plt.gcf()
+    assert len(fig.axes) == 4
+    roc_ax = fig.axes[0]
+    # Two model curves plus the chance diagonal, drawn straight into the grid.
+    assert len(roc_ax.get_lines()) == 3
+    assert roc_ax.get_title() == "AUC ROC: 4 Variable KFRE"
+    assert fig.axes[2].get_title() == "Precision-Recall: 4 Variable KFRE"
+    plt.close("all")
+
+
+def test_nan_input_raises():
+    with pytest.raises(ValueError, match="NaN"):
+        CurveCache().get("m", [0, 1, np.nan], [0.1, 0.2, 0.3])
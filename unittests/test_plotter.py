@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kfre import KFREPlotter
+
+
+def _df(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {
+        "2_year_outcome": (rng.random(n) < 0.2).astype(int),
+        "5_year_outcome": (rng.random(n) < 0.3).astype(int),
+    }
+    for n_var in (4, 8):
+        for year in (2, 5):
+            data[f"kfre_{n_var}var_{year}year"] = rng.random(n)
+    return pd.DataFrame(data)
+
+
+def test_never_imports_pyplot(tmp_path):
+    code = (
+        "import sys, numpy as np, pandas as pd, kfre\n"
+        "df = pd.DataFrame({'2_year_outcome': [0, 1, 0, 1],"
+        " 'kfre_4var_2year': [0.1, 0.8, 0.3, 0.6]})\n"
+        f"p = kfre.KFREPlotter(image_path_png={str(tmp_path)!r})\n"
+        "figs = p.plot(df, 4, show_years=2, save_plots=True)\n"
+        "assert len(figs) == 2 and figs[0].axes[0].get_lines()\n"
+        "assert 'matplotlib.pyplot' not in sys.modules, 'pyplot imported'\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+    assert sorted(os.listdir(tmp_path)) == [
+        "4var_auc_roc.png",
+        "4var_precision_recall.png",
+    ]
+
+
+def test_figures_and_axes_are_reused():
+    plotter = KFREPlotter()
+    first = plotter.plot(_df(seed=1), [4, 8])
+    axes = [fig.axes[0] for fig in first]
+    for seed in range(2, 6):
+        figs = plotter.plot(_df(seed=seed), [4, 8])
+        assert [id(f) for f in figs] == [id(f) for f in first]
+        assert [fig.axes[0] for fig in figs] == axes
+        # Two outcome curves plus the chance diagonal; nothing piles up.
+        assert len(figs[0].axes[0].get_lines()) == 3
+    assert len(plotter) == 4
+    grid = plotter.plot(_df(), [4, 8], show_subplots=True)
+    assert len(grid) == 1 and len(grid[0].axes) == 4
+    plotter.close()
+    assert len(plotter) == 0
+
+
+def test_without_reuse_figures_are_new():
+    plotter = KFREPlotter(reuse=False)
+    a = plotter.plot(_df(), 4, show_years=2, plot_type="auc_roc")
+    b = plotter.plot(_df(), 4, show_years=2, plot_type="auc_roc")
+    assert a[0] is not b[0] and len(plotter) == 0
+
+
+def test_close_after_save_and_names(tmp_path):
+    plotter = KFREPlotter(image_path_svg=str(tmp_path), close_after_save=True)
+    figs = plotter.plot(
+        _df(), [4, 8], plot_combinations=True, save_plots=True, image_prefix="site1"
+    )
+    assert sorted(os.listdir(tmp_path)) == [
+        "site1_auc_roc_curve_combined.svg",
+        "site1_pr_curve_combined.svg",
+    ]
+    assert all(not ax.get_lines() for fig in figs for ax in fig.axes)
+
+
+def test_errors():
+    with pytest.raises(ValueError, match="image_path"):
+        KFREPlotter().plot(_df(), 4, save_plots=True)
+    with pytest.raises(ValueError, match="show_years"):
+        KFREPlotter().plot(_df(), 4, show_years=3)
+    with pytest.raises(ValueError, match="bbox_inches"):
+        KFREPlotter(bbox_inches=1)
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kfre import DEFAULT_REGISTRY, KFREModel, ModelRegistry, add_kfre_risk_col
+from kfre.main import risk_pred
+
+
+def _df():
+    return pd.DataFrame(
+        {
+            "Age": [55.0, 72.0, 64.0],
+            "Sex": ["male", "female", "male"],
+            "eGFR": [25.0, 40.0, 18.0],
+            "uACR": [200.0, 35.0, 1200.0],
+            "DM": [1, 0, 1],
+            "HTN": [1, 1, 0],
+            "Alb": [3.8, 4.1, np.nan],
+            "Phos": [4.2, 3.5, 5.0],
+            "Bicarb": [23.0, 26.0, 20.0],
+            "Ca": [9.1, 9.4, 8.8],
+        }
+    )
+
+
+_COLS = dict(
+    age_col="Age",
+    sex_col="Sex",
+    eGFR_col="eGFR",
+    uACR_col="uACR",
+    dm_col="DM",
+    htn_col="HTN",
+    albumin_col="Alb",
+    phosphorous_col="Phos",
+    bicarbonate_col="Bicarb",
+    calcium_col="Ca",
+)
+
+
+def test_compiled_arrays_are_read_only():
+    model = DEFAULT_REGISTRY[4]
+    assert DEFAULT_REGISTRY.coef_matrix.shape == (10, 3)
+    with pytest.raises(ValueError):
+        model.coef[0] = 1.0
+    with pytest.raises(AttributeError):
+        model.num_vars = 6
+
+
+def test_gemm_path_matches_risk_pred():
+    df = _df()
+    out = add_kfre_risk_col(df, **_COLS, num_vars="all", years="all")
+    for i in range(2):
+        row = df.iloc[i]
+        sex = 1 if row["Sex"] == "male" else 0
+        r8 = risk_pred(
+            row["Age"],
+            sex,
+            row["eGFR"],
+            row["uACR"],
+            False,
+            albumin=row["Alb"],
+            phosphorous=row["Phos"],
+            bicarbonate=row["Bicarb"],
+            calcium=row["Ca"],
+            years=5,
+        )
+        r6 = risk_pred(
+            row["Age"],
+            sex,
+            row["eGFR"],
+            row["uACR"],
+            False,
+            dm=row["DM"],
+            htn=row["HTN"],
+            years=2,
+        )
+        assert out["kfre_8var_5year"].iloc[i] == pytest.approx(r8, rel=1e-12)
+        assert out["kfre_6var_2year"].iloc[i] == pytest.approx(r6, rel=1e-12)
+
+
+def test_missing_input_only_affects_models_that_use_it():
+    out = add_kfre_risk_col(_df(), **_COLS, num_vars="all", years=2)
+    assert np.isnan(out["kfre_8var_2year"].iloc[2])
+    assert np.isfinite(out["kfre_4var_2year"].iloc[2])
+    assert np.isfinite(out["kfre_6var_2year"].iloc[2])
+
+
+def test_recalibrated_model_runs_through_fast_path():
+    local4 = DEFAULT_REGISTRY[4].recalibrate(
+        alpha={(False, 2): 0.99}, centers={"age": 6.5}
+    )
+    registry = DEFAULT_REGISTRY.replace(local4)
+    assert isinstance(registry, ModelRegistry)
+    assert DEFAULT_REGISTRY[4].baseline_survival(False, 2) == 0.9832
+
+    out = add_kfre_risk_col(_df(), **_COLS, num_vars=4, years=2, registry=registry)
+    expected = risk_pred(55.0, 1, 25.0, 200.0, False, years=2, registry=registry)
+    assert out["kfre_4var_2year"].iloc[0] == pytest.approx(expected, rel=1e-12)
+    published = risk_pred(55.0, 1, 25.0, 200.0, False, years=2)
+    assert expected != pytest.approx(published)
+
+
+def test_model_validation():
+    with pytest.raises(ValueError):
+        KFREModel(4, {"age": 1.0}, {(True, 2): 0.9, (False, 2): 0.9})
+    with pytest.raises(ValueError):
+        KFREModel(
+            4,
+            DEFAULT_REGISTRY[4].coefficients,
+            {(True, 2): 0.9},  # missing the non-North American alpha
+        )
+    with pytest.raises(ValueError):
+        DEFAULT_REGISTRY[4].baseline_survival(True, 3)
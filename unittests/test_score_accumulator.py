@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kfre import ScoreAccumulator, eval_kfre_metrics, eval_kfre_metrics_binned
+from kfre._metrics import summary_metrics
+
+
+def _data(n=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    y = (rng.random(n) < 0.12).astype(float)
+    return y, rng.beta(1 + 2 * y, 8)
+
+
+def test_metrics_within_documented_bounds():
+    y, p = _data()
+    acc = ScoreAccumulator(n_bins=200).update(y, p)
+    exact = summary_metrics(y, p)
+    got = acc.metrics()
+    for metric in ("precision", "sensitivity", "specificity", "brier"):
+        assert got[metric] == pytest.approx(exact[metric], rel=1e-12)
+    auc_low, auc_high = acc.auc_bounds()
+    ap_low, ap_high = acc.ap_bounds()
+    assert auc_low <= exact["auc_roc"] <= auc_high
+    assert ap_low <= exact["average_precision"] <= ap_high
+    assert auc_low <= got["auc_roc"] <= auc_high
+    assert all(type(v) is float for v in (auc_low, auc_high, ap_low, ap_high))
+
+
+def test_bounds_are_nan_with_one_class():
+    acc = ScoreAccumulator().update(np.zeros(50), np.linspace(0, 1, 50))
+    with np.errstate(all="raise"):
+        assert np.isnan(acc.auc_bounds()).all()
+        assert np.isnan(acc.ap_bounds()).all()
+
+
+def test_merge_is_associative_and_matches_single_pass():
+    y, p = _data()
+    whole = ScoreAccumulator().update(y, p)
+    a, b, c = (
+        ScoreAccumulator().update(y[s], p[s])
+        for s in (slice(0, 5000), slice(5000, 12000), slice(12000, None))
+    )
+    left, right = (a + b) + c, a + (b + c)
+    np.testing.assert_array_equal(left.hist, whole.hist)
+    np.testing.assert_array_equal(right.cells, whole.cells)
+    assert left.metrics() == pytest.approx(whole.metrics())
+    with pytest.raises(ValueError, match="same n_bins"):
+        a.merge(ScoreAccumulator(n_bins=10))
+
+
+def test_binned_table_from_chunks_file_and_reduced_accumulators(tmp_path):
+    y, p = _data()
+    df = pd.DataFrame({"2_year_outcome": y, "kfre_4var_2year": p})
+    exact = eval_kfre_metrics(df, [4], [2])
+    binned = eval_kfre_metrics_binned(df, [4], [2])
+    assert list(binned.index[:6]) == list(exact.index)
+    np.testing.assert_allclose(
+        binned.iloc[:6, 0], exact.iloc[:, 0], atol=binned.iloc[6:, 0].max() + 1e-6
+    )
+
+    path = tmp_path / "cohort.csv"
+    df.to_csv(path, index=False)
+    from_file = eval_kfre_metrics_binned(path, [4], [2], chunksize=3000)
+    pd.testing.assert_frame_equal(from_file, binned)
+
+    _, site_a = eval_kfre_metrics_binned(
+        df.iloc[:8000], [4], 2, return_accumulators=True
+    )
+    _, site_b = eval_kfre_metrics_binned(
+        df.iloc[8000:], [4], 2, return_accumulators=True
+    )
+    reduced = {k: site_a[k] + site_b[k] for k in site_a}
+    pd.testing.assert_frame_equal(eval_kfre_metrics_binned(reduced, [4], [2]), binned)
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kfre import add_kfre_risk_col, score_file
+
+COLUMNS = {
+    "age": "Age",
+    "sex": "Sex",
+    "eGFR": "eGFR",
+    "uACR": "uACR",
+    "dm": "DM",
+    "htn": "HTN",
+}
+
+
+def _cohort(n=250, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "PatientID": np.arange(n),
+            "Age": rng.uniform(40, 85, n).round(1),
+            "Sex": rng.choice(["Male", "Female"], n),
+            "eGFR": rng.uniform(10, 55, n).round(1),
+            "uACR": rng.uniform(5, 2000, n).round(1),
+            "uPCR": rng.uniform(10, 3000, n).round(1),
+            "DM": rng.integers(0, 2, n),
+            "HTN": rng.integers(0, 2, n),
+            "Unused": "x",
+        }
+    )
+
+
+def _expected(df):
+    return add_kfre_risk_col(
+        df,
+        age_col="Age",
+        sex_col="Sex",
+        eGFR_col="eGFR",
+        uACR_col="uACR",
+        dm_col="DM",
+        htn_col="HTN",
+        num_vars=[4, 6],
+        years=(2, 5),
+    )
+
+
+def test_csv_roundtrip_matches_in_memory(tmp_path):
+    df = _cohort()
+    src, dst = tmp_path / "in.csv", tmp_path / "out.csv"
+    df.to_csv(src, index=False)
+
+    n = score_file(
+        src, dst, COLUMNS, num_vars=[4, 6], chunksize=64, keep_cols=["PatientID"]
+    )
+    out = pd.read_csv(dst)
+
+    assert n == len(df)
+    assert list(out.columns) == [
+        "PatientID",
+        "kfre_4var_2year",
+        "kfre_4var_5year",
+        "kfre_6var_2year",
+        "kfre_6var_5year",
+    ]
+    expected = _expected(pd.read_csv(src))
+    for col in out.columns[1:]:
+        np.testing.assert_allclose(out[col], expected[col], rtol=1e-12)
+
+
+def test_parquet_roundtrip(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = _cohort()
+    src, dst = tmp_path / "in.parquet", tmp_path / "out.parquet"
+    df.to_parquet(src, index=False)
+
+    score_file(src, dst, COLUMNS, num_vars=4, years=2, chunksize=100)
+    out = pd.read_parquet(dst)
+    np.testing.assert_allclose(
+        out["kfre_4var_2year"], _expected(df)["kfre_4var_2year"], rtol=1e-12
+    )
+
+
+def test_per_chunk_upcr_and_conversions(tmp_path):
+    df = _cohort(n=50)
+    src, dst = tmp_path / "in.csv", tmp_path / "out.csv"
+    df.drop(columns="uACR").to_csv(src, index=False)
+
+    with pytest.warns(UserWarning, match="ESTIMATED"):
+        score_file(
+            src,
+            dst,
+            dict(COLUMNS, uACR="uACR_est"),
+            num_vars=4,
+            years=2,
+            chunksize=20,
+            keep_cols=["PatientID", "uPCR_mg_g"],
+            conversions={"upcr_col": "uPCR"},
+            upcr={
+                "sex_col": "Sex",
+                "diabetes_col": "DM",
+                "hypertension_col": "HTN",
+                "upcr_col": "uPCR_mg_g",
+                "female_str": "Female",
+            },
+        )
+    out = pd.read_csv(dst)
+    np.testing.assert_allclose(out["uPCR_mg_g"], df["uPCR"] / 0.11312)
+    assert out["kfre_4var_2year"].notna().all()
+
+
+def test_missing_model_columns_raise(tmp_path):
+    with pytest.raises(ValueError):
+        score_file(tmp_path / "in.csv", tmp_path / "out.csv", COLUMNS, num_vars=8)
@@ -0,0 +1,108 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kfre.main import _resolve_sex_series
+
+
+def _resolve(series, female_str=None):
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter("always")
+        female, valid = _resolve_sex_series(series, female_str)
+    msgs = [str(x.message) for x in w if "Unrecognized sex" in str(x.message)]
+    return female.tolist(), valid.tolist(), msgs
+
+
+@pytest.mark.parametrize("dtype", [object, "string", "category"])
+def test_string_like_dtypes_resolve_identically(dtype):
+    s = pd.Series([" Male", "f", None, "", "FEMALE", "unknown", "m"], dtype=dtype)
+    female, valid, msgs = _resolve(s)
+    assert female == [0, 1, 0, 0, 1, 0, 0]
+    assert valid == [True, True, False, False, True, False, True]
+    assert len(msgs) == 1 and "unknown" in msgs[0]
+    assert "0/1 for numeric and boolean columns" in msgs[0]
+
+
+def test_female_str_is_accepted():
+    female, valid, _ = _resolve(pd.Series(["W", "M"]), female_str="w")
+    assert female == [1, 0]
+    assert valid == [True, True]
+
+
+@pytest.mark.parametrize(
+    "series",
+    [
+        pd.Series([1, 0, 1]),
+        pd.Series([1.0, 0.0, 1.0]),
+        pd.Series([True, False, True]),
+        pd.Series([1, 0, 1], dtype="Int64"),
+        pd.Series([True, False, True], dtype="boolean"),
+    ],
+)
+def test_numeric_and_boolean_use_kfre_encoding(series):
+    # 1/True = male, 0/False = female, matching risk_pred's sex argument.
+    female, valid, msgs = _resolve(series)
+    assert female == [0, 1, 0]
+    assert all(valid)
+    assert not msgs
+
+
+def test_numeric_missing_is_quiet_and_bad_codes_warn():
+    female, valid, msgs = _resolve(pd.Series([1.0, np.nan, 2.0]))
+    assert valid == [True, False, False]
+    assert len(msgs) == 1 and "2.0" in msgs[0]
+
+
+def test_index_is_preserved():
+    s = pd.Series(["m", "f"], index=[10, 20])
+    female, valid = _resolve_sex_series(s)
+    assert list(female.index) == [10, 20]
+    assert list(valid.index) == [10, 20]
+
+
+def _baseline_resolve(series, female_str):
+    # Original string-normalizing resolver, kept as the reference behavior.
+    normalized = series.astype("string").str.strip().str.lower()
+    female = normalized.isin({"female", "f", str(female_str).strip().lower()})
+    valid = female | normalized.isin({"male", "m"})
+    return female.astype(int).tolist(), valid.tolist()
+
+
+@pytest.mark.parametrize(
+    "series",
+    [
+        pd.Series([1, 0, 1, 0]),
+        pd.Series([1, 0, 1, 0], dtype="Int64"),
+        pd.Series(["1", "0", "1", "0"]),
+    ],
+)
+def test_female_str_applies_to_numeric_columns(series):
+    female, valid, msgs = _resolve(series, female_str=1)
+    assert (female, valid) == _baseline_resolve(series, 1)
+    assert female == [1, 0, 1, 0]
+    assert len(msgs) == 1 and "0" in msgs[0]
+    assert "female_str=1" in msgs[0] and "0/1" not in msgs[0]
+
+
+def test_upcr_uacr_integer_sex_with_female_str_matches_baseline():
+    from kfre import upcr_uacr
+
+    df = pd.DataFrame(
+        {
+            "sex": [1, 0, 1],
+            "label": ["Female", "Male", "Female"],
+            "dm": [1, 0, 0],
+            "htn": [1, 1, 0],
+            "upcr": [150.0, 80.0, 40.0],
+        }
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        coded = upcr_uacr(df, "sex", "dm", "htn", "upcr", female_str=1)
+        labeled = upcr_uacr(df, "label", "dm", "htn", "upcr", female_str="Female")
+    # 1 is female, as in the baseline; 0 matches neither female_str nor a
+    # male label, so it is missing rather than silently male.
+    np.testing.assert_allclose(coded[[0, 2]], labeled[[0, 2]])
+    assert np.isnan(coded[1])
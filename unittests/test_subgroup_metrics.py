@@ -0,0 +1,105 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kfre import eval_kfre_metrics, eval_kfre_subgroup_metrics
+from kfre._metrics import grouped_metrics, summary_metrics
+
+
+def _frame(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    y2 = (rng.random(n) < 0.15).astype(float)
+    y5 = np.maximum(y2, rng.random(n) < 0.1)
+    return pd.DataFrame(
+        {
+            "site": rng.choice(["north", "south", "east"], n),
+            "sex": rng.choice(["F", "M"], n),
+            "2_year_outcome": y2,
+            "5_year_outcome": y5,
+            "kfre_4var_2year": np.round(0.3 * y2 + 0.7 * rng.random(n), 2),
+            "kfre_4var_5year": np.round(0.3 * y5 + 0.7 * rng.random(n), 2),
+            "kfre_6var_2year": np.round(0.2 * y2 + 0.8 * rng.random(n), 2),
+        }
+    )
+
+
+def test_grouped_metrics_match_per_group():
+    rng = np.random.default_rng(1)
+    n, k = 5000, 40
+    group = rng.integers(0, k, n)
+    y = (rng.random(n) < 0.2).astype(float)
+    s = np.round(0.2 * y + rng.random(n), 1)  # many ties
+    got = grouped_metrics(group, k, y, s, threshold=0.6)
+    for g in range(k):
+        ref = summary_metrics(y[group == g], s[group == g], 0.6)
+        for name, value in ref.items():
+            assert got[name][g] == pytest.approx(value, abs=1e-12)
+        assert got["n"][g] == np.sum(group == g)
+        assert got["events"][g] == y[group == g].sum()
+
+
+def test_single_class_and_empty_groups():
+    group = np.array([0, 0, 0, 2, 2, 2])
+    y = np.array([0.0, 0.0, 0.0, 0.0, 1.0, 1.0])
+    s = np.array([0.1, 0.7, 0.3, 0.2, 0.9, 0.6])
+    got = grouped_metrics(group, 3, y, s)
+    assert np.isnan(got["auc_roc"][0]) and np.isnan(got["average_precision"][0])
+    assert got["specificity"][0] == pytest.approx(2 / 3)
+    assert got["n"][1] == 0 and np.isnan(got["brier"][1])
+    assert got["auc_roc"][2] == 1.0
+
+
+def test_table_matches_eval_kfre_metrics():
+    df = _frame()
+    table = eval_kfre_subgroup_metrics(df, [4, 6], ["site", "sex"], [2, 5])
+    assert list(table.columns) == [
+        "site",
+        "sex",
+        "Outcome",
+        "N",
+        "Events",
+        "Metric",
+        "Value",
+    ]
+    # 6 groups x 6 metrics x 3 outcome columns (no 5-year 6-variable scores).
+    assert len(table) == 6 * 6 * 3
+
+    sub = df[(df["site"] == "east") & (df["sex"] == "M")]
+    ref = eval_kfre_metrics(sub, [4, 6], [2, 5])
+    rows = table[(table["site"] == "east") & (table["sex"] == "M")]
+    wide = rows.pivot(index="Metric", columns="Outcome", values="Value")
+    pd.testing.assert_frame_equal(
+        wide.loc[ref.index, ref.columns], ref, check_names=False
+    )
+    assert rows["N"].unique().tolist() == [len(sub)]
+
+
+def test_missing_keys_and_values_are_dropped():
+    df = _frame(500, seed=2)
+    df.loc[:9, "site"] = None
+    df.loc[10:19, "kfre_4var_2year"] = np.nan
+    table = eval_kfre_subgroup_metrics(df, [4], "site", 2)
+    assert set(table["site"]) == {"north", "south", "east"}
+    counts = table.groupby("site")["N"].first()
+    expected = df.dropna(subset=["site", "kfre_4var_2year"]).groupby("site").size()
+    pd.testing.assert_series_equal(counts, expected, check_names=False)
+
+
+def test_many_small_subgroups_are_fast():
+    rng = np.random.default_rng(3)
+    n = 200_000
+    y = (rng.random(n) < 0.1).astype(float)
+    df = pd.DataFrame(
+        {
+            "site": rng.integers(0, 1000, n),
+            "band": rng.integers(0, 10, n),
+            "2_year_outcome": y,
+            "kfre_4var_2year": np.round(0.2 * y + 0.8 * rng.random(n), 3),
+        }
+    )
+    start = time.perf_counter()
+    table = eval_kfre_subgroup_metrics(df, [4], ["site", "band"])
+    assert time.perf_counter() - start < 5
+    assert table[["site", "band"]].drop_duplicates().shape[0] == 10_000
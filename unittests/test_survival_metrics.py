@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kfre import concordance_index, eval_kfre_survival_metrics, time_dependent_auc
+from kfre._survival import censoring_weights, km_curve
+
+
+def _survival_data(n, seed):
+    rng = np.random.default_rng(seed)
+    # Integer times and rounded risks give tied times and tied risks.
+    time = rng.integers(1, 25, n).astype(float)
+    event = (rng.random(n) < 0.5).astype(int)
+    risk = np.round(rng.random(n), 1)
+    return time, event, risk
+
+
+def _naive_c(time, event, risk, tau=None, weights=None):
+    num = den = 0.0
+    for i in range(len(time)):
+        if event[i] != 1 or (tau is not None and time[i] > tau):
+            continue
+        w = 1.0 if weights is None else weights[i]
+        for j in range(len(time)):
+            if time[j] > time[i] or (time[j] == time[i] and event[j] == 0):
+                den += w
+                num += w * (1.0 if risk[i] > risk[j] else 0.5 * (risk[i] == risk[j]))
+    return num / den
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_harrell_and_uno_match_pairwise_definition(seed):
+    time, event, risk = _survival_data(150 + 37 * seed, seed)
+    assert concordance_index(time, event, risk) == pytest.approx(
+        _naive_c(time, event, risk), abs=1e-12
+    )
+    w = censoring_weights(time, event) ** 2
+    assert concordance_index(time, event, risk, "uno", tau=12) == pytest.approx(
+        _naive_c(time, event, risk, tau=12, weights=w), abs=1e-12
+    )
+
+
+def test_time_dependent_auc_matches_pairwise_definition():
+    time, event, risk = _survival_data(200, 7)
+    w = censoring_weights(time, event)
+    cases = np.flatnonzero((event == 1) & (time <= 10))
+    controls = np.flatnonzero(time > 10)
+    num = sum(
+        w[i]
+        * ((risk[i] > risk[controls]).sum() + 0.5 * (risk[i] == risk[controls]).sum())
+        for i in cases
+    )
+    expected = num / (w[cases].sum() * controls.size)
+    assert time_dependent_auc(time, event, risk, 10) == pytest.approx(expected)
+    assert time_dependent_auc(time, event, risk, [10, 100]).shape == (2,)
+    assert np.isnan(time_dependent_auc(time, event, risk, [100])[0])
+
+
+def test_km_curve_small_example():
+    times, surv = km_curve(np.array([1.0, 2, 2, 3, 4]), np.array([1, 1, 0, 1, 0]))
+    np.testing.assert_allclose(times, [1, 2, 3, 4])
+    np.testing.assert_allclose(
+        surv, [4 / 5, 4 / 5 * 3 / 4, 4 / 5 * 3 / 4 * 1 / 2] + [0.3]
+    )
+
+
+def test_perfect_and_reversed_ranking():
+    time = np.arange(1.0, 51.0)
+    event = np.ones(50, dtype=int)
+    assert concordance_index(time, event, -time) == 1.0
+    assert concordance_index(time, event, time) == 0.0
+
+
+def test_eval_table_layout_and_units():
+    time, event, risk = _survival_data(300, 3)
+    df = pd.DataFrame(
+        {"days": time * 365.25 / 5, "esrd": event, "kfre_4var_2year": risk}
+    )
+    df["kfre_4var_5year"] = df["kfre_4var_2year"]
+    table = eval_kfre_survival_metrics(df, [4], "days", "esrd")
+    assert list(table.columns) == ["2_year_4_var_kfre", "5_year_4_var_kfre"]
+    assert list(table.index) == ["Harrell's C", "Uno's C", "Time-Dependent AUC"]
+    df["years"] = df["days"] / 365.25
+    same = eval_kfre_survival_metrics(df, [4], "years", "esrd", duration_unit="years")
+    pd.testing.assert_frame_equal(table, same)
+
+
+def test_invalid_arguments_raise():
+    time, event, risk = _survival_data(20, 0)
+    with pytest.raises(ValueError, match="method"):
+        concordance_index(time, event, risk, method="gonen")
+    with pytest.raises(ValueError, match="duration_unit"):
+        eval_kfre_survival_metrics(
+            pd.DataFrame(), [4], "d", "e", duration_unit="months"
+        )